@@ -0,0 +1,56 @@
+"""Add deletions table and updated_at indexes for delta sync
+
+Revision ID: 7c1e4b9a2d30
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+from app.core.database import utcnow
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b9a2d30'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Tables may already have been created by Base.metadata.create_all (DB_CREATE_TABLES),
+# including these objects on databases created after the delta sync change.
+UPDATED_AT_INDEXES = (
+    ("ix_pokemon_updated_at", "pokemon"),
+    ("ix_moves_updated_at", "moves"),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "deletions" not in tables:
+        op.create_table(
+            "deletions",
+            sa.Column("id", sa.Uuid(), nullable=False),
+            sa.Column("entity", sa.String(), nullable=False),
+            sa.Column("entity_id", sa.Uuid(), nullable=False),
+            sa.Column("deleted_at", sa.DateTime(), server_default=utcnow(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_deletions_deleted_at_id", "deletions", ["deleted_at", "id"])
+
+    for index_name, table in UPDATED_AT_INDEXES:
+        if table in tables and index_name not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(index_name, table, ["updated_at"])
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for index_name, table in UPDATED_AT_INDEXES:
+        if table in tables and index_name in {i["name"] for i in inspector.get_indexes(table)}:
+            op.drop_index(index_name, table_name=table)
+    if "deletions" in tables:
+        op.drop_index("ix_deletions_deleted_at_id", table_name="deletions")
+        op.drop_table("deletions")
@@ -0,0 +1,36 @@
+"""Add scored_power to ai_scoring_jobs
+
+Revision ID: a4d8f2c61e95
+Revises: 7c1e4b9a2d30
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a4d8f2c61e95'
+down_revision = '7c1e4b9a2d30'
+branch_labels = None
+depends_on = None
+
+
+def _has_column() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return "ai_scoring_jobs" in inspector.get_table_names() and "scored_power" in {
+        c["name"] for c in inspector.get_columns("ai_scoring_jobs")
+    }
+
+
+def upgrade() -> None:
+    # The table itself is created by Base.metadata.create_all (DB_CREATE_TABLES)
+    inspector = sa.inspect(op.get_bind())
+    if "ai_scoring_jobs" in inspector.get_table_names() and not _has_column():
+        op.add_column("ai_scoring_jobs", sa.Column("scored_power", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    if _has_column():
+        with op.batch_alter_table("ai_scoring_jobs") as batch_op:
+            batch_op.drop_column("scored_power")
@@ -0,0 +1,40 @@
+"""Add difficulty_level to ai_scoring_jobs
+
+Revision ID: e2b7c94f1a06
+Revises: a4d8f2c61e95
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c94f1a06'
+down_revision = 'a4d8f2c61e95'
+branch_labels = None
+depends_on = None
+
+
+def _has_column() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return "ai_scoring_jobs" in inspector.get_table_names() and "difficulty_level" in {
+        c["name"] for c in inspector.get_columns("ai_scoring_jobs")
+    }
+
+
+def upgrade() -> None:
+    # The table itself is created by Base.metadata.create_all (DB_CREATE_TABLES)
+    inspector = sa.inspect(op.get_bind())
+    if "ai_scoring_jobs" in inspector.get_table_names() and not _has_column():
+        # Jobs queued before this revision were scored as "medium"
+        op.add_column(
+            "ai_scoring_jobs",
+            sa.Column("difficulty_level", sa.String(), server_default="medium", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    if _has_column():
+        with op.batch_alter_table("ai_scoring_jobs") as batch_op:
+            batch_op.drop_column("difficulty_level")
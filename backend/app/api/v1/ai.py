@@ -1,12 +1,23 @@
 from typing import Dict, Any, Optional
+from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.core.admission import ai_admission, crud_admission
+from app.core.metrics import TimedRoute
+from app.services.ai_scoring_service import AIScoringJobService
 from app.services.ai_service import ai_service
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# LM Studioを待つエンドポイントだけをAIの同時実行数で制限する（/health はスナップショットを返すだけ）
+ai_admitted = [Depends(ai_admission.dependency)]
 
 class PowerCalculationRequest(BaseModel):
     """Move威力計算リクエスト"""
@@ -27,9 +38,27 @@ class AIHealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     available_models: Optional[list] = Field(None, description="Available LM Studio models")
     preferred_model_available: Optional[bool] = Field(None, description="Whether preferred model is available")
+    selected_model: Optional[str] = Field(None, description="Model used for power calculation")
+    latency_ms: Optional[float] = Field(None, description="Latency of the last probe in milliseconds")
+    checked_at: Optional[datetime] = Field(None, description="When the server was last probed")
     error: Optional[str] = Field(None, description="Error message if unhealthy")
 
-@router.post("/calculate-power", response_model=PowerCalculationResponse, status_code=status.HTTP_200_OK)
+class LatencySummary(BaseModel):
+    """ジョブレイテンシの要約（秒）"""
+    count: int
+    avg: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+
+class JobQueueMetricsResponse(BaseModel):
+    """AI威力計算ジョブキューのメトリクス"""
+    depth: Dict[str, int] = Field(..., description="Number of jobs per status")
+    oldest_pending_age_seconds: Optional[float] = Field(None, description="Age of the oldest pending job")
+    queue_wait_seconds: LatencySummary = Field(..., description="Time from enqueue to first attempt")
+    total_latency_seconds: LatencySummary = Field(..., description="Time from enqueue to completion")
+
+@router.post("/calculate-power", response_model=PowerCalculationResponse, status_code=status.HTTP_200_OK, dependencies=ai_admitted)
 async def calculate_move_power(request: PowerCalculationRequest) -> PowerCalculationResponse:
     """
     AIを使用してMove（タスク）の威力を自動計算
@@ -38,7 +67,7 @@ async def calculate_move_power(request: PowerCalculationRequest) -> PowerCalcula
     LM Studioが利用できない場合は、ルールベースのフォールバック計算を使用します。
     """
     try:
-        logger.info(f"Calculating power for move: {request.move_name}")
+        logger.info("Calculating power for move: %s", request.move_name)
         
         result = await ai_service.calculate_move_power(
             move_name=request.move_name,
@@ -49,31 +78,57 @@ async def calculate_move_power(request: PowerCalculationRequest) -> PowerCalcula
         return PowerCalculationResponse(**result)
         
     except Exception as e:
-        logger.error(f"Error in power calculation: {e}")
+        logger.error("Error in power calculation: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to calculate move power. Please try again."
         )
 
+@router.post("/calculate-power/stream", dependencies=ai_admitted)
+async def stream_move_power(request: PowerCalculationRequest) -> StreamingResponse:
+    """
+    AI威力計算のストリーミング版（Server-Sent Events）
+    
+    生成トークンを `token` イベントとして逐次送信し、威力値が部分JSONから
+    取り出せた時点で `power` イベントを送信します。最後に `result` イベントで
+    `/calculate-power` と同じ形式のレスポンスを送信します。
+    """
+    async def event_stream():
+        async for event, data in ai_service.stream_move_power(
+            move_name=request.move_name,
+            move_description=request.move_description,
+            difficulty_level=request.difficulty_level
+        ):
+            if event == "result":
+                data = PowerCalculationResponse(**data).model_dump()
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/health", response_model=AIHealthResponse)
 async def check_ai_health() -> AIHealthResponse:
     """
     AI サービス（LM Studio）の健康状態を確認
     
-    LM Studioの接続状態と利用可能なモデルを確認します。
+    バックグラウンドで定期的に取得しているLM Studioの接続状態と
+    利用可能なモデルを返します（リクエスト時に問い合わせは行いません）。
     """
     try:
         health_info = await ai_service.health_check()
         return AIHealthResponse(**health_info)
         
     except Exception as e:
-        logger.error(f"Error in AI health check: {e}")
+        logger.error("Error in AI health check: %s", e)
         return AIHealthResponse(
             status="error",
             error=str(e)
         )
 
-@router.post("/suggest-power", response_model=PowerCalculationResponse, status_code=status.HTTP_200_OK)
+@router.post("/suggest-power", response_model=PowerCalculationResponse, status_code=status.HTTP_200_OK, dependencies=ai_admitted)
 async def suggest_move_power_simple(
     request: PowerCalculationRequest
 ) -> PowerCalculationResponse:
@@ -92,8 +147,17 @@ async def suggest_move_power_simple(
         return PowerCalculationResponse(**result)
         
     except Exception as e:
-        logger.error(f"Error in power suggestion: {e}")
+        logger.error("Error in power suggestion: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to suggest move power. Please try again."
-        )
\ No newline at end of file
+        )
+
+@router.get("/jobs/metrics", response_model=JobQueueMetricsResponse, dependencies=[Depends(crud_admission.dependency)])
+def get_job_queue_metrics(db: Session = Depends(get_db)) -> JobQueueMetricsResponse:
+    """
+    AI威力計算ジョブキューのメトリクス
+    
+    ステータス別のキューの深さと、直近の完了ジョブの待ち時間・処理時間を返します。
+    """
+    return JobQueueMetricsResponse(**AIScoringJobService.get_metrics(db))
\ No newline at end of file
@@ -0,0 +1,49 @@
+from typing import List
+import hashlib
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.core.admission import crud_admission
+from app.core.metrics import TimedRoute
+from app.schemas.dashboard import Dashboard
+from app.schemas.projection import PokemonProjectionSummary, ProjectionOrdering
+from app.services.dashboard_service import DashboardService
+from app.services.projection_service import ProjectionService
+
+router = APIRouter(route_class=TimedRoute, dependencies=[Depends(crud_admission.dependency)])
+
+@router.get("/", response_model=Dashboard)
+def get_dashboard(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    top_k: int = Query(3, ge=0, le=20, description="Pending moves to include per Pokemon"),
+    recent: int = Query(10, ge=0, le=100, description="Recent completions to include"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the home page view in one request
+    
+    The response carries an ETag; clients revalidate with If-None-Match and get
+    304 Not Modified when nothing changed. It is per-user data, so only private
+    caches may store it.
+    """
+    data = DashboardService.get_dashboard(db, skip=skip, limit=limit, top_k=top_k, recent=recent)
+    body = Dashboard.model_validate(data, from_attributes=True).model_dump_json().encode()
+    
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/projections", response_model=List[PokemonProjectionSummary])
+def get_projections(
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    ordering: ProjectionOrdering = "listed",
+    db: Session = Depends(get_db)
+):
+    """Project level, evolution and battle outcome for a page of Pokemon (same order as the dashboard)"""
+    return ProjectionService.project_many(db, skip=skip, limit=limit, ordering=ordering)
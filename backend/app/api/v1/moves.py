@@ -3,10 +3,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.api.deps import get_db
+from app.core.admission import crud_admission
+from app.core.metrics import TimedRoute
 from app.schemas.move import Move, MoveCreate, MoveUpdate
 from app.services.move_service import MoveService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute, dependencies=[Depends(crud_admission.dependency)])
 
 @router.post("/", response_model=Move, status_code=status.HTTP_201_CREATED)
 def create_move(
@@ -1,12 +1,16 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from app.api.deps import get_db
+from app.core.admission import crud_admission
+from app.core.metrics import TimedRoute
 from app.schemas.pokemon import Pokemon, PokemonCreate, PokemonUpdate, PokemonWithMoves
+from app.schemas.projection import PokemonProjection, ProjectionOrdering
 from app.services.pokemon_service import PokemonService
+from app.services.projection_service import ORDERINGS, ProjectionService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute, dependencies=[Depends(crud_admission.dependency)])
 
 @router.post("/", response_model=Pokemon, status_code=status.HTTP_201_CREATED)
 def create_pokemon(
@@ -58,4 +62,18 @@ def add_experience(
     db: Session = Depends(get_db)
 ):
     """Add experience to a Pokemon"""
-    return PokemonService.add_experience(db, pokemon_id, experience)
\ No newline at end of file
+    return PokemonService.add_experience(db, pokemon_id, experience)
+
+@router.get("/{pokemon_id}/projection", response_model=PokemonProjection)
+def get_projection(
+    pokemon_id: UUID,
+    orderings: List[ProjectionOrdering] = Query(list(ORDERINGS), description="What-if orders to complete the pending moves in"),
+    db: Session = Depends(get_db)
+):
+    """
+    Project level, evolution and battle outcome from the pending moves
+    
+    Each ordering reports how many moves it takes to level up, evolve and
+    defeat the current enemy, with the state after every move.
+    """
+    return ProjectionService.project_pokemon(db, pokemon_id, list(dict.fromkeys(orderings)))
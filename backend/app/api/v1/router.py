@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import pokemon, moves, ai
+from app.api.v1 import pokemon, moves, ai, dashboard, sync
 
 api_router = APIRouter()
 
@@ -7,4 +7,6 @@ api_router = APIRouter()
 api_router.include_router(pokemon.router, prefix="/pokemon", tags=["pokemon"])
 api_router.include_router(moves.router, prefix="/moves", tags=["moves"])
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
 # api_router.include_router(battle.router, prefix="/battles", tags=["battles"])
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.core.admission import crud_admission
+from app.core.metrics import TimedRoute
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+
+router = APIRouter(route_class=TimedRoute, dependencies=[Depends(crud_admission.dependency)])
+
+@router.get("/", response_model=SyncResponse)
+def sync(
+    since: Optional[str] = Query(None, description="next_token from the previous sync (omit for a full sync)"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum rows per entity in one response"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get Pokemon and moves changed since the last sync, plus deletions
+    
+    Apply the rows as upserts by id, remove the tombstoned entities, store
+    next_token and call again immediately while has_more is true.
+    """
+    return SyncService.get_changes(db, since, limit=limit)
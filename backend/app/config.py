@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -11,6 +12,27 @@ class Settings(BaseSettings):
     
     # LM Studio
     LM_STUDIO_URL: str = Field(default="http://localhost:1234")
+    LM_STUDIO_MODEL: str = Field(default="google/gemma-3n-e4b")
+    AI_PROBE_INTERVAL: float = Field(default=15.0)
+    AI_PROBE_TIMEOUT: float = Field(default=5.0)
+    AI_REQUEST_TIMEOUT: float = Field(default=30.0)
+    # 0以下で無効（AIの応答を最後まで待つ）
+    AI_LATENCY_BUDGET_MS: int = Field(default=800)
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)
+    AI_CIRCUIT_RECOVERY_TIMEOUT: float = Field(default=30.0)
+    AI_CACHE_TTL: float = Field(default=3600.0)
+    AI_CACHE_MAX_ENTRIES: int = Field(default=1024)
+    # ローカル威力モデル: off / fallback（AI失敗時のみ） / first_tier（AIより先に使用）
+    AI_LOCAL_MODEL_MODE: str = Field(default="fallback", pattern="^(off|fallback|first_tier)$")
+    POWER_MODEL_PATH: str = Field(default="models/power_model.npz")
+    
+    # AI scoring job queue (power未指定のMoveを非同期でAI採点)
+    AI_SCORING_ENABLED: bool = Field(default=True)
+    AI_SCORING_WORKERS: int = Field(default=2)  # 0でAPIプロセス内ワーカーを起動しない
+    AI_SCORING_POLL_INTERVAL: float = Field(default=1.0)
+    AI_SCORING_VISIBILITY_TIMEOUT: float = Field(default=120.0)
+    AI_SCORING_MAX_ATTEMPTS: int = Field(default=3)
+    AI_SCORING_RETRY_BACKOFF: float = Field(default=10.0)
     
     # CORS
     CORS_ORIGINS: str = Field(default="http://localhost:5173,http://localhost:3000")
@@ -19,6 +41,69 @@ class Settings(BaseSettings):
     APP_ENV: str = Field(default="development")
     DEBUG: bool = Field(default=True)
     
+    # Logging
+    LOG_LEVEL: str = Field(default="INFO")
+    LOG_FORMAT: str = Field(default="json", pattern="^(json|text)$")
+    LOG_QUEUE_SIZE: int = Field(default=10000)  # 溢れたレコードは破棄
+    # INFO以下は同じメッセージが1秒にこの件数を超えると LOG_SAMPLE_RATE の割合で間引く
+    LOG_SAMPLE_PER_SECOND: int = Field(default=20)
+    LOG_SAMPLE_RATE: float = Field(default=0.1, ge=0.0, le=1.0)
+    
+    # Server (python -m app.serve)
+    HOST: str = Field(default="0.0.0.0")
+    PORT: int = Field(default=8000)
+    WEB_CONCURRENCY: int = Field(default=0)  # 0でCPU数
+    MAX_REQUESTS: int = Field(default=10000)  # この数を処理したワーカーを入れ替える（0で無効）
+    MAX_REQUESTS_JITTER: int = Field(default=1000)
+    GRACEFUL_TIMEOUT: int = Field(default=30)
+    WORKER_TIMEOUT: int = Field(default=60)
+    KEEPALIVE: int = Field(default=5)
+    ACCESS_LOG: bool = Field(default=False)
+    
+    # Startup
+    DB_CREATE_TABLES: bool = Field(default=True)
+    STARTUP_WARMUP: bool = Field(default=True)
+    DB_POOL_SIZE: int = Field(default=5)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_WARMUP_CONNECTIONS: int = Field(default=5)
+    
+    # SQLite（DATABASE_URL=sqlite:///./pokemon_todo.db の場合）
+    SQLITE_MMAP_SIZE: int = Field(default=256 * 1024 * 1024)  # メモリマップするサイズ（バイト、0で無効）
+    SQLITE_BUSY_TIMEOUT: float = Field(default=5.0)  # 書き込みロックの最大待ち時間（秒）
+    
+    # Admission control（上限を超えたリクエストは待機キューへ。満杯か待ち時間超過で503）
+    ADMISSION_CRUD_CONCURRENCY: int = Field(default=0)  # 0でDBプールの上限（DB_POOL_SIZE + DB_MAX_OVERFLOW）
+    ADMISSION_CRUD_QUEUE: int = Field(default=50)
+    ADMISSION_CRUD_QUEUE_TIMEOUT: float = Field(default=2.0)
+    ADMISSION_AI_CONCURRENCY: int = Field(default=4)  # 0で制限しない
+    ADMISSION_AI_QUEUE: int = Field(default=8)
+    ADMISSION_AI_QUEUE_TIMEOUT: float = Field(default=1.0)
+    ADMISSION_RETRY_AFTER: int = Field(default=1)  # 503のRetry-After（秒）
+    
+    # Idempotency-Key（POST /moves/ 等の再送対策）
+    IDEMPOTENCY_TTL_SECONDS: float = Field(default=86400.0)  # 最初のレスポンスを保存する期間
+    IDEMPOTENCY_WAIT_TIMEOUT: float = Field(default=10.0)  # 処理中の同じキーを待つ上限（超えると409）
+    IDEMPOTENCY_LOCK_TIMEOUT: float = Field(default=60.0)  # これを過ぎた処理中のキーは放棄されたとみなす
+    
+    # Delta sync (GET /sync)
+    # 同じ時刻付近で後からコミットされた変更を取りこぼさないよう、前回の続きをこの秒数だけ重ねて返す
+    SYNC_OVERLAP_SECONDS: float = Field(default=5.0)
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = Field(default=30)  # これより古いトークンは410（全件同期からやり直し）
+    
+    # Slow query log
+    SLOW_QUERY_THRESHOLD_MS: float = Field(default=200.0)  # 0以下で無効
+    SLOW_QUERY_SAMPLE_RATE: float = Field(default=1.0, ge=0.0, le=1.0)
+    SLOW_QUERY_LOG_PER_MINUTE: int = Field(default=60)
+    # EXPLAIN (ANALYZE, BUFFERS) はクエリを再実行するため、PostgreSQLのSELECTのみ対象
+    SLOW_QUERY_EXPLAIN: bool = Field(default=False)
+    SLOW_QUERY_EXPLAIN_PER_MINUTE: int = Field(default=6)
+    
+    # Profiling
+    PROFILING_SECRET: str = Field(default="")  # X-Profile ヘッダーの値（GET / HEAD のみ、空で無効）
+    PROFILING_SLOWEST_DIR: str = Field(default="")  # 時間窓ごとの最遅リクエストの保存先（空で無効）
+    PROFILING_SAMPLE_RATE: float = Field(default=0.01, ge=0.0, le=1.0)
+    PROFILING_WINDOW_SECONDS: float = Field(default=300.0)
+    
     # Security
     SECRET_KEY: str = Field(default="your-secret-key-here-change-in-production")
     ALGORITHM: str = "HS256"
@@ -32,6 +117,7 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
+@lru_cache
 def get_settings() -> Settings:
     return Settings()
 
@@ -0,0 +1,144 @@
+"""
+ルートグループ単位のアドミッション制御（負荷制限）
+
+同時実行数の上限を超えたリクエストは上限付きの待機キューで順番を待ち、
+キューが満杯か待ち時間が上限を超えた時点で 503 + Retry-After を返す。
+DBやLM Studioが遅くなったときに、スレッドプールやイベントループに
+リクエストが際限なく積み上がってすべてのリクエストが遅くなるのを防ぐ。
+
+- crud: 上限の既定値はDBプールの最大接続数（DB_POOL_SIZE + DB_MAX_OVERFLOW）
+- ai: LM Studioを待つリクエストの同時実行数
+
+ルーターの dependencies に AdmissionLimiter.dependency を指定して使う。
+スロットはレスポンスの送信（ストリーミングを含む）が終わるまで保持する。
+"""
+from collections import deque
+from typing import AsyncIterator, Deque
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.core import metrics
+from app.core.exceptions import ServiceOverloadedException
+
+logger = logging.getLogger(__name__)
+
+class AdmissionLimiter:
+    """同時実行数の上限と、上限付きFIFO待機キュー"""
+
+    def __init__(self, group: str, limit: int, max_queue: int, queue_timeout: float, retry_after: int):
+        self.group = group
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str) -> ServiceOverloadedException:
+        metrics.ADMISSION_REJECTED.labels(group=self.group, reason=reason).inc()
+        # 過負荷時に大量に出るため INFO（サンプリング対象）にする
+        logger.info(
+            "Shedding %s request: %s (active=%d, queued=%d)", self.group, reason, self.active, self.queued
+        )
+        return ServiceOverloadedException(self.group, self.retry_after)
+
+    def publish_limit(self) -> None:
+        metrics.ADMISSION_LIMIT.labels(group=self.group).set(self.limit)
+
+    def _update_gauges(self) -> None:
+        metrics.ADMISSION_IN_FLIGHT.labels(group=self.group).set(self.active)
+        metrics.ADMISSION_QUEUED.labels(group=self.group).set(self.queued)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._update_gauges()
+            metrics.ADMISSION_WAIT_SECONDS.labels(group=self.group).observe(0)
+            return
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # タイムアウトと同時にスロットを譲られていたので、そのまま使う
+                pass
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self._update_gauges()
+                raise self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            # クライアント切断などで待機中に取り消された
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self._update_gauges()
+            raise
+        metrics.ADMISSION_WAIT_SECONDS.labels(group=self.group).observe(time.perf_counter() - start)
+
+    def release(self) -> None:
+        # スロットは減らさずに先頭の待機者へ直接引き渡す（後から来たリクエストに追い越されない）
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+    async def dependency(self) -> AsyncIterator[None]:
+        """FastAPIの依存関係として使う（レスポンス送信後にスロットを返す）"""
+        if self.limit <= 0:
+            yield
+            return
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+def _crud_limit() -> int:
+    if settings.ADMISSION_CRUD_CONCURRENCY > 0:
+        return settings.ADMISSION_CRUD_CONCURRENCY
+    # DBプールの接続数を超えて受け付けても、スレッドプールで接続の空きを待つだけになる
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+# シングルトンインスタンス（ワーカープロセスごと）
+crud_admission = AdmissionLimiter(
+    "crud",
+    limit=_crud_limit(),
+    max_queue=settings.ADMISSION_CRUD_QUEUE,
+    queue_timeout=settings.ADMISSION_CRUD_QUEUE_TIMEOUT,
+    retry_after=settings.ADMISSION_RETRY_AFTER,
+)
+ai_admission = AdmissionLimiter(
+    "ai",
+    limit=settings.ADMISSION_AI_CONCURRENCY,
+    max_queue=settings.ADMISSION_AI_QUEUE,
+    queue_timeout=settings.ADMISSION_AI_QUEUE_TIMEOUT,
+    retry_after=settings.ADMISSION_RETRY_AFTER,
+)
+
+def publish_limits() -> None:
+    """
+    上限をGaugeに記録する（ワーカーの起動時に lifespan から呼ぶ）
+
+    ADMISSION_LIMIT はワーカー間で合計する（livesum）ため、インポート時に設定すると
+    preload_app でアプリを読み込むGunicornのマスタープロセスの値まで合計されてしまう。
+    """
+    crud_admission.publish_limit()
+    ai_admission.publish_limit()
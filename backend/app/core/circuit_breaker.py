@@ -0,0 +1,84 @@
+from enum import Enum
+from typing import Callable
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    外部サービス呼び出し用のサーキットブレーカー
+
+    連続失敗が閾値に達するとOPENになり、呼び出しを即座に拒否する。
+    recovery_timeout経過後はHALF_OPENとなり、1件だけ試験的な呼び出しを許可する。
+    その結果が成功ならCLOSEDに戻り、失敗なら再びOPENになる。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failure_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """呼び出しを許可するかどうか（HALF_OPEN時は試験呼び出しを1件だけ許可）"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+            logger.info("Circuit %s half-open: probing recovery", self.name)
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            logger.info("Circuit %s closed", self.name)
+        self._state = CircuitState.CLOSED
+        self._failure_count = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """試験呼び出しが成否を判定できないまま終了した場合に枠を解放"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failure_count += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._failure_count >= self.failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                logger.warning(
+                    "Circuit %s opened after %d consecutive failures",
+                    self.name,
+                    self._failure_count,
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+        self._probe_in_flight = False
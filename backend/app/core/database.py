@@ -1,21 +1,63 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.expression import FunctionElement
 from app.config import settings
 
+def _engine_options(url: str) -> dict:
+    database_url = make_url(url)
+    if database_url.get_backend_name() != "sqlite":
+        return {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+    # Sessions are used from the threadpool, so connections must not be tied to a thread
+    connect_args = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT}
+    if database_url.database in (None, "", ":memory:"):
+        # Every connection to :memory: is a separate database, so share one
+        return {"connect_args": connect_args, "poolclass": StaticPool}
+    return {
+        "connect_args": connect_args,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+def create_database_engine(url: str) -> Engine:
+    """Create an engine for url, with the SQLite tuning when url is a SQLite database"""
+    engine = create_engine(url, pool_pre_ping=True, echo=settings.DEBUG, **_engine_options(url))
+    if engine.dialect.name == "sqlite":
+        from app.core.sqlite import configure_sqlite
+        configure_sqlite(engine)
+    return engine
+
 # Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG,
-)
+engine = create_database_engine(settings.DATABASE_URL)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit so returning them does not trigger a refresh SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create Base class
 Base = declarative_base()
 
+class utcnow(FunctionElement):
+    """Current UTC time evaluated by the database (naive, like datetime.utcnow)"""
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # Same text format as SQLAlchemy's SQLite DateTime storage (microsecond precision)
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
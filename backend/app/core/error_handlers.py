@@ -3,8 +3,9 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError, DataError
+from app.core.logging_config import request_id_var
 import logging
-import traceback
+import uuid
 from typing import Any, Dict
 from datetime import datetime
 
@@ -19,7 +20,7 @@ def create_error_response(
 ) -> JSONResponse:
     """Create a standardized error response"""
     
-    error_id = f"{datetime.utcnow().timestamp():.0f}"
+    error_id = uuid.uuid4().hex
     
     content: Dict[str, Any] = {
         "error": {
@@ -28,7 +29,8 @@ def create_error_response(
             "error_id": error_id,
             "path": str(request.url.path),
             "method": request.method,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
+            "request_id": request_id_var.get()
         }
     }
     
@@ -40,7 +42,9 @@ def create_error_response(
     
     # Log the error
     logger.error(
-        f"Error {error_id}: {message}",
+        "Error %s: %s",
+        error_id,
+        message,
         extra={
             "error_id": error_id,
             "status_code": status_code,
@@ -121,12 +125,12 @@ async def general_exception_handler(
     
     # Log the full traceback
     logger.error(
-        f"Unexpected error: {exc}",
-        exc_info=True,
+        "Unexpected error: %s",
+        exc,
+        exc_info=exc,
         extra={
             "path": str(request.url.path),
-            "method": request.method,
-            "traceback": traceback.format_exc()
+            "method": request.method
         }
     )
     
@@ -39,6 +39,30 @@ class AIServiceException(HTTPException):
             detail=f"AI Service error: {message}"
         )
 
+class ServiceOverloadedException(HTTPException):
+    """Exception for requests shed by admission control"""
+    def __init__(self, group: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Server is busy ({group}), please retry later",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+class InvalidSyncTokenException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+class SyncTokenExpiredException(HTTPException):
+    """The deletion log no longer covers the token; the client must do a full sync"""
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync token has expired, start a full sync without 'since'"
+        )
+
 class ValidationException(HTTPException):
     """Custom exception for validation errors with detailed field information"""
     def __init__(self, errors: Dict[str, Any], message: str = "Validation failed"):
@@ -80,7 +104,7 @@ class BusinessRuleException(HTTPException):
 class DatabaseException(HTTPException):
     """Exception for database operation failures"""
     def __init__(self, operation: str, message: str):
-        logger.error(f"Database error during {operation}: {message}")
+        logger.error("Database error during %s: %s", operation, message)
         super().__init__(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database operation failed: {operation}"
@@ -0,0 +1,209 @@
+"""
+書き込みエンドポイントの Idempotency-Key 対応
+
+Idempotency-Key ヘッダー付きのリクエストは、最初のレスポンスを idempotency_keys テーブルに
+IDEMPOTENCY_TTL_SECONDS の間保存し、同じキーの再送には処理を再実行せずに保存した
+レスポンスを返す（Idempotent-Replayed: true を付与）。
+同じキーのリクエストが処理中なら、完了するまで IDEMPOTENCY_WAIT_TIMEOUT 秒まで待つ。
+
+- 同じキーで内容（メソッド・パス・ボディ）が異なるリクエストは 422
+- 5xx（503による負荷制限を含む）は保存せず、再送で再実行できるようにする
+- 処理の完了後、レスポンスを保存する前にプロセスが落ちた場合は
+  IDEMPOTENCY_LOCK_TIMEOUT 経過後の再送で再実行される
+"""
+from typing import List, Optional, Pattern, Tuple
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.core.database import SessionLocal
+from app.services.idempotency_service import IdempotencyService
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+_UUID = r"[0-9a-fA-F-]{32,36}"
+
+# クライアントが再送する書き込みエンドポイント
+IDEMPOTENT_ROUTES: List[Tuple[str, Pattern[str]]] = [
+    ("POST", re.compile(r"^/api/v1/moves/?$")),
+    ("POST", re.compile(rf"^/api/v1/moves/{_UUID}/complete$")),
+    ("POST", re.compile(rf"^/api/v1/pokemon/{_UUID}/add-experience$")),
+]
+
+# 期限切れの行を削除する頻度（登録のたびにこの確率で実行）
+_PURGE_PROBABILITY = 0.01
+
+def _with_session(func, *args):
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+def _request_hash(scope: Scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+async def _send_json(send: Send, status: int, detail: str, extra_headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *(extra_headers or []),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class IdempotencyMiddleware:
+    """IDEMPOTENT_ROUTES へのリクエストで Idempotency-Key を処理するASGIミドルウェア"""
+
+    def __init__(self, app: ASGIApp, ttl: float, wait_timeout: float, lock_timeout: float):
+        self.app = app
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lock_timeout = lock_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        key = dict(scope["headers"]).get(IDEMPOTENCY_HEADER)
+        if key is None or not any(
+            scope["method"] == method and pattern.match(scope["path"]) for method, pattern in IDEMPOTENT_ROUTES
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        # ボディを読み切ってハッシュを取り、アプリには同じ内容を渡し直す
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        request_hash = _request_hash(scope, body)
+        key_text = key.decode("latin-1")
+
+        claimed_at = datetime.utcnow()
+        existing = await run_in_threadpool(
+            _with_session, IdempotencyService.claim, key_text, request_hash, claimed_at, self.ttl, self.lock_timeout
+        )
+        if existing is not None:
+            await self._respond_existing(existing, key_text, request_hash, send)
+            return
+        if random.random() < _PURGE_PROBABILITY:
+            await run_in_threadpool(_with_session, IdempotencyService.purge_expired)
+
+        await self._run_and_store(scope, receive, body, key_text, request_hash, claimed_at, send)
+
+    async def _respond_existing(self, record, key: str, request_hash: str, send: Send) -> None:
+        if record.request_hash != request_hash:
+            await _send_json(send, 422, "Idempotency-Key was already used with a different request")
+            return
+
+        # 処理中なら元のリクエストの完了を待つ（別ワーカーの場合もあるのでDBを見る）
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.02
+        while record is not None and record.status != "completed":
+            if time.monotonic() >= deadline:
+                await _send_json(
+                    send, 409, "A request with this Idempotency-Key is still being processed",
+                    [(b"retry-after", b"1")],
+                )
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+            record = await run_in_threadpool(_with_session, IdempotencyService.get, key)
+        if record is None:
+            # 元のリクエストが5xxで終わり、キーが解放された
+            await _send_json(
+                send, 409, "The original request with this Idempotency-Key failed, please retry",
+                [(b"retry-after", b"1")],
+            )
+            return
+
+        logger.info("Replaying stored response for Idempotency-Key %s", key)
+        headers = [
+            (b"content-length", str(len(record.response_body or b"")).encode()),
+            (b"idempotent-replayed", b"true"),
+        ]
+        if record.response_content_type:
+            headers.append((b"content-type", record.response_content_type.encode("latin-1")))
+        await send({"type": "http.response.start", "status": record.response_status, "headers": headers})
+        await send({"type": "http.response.body", "body": record.response_body or b""})
+
+    async def _run_and_store(
+        self, scope: Scope, receive: Receive, body: bytes, key: str, request_hash: str, claimed_at: datetime, send: Send
+    ) -> None:
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        content_type: Optional[str] = None
+        response_chunks: List[bytes] = []
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        owner = (key, request_hash, claimed_at)
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await run_in_threadpool(_with_session, IdempotencyService.release, *owner)
+            raise
+
+        if status_code >= 500:
+            await run_in_threadpool(_with_session, IdempotencyService.release, *owner)
+            return
+        stored = await run_in_threadpool(
+            _with_session, IdempotencyService.complete, *owner, status_code, content_type, b"".join(response_chunks)
+        )
+        if not stored:
+            # 処理が IDEMPOTENCY_LOCK_TIMEOUT を超え、キーが再送されたリクエストに引き継がれていた
+            logger.warning("Idempotency-Key %s was taken over by another request, response not stored", key)
+
+def register_idempotency(app: FastAPI) -> None:
+    """Idempotency-Key 用ミドルウェアを登録"""
+    app.add_middleware(
+        IdempotencyMiddleware,
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+    )
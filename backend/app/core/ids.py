@@ -0,0 +1,43 @@
+"""
+時刻順に並ぶ主キー用のUUIDv7生成（RFC 9562）
+
+先頭48ビットがUnixエポックからのミリ秒で、続く74ビットが乱数。
+同じミリ秒内（または時計が戻った場合）は直前の値の乱数部を1増やすため、
+プロセス内では常に単調増加する。B-treeへの挿入が右端に集中し、
+ページ分割とキャッシュミスを抑えられる。
+"""
+import os
+import threading
+import time
+import uuid
+
+_RANDOM_BITS = 74
+_RANDOM_MASK = (1 << _RANDOM_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+def uuid7_from(unix_ms: int, random_bits: int) -> uuid.UUID:
+    """ミリ秒のタイムスタンプと74ビットの乱数部からUUIDv7を組み立てる"""
+    rand_a = random_bits >> 62
+    rand_b = random_bits & ((1 << 62) - 1)
+    value = (unix_ms << 80) | (0x7 << 76) | (rand_a << 64) | (0x2 << 62) | rand_b
+    return uuid.UUID(int=value)
+
+def uuid7() -> uuid.UUID:
+    """単調増加するUUIDv7を生成"""
+    global _last_ms, _last_random
+    now_ms = time.time_ns() // 1_000_000
+    with _lock:
+        if now_ms > _last_ms:
+            # 最上位ビットを空けておき、同じミリ秒内のインクリメントで溢れにくくする
+            random_bits = int.from_bytes(os.urandom(10), "big") & (_RANDOM_MASK >> 1)
+        else:
+            now_ms = _last_ms
+            random_bits = _last_random + 1
+            if random_bits > _RANDOM_MASK:
+                now_ms += 1
+                random_bits = int.from_bytes(os.urandom(10), "big") & (_RANDOM_MASK >> 1)
+        _last_ms, _last_random = now_ms, random_bits
+    return uuid7_from(now_ms, random_bits)
@@ -0,0 +1,187 @@
+"""
+ログ設定
+
+ログ出力はリクエスト処理のスレッドで行わず、QueueHandler でキューに積んで
+QueueListener のバックグラウンドスレッドが書き出す。キューが溢れた場合は
+処理を止めずに破棄し、破棄件数を後から報告する。
+
+各レコードにはリクエストごとの相関ID（X-Request-ID）を付与し、
+LOG_FORMAT=json（既定）では1行1JSONで出力する。
+INFO以下の大量に出るメッセージは、同じメッセージテンプレートごとに
+1秒あたり LOG_SAMPLE_PER_SECOND 件を超えた分を LOG_SAMPLE_RATE の割合で間引く。
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord の標準属性（これ以外は extra として JSON に含める）
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class RequestIdFilter(logging.Filter):
+    """現在のリクエストの相関IDをレコードに付与"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """INFO以下のレコードをメッセージテンプレートごとに間引く（WARNING以上は常に出力）"""
+
+    def __init__(self, per_second: int, sample_rate: float):
+        super().__init__()
+        self.per_second = per_second
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._second = 0
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, str(record.msg))
+        second = int(time.monotonic())
+        with self._lock:
+            if second != self._second:
+                self._second = second
+                self._counts.clear()
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        return count <= self.per_second or random.random() < self.sample_rate
+
+class JsonFormatter(logging.Formatter):
+    """1レコードを1行のJSONに変換"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """キューが満杯ならブロックせずにレコードを破棄する"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 引数の展開と例外の文字列化だけをここで行い、整形は書き出し側のスレッドに任せる
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            warning = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "request_id": None,
+                "msg": f"Dropped {dropped} log records because the log queue was full",
+            })
+            try:
+                self.queue.put_nowait(warning)
+            except queue.Full:
+                self.dropped += dropped
+
+def configure_logging() -> None:
+    """アプリケーションのログ設定（インポート時ではなく起動時に呼び出す）"""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(RequestIdFilter())
+    if settings.LOG_SAMPLE_RATE < 1.0:
+        handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_PER_SECOND, settings.LOG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """キューに残ったレコードを書き出してバックグラウンドスレッドを止める"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+class RequestIdMiddleware:
+    """X-Request-ID を受け取る（なければ生成する）ASGIミドルウェア。レスポンスにも付与する"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.lower().encode())
+        # 外部から受け取るIDは長さを制限してログの肥大化を防ぐ
+        request_id = incoming.decode("latin-1")[:64] if incoming else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
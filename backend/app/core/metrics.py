@@ -0,0 +1,233 @@
+"""
+リクエスト単位の計測（Prometheusメトリクスと Server-Timing ヘッダー）
+
+リクエストごとの計測値は RequestTimings に集め、contextvar で引き回す。
+同期エンドポイントはスレッドプールで実行されるが、Starletteはコンテキストを
+コピーして渡すため、同じ RequestTimings オブジェクトに書き込める。
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+import asyncio
+import functools
+import os
+import time
+from fastapi import FastAPI, Response
+from fastapi.routing import APIRoute
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.profiling import call_profiled
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed",
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per request",
+    ["route"],
+)
+AI_CALL_SECONDS = Histogram(
+    "ai_call_duration_seconds",
+    "Latency of LM Studio calls",
+    ["outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.8, 1, 2, 5, 10, 30),
+)
+AI_RESULTS = Counter(
+    "ai_power_results_total",
+    "Power calculation results by source (ai / cache / fallback / local_model)",
+    ["source"],
+)
+ADMISSION_LIMIT = Gauge(
+    "admission_limit",
+    "Concurrency limit per route group",
+    ["group"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "Admitted requests currently holding a slot",
+    ["group"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued",
+    "Requests waiting for a slot",
+    ["group"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "admission_wait_seconds",
+    "Time spent waiting for a slot before being admitted",
+    ["group"],
+    buckets=(0, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests shed with 503 (queue_full / queue_timeout)",
+    ["group", "reason"],
+)
+
+@dataclass
+class RequestTimings:
+    start: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    ai_seconds: float = 0.0
+    handler_end: Optional[float] = None
+    scope: Scope = field(default_factory=dict)
+
+    @property
+    def route(self) -> str:
+        """マッチしたルートのパステンプレート（ルーティング前や404は unmatched）"""
+        return getattr(self.scope.get("route"), "path", "unmatched")
+
+    def server_timing(self, now: float) -> str:
+        parts = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+            f"ai;dur={self.ai_seconds * 1000:.1f}",
+        ]
+        if self.handler_end is not None:
+            parts.append(f"serialize;dur={(now - self.handler_end) * 1000:.1f}")
+        parts.append(f"total;dur={(now - self.start) * 1000:.1f}")
+        return ", ".join(parts)
+
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def add_ai_time(seconds: float) -> None:
+    """リクエストがAIの応答を待った時間を記録"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.ai_seconds += seconds
+
+def observe_ai_call(seconds: float, outcome: str) -> None:
+    AI_CALL_SECONDS.labels(outcome=outcome).observe(seconds)
+
+def count_ai_result(source: str) -> None:
+    AI_RESULTS.labels(source=source).inc()
+
+def instrument_engine(engine: Engine) -> None:
+    """SQLの実行回数と時間をリクエスト単位で集計する"""
+
+    # 開始時刻は文ごとの実行コンテキストに置く（接続に積むと、失敗した文の分が残り続ける）
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = context._query_start
+        timings = request_timings.get()
+        if timings is not None:
+            timings.db_queries += 1
+            timings.db_seconds += time.perf_counter() - start
+
+def _mark_handler_end(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """エンドポイント関数の終了時刻を記録するラッパー（以降がシリアライズ時間）"""
+    # include_router でルートが複製される際に二重に包まない
+    if getattr(endpoint, "_marks_handler_end", False):
+        return endpoint
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings = request_timings.get()
+                if timings is not None:
+                    timings.handler_end = time.perf_counter()
+        async_wrapper._marks_handler_end = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        try:
+            return call_profiled(endpoint, *args, **kwargs)
+        finally:
+            timings = request_timings.get()
+            if timings is not None:
+                timings.handler_end = time.perf_counter()
+    sync_wrapper._marks_handler_end = True
+    return sync_wrapper
+
+class TimedRoute(APIRoute):
+    """Server-Timing でシリアライズ時間を分離するためのルートクラス"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _mark_handler_end(endpoint), **kwargs)
+
+class MetricsMiddleware:
+    """リクエストのレイテンシ等を記録し、Server-Timing ヘッダーを付与するASGIミドルウェア"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope=scope)
+        token = request_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter()))
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            request_timings.reset(token)
+            # ルートのテンプレートをラベルにしてカーディナリティを抑える
+            route_label = timings.route
+            REQUEST_LATENCY.labels(
+                method=scope["method"], route=route_label, status=str(status_code)
+            ).observe(time.perf_counter() - timings.start)
+            REQUEST_DB_QUERIES.labels(route=route_label).observe(timings.db_queries)
+            REQUEST_DB_SECONDS.labels(route=route_label).observe(timings.db_seconds)
+
+def metrics_response() -> Response:
+    """Prometheusテキスト形式のメトリクス（マルチプロセス時は全ワーカー分を集計）"""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+def register_metrics(app: FastAPI, engine: Engine) -> None:
+    """メトリクス用ミドルウェアと /metrics エンドポイントを登録"""
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_response, include_in_schema=False)
@@ -0,0 +1,192 @@
+"""
+リクエスト単位のプロファイリング
+
+PROFILING_SECRET を設定すると、X-Profile ヘッダーに同じ値を付けたリクエストだけを
+cProfileで実行し、レスポンスの代わりにプロファイル結果を返す
+（?profile_format=pstats でsnakeviz等に読み込めるバイナリ）。
+シークレットがアクセスログやプロキシのログに残らないよう、クエリ文字列では受け付けない。
+本来のレスポンスは捨てられるので、対象は GET / HEAD だけにする
+（更新系のリクエストはヘッダーが付いていても計測せずに通常どおり処理する）。
+
+    curl -H "X-Profile: $PROFILING_SECRET" http://localhost:8000/api/v1/pokemon/
+
+PROFILING_SLOWEST_DIR を設定すると、PROFILING_SAMPLE_RATE の割合で
+リクエストをプロファイルし、時間窓ごとに最も遅かったものを .prof として書き出す。
+
+cProfileはスレッド単位で動くため、イベントループ上の処理はミドルウェアで、
+スレッドプールで実行される同期エンドポイントは TimedRoute のラッパーで
+別々に計測し、最後に合算する。
+イベントループ側の計測は、そのリクエストが await で待っている間に同じループで動いた
+他のリクエストの処理も含んでしまう（ロックで防げるのは計測の同時実行だけ）。
+負荷のかかった環境の結果は、スレッドプール側の計測のほうが信頼できる。
+"""
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+from urllib.parse import parse_qs
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import marshal
+import pstats
+import random
+import time
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+# 本来のレスポンスを捨てても副作用が残らないメソッドだけをオンデマンドで計測する
+_ON_DEMAND_METHODS = ("GET", "HEAD")
+
+# プロファイル中のリクエストで、スレッドプール側の計測結果を集める
+_thread_profiles: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar(
+    "thread_profiles", default=None
+)
+
+def call_profiled(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """プロファイル中のリクエストなら、現在のスレッドでの実行もcProfileで計測する"""
+    profiles = _thread_profiles.get()
+    if profiles is None:
+        return func(*args, **kwargs)
+    profiler = cProfile.Profile()
+    profiles.append(profiler)
+    return profiler.runcall(func, *args, **kwargs)
+
+class ProfilingMiddleware:
+    """シークレット付きリクエストのオンデマンド計測と、遅いリクエストの自動保存"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret: str = "",
+        slowest_dir: str = "",
+        sample_rate: float = 0.0,
+        window_seconds: float = 300.0,
+    ):
+        self.app = app
+        self.secret = secret.encode()
+        self.slowest_dir = Path(slowest_dir) if slowest_dir else None
+        self.sample_rate = sample_rate
+        self.window_seconds = window_seconds
+        # cProfileは同一スレッドで同時に1つしか有効にできない
+        self._lock = asyncio.Lock()
+        self._window_start = time.monotonic()
+        self._window_label = time.strftime("%Y%m%dT%H%M%S")
+        self._window_slowest = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.secret and self._requested(scope):
+            async with self._lock:
+                await self._profile_on_demand(scope, receive, send)
+            return
+
+        if self.slowest_dir is not None and not self._lock.locked() and random.random() < self.sample_rate:
+            async with self._lock:
+                await self._profile_sampled(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _requested(self, scope: Scope) -> bool:
+        if scope["method"] not in _ON_DEMAND_METHODS:
+            return False
+        token = dict(scope["headers"]).get(PROFILE_HEADER)
+        return token is not None and hmac.compare_digest(token, self.secret)
+
+    async def _run_profiled(self, scope: Scope, receive: Receive, send: Send) -> pstats.Stats:
+        profiles: List[cProfile.Profile] = []
+        token = _thread_profiles.set(profiles)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            _thread_profiles.reset(token)
+        stats = pstats.Stats(profiler)
+        for thread_profile in profiles:
+            stats.add(thread_profile)
+        return stats
+
+    async def _profile_on_demand(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response_status = 500
+
+        async def discard_response(message: Message) -> None:
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+
+        start = time.perf_counter()
+        stats = await self._run_profiled(scope, receive, discard_response)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if query.get("profile_format", ["text"])[0] == "pstats":
+            body = marshal.dumps(stats.stats)
+            content_type = b"application/octet-stream"
+        else:
+            stream = io.StringIO()
+            stats.stream = stream
+            stats.sort_stats("cumulative").print_stats(50)
+            body = stream.getvalue().encode()
+            content_type = b"text/plain; charset=utf-8"
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profiled-status", str(response_status).encode()),
+                (b"x-profiled-duration-ms", f"{elapsed_ms:.1f}".encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _profile_sampled(self, scope: Scope, receive: Receive, send: Send) -> None:
+        start = time.perf_counter()
+        stats = await self._run_profiled(scope, receive, send)
+        elapsed = time.perf_counter() - start
+
+        now = time.monotonic()
+        if now - self._window_start >= self.window_seconds:
+            self._window_start = now
+            self._window_label = time.strftime("%Y%m%dT%H%M%S")
+            self._window_slowest = 0.0
+        if elapsed <= self._window_slowest:
+            return
+        self._window_slowest = elapsed
+
+        # 同じ時間窓の中では最も遅いものだけが残るよう上書きする
+        path = self.slowest_dir / f"slowest-{self._window_label}.prof"
+        try:
+            self.slowest_dir.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(path)
+        except OSError as e:
+            logger.warning("Failed to write profile to %s: %s", path, e)
+            return
+        logger.info(
+            "Slowest request in window so far: %s %s (%.1f ms), profile written to %s",
+            scope["method"], getattr(scope.get("route"), "path", scope["path"]), elapsed * 1000, path,
+        )
+
+def register_profiling(app: FastAPI) -> None:
+    """設定に従ってプロファイリング用ミドルウェアを登録（無効なら何もしない）"""
+    if not settings.PROFILING_SECRET and not settings.PROFILING_SLOWEST_DIR:
+        return
+    app.add_middleware(
+        ProfilingMiddleware,
+        secret=settings.PROFILING_SECRET,
+        slowest_dir=settings.PROFILING_SLOWEST_DIR,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        window_seconds=settings.PROFILING_WINDOW_SECONDS,
+    )
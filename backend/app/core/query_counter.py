@@ -0,0 +1,84 @@
+"""
+SQL発行回数の計測（テストでのクエリ予算チェックとN+1検出用）
+
+    with QueryCounter(engine) as counter:
+        client.get("/api/v1/pokemon/")
+    counter.assert_budget(2)
+
+エンジンのすべての接続を対象に数えるので、TestClientが別スレッドで
+処理したリクエストのクエリも含まれる。
+"""
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+import re
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+
+@dataclass
+class CapturedQuery:
+    statement: str
+    parameters: Any
+
+    @property
+    def normalized(self) -> str:
+        """パラメーターを除いた比較用のSQL"""
+        return _WHITESPACE.sub(" ", self.statement).strip()
+
+class QueryBudgetExceeded(AssertionError):
+    """クエリ予算の超過、または同一SQLの繰り返し（N+1）"""
+
+class QueryCounter:
+    """with ブロック内でエンジンが発行したSQLを記録する"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.queries: List[CapturedQuery] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries.append(CapturedQuery(statement, parameters))
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def reset(self) -> None:
+        self.queries.clear()
+
+    def repeated(self, max_repeats: int = 1) -> List[Tuple[str, int]]:
+        """max_repeats 回を超えて発行された同一SQLと回数（N+1の候補）"""
+        counts = Counter(query.normalized for query in self.queries)
+        return [(sql, n) for sql, n in counts.items() if n > max_repeats]
+
+    def assert_budget(self, max_queries: int, max_repeats: Optional[int] = 1) -> None:
+        """
+        発行回数が予算内で、同一SQLの繰り返しがないことを確認
+
+        Args:
+            max_queries: 許容するSQLの発行回数
+            max_repeats: 同一SQLを許容する回数（None ならN+1検出を行わない）
+        """
+        problems = []
+        if self.count > max_queries:
+            problems.append(
+                f"Expected at most {max_queries} queries, got {self.count}:\n"
+                + "\n".join(f"  {i}. {q.normalized}" for i, q in enumerate(self.queries, 1))
+            )
+        if max_repeats is not None:
+            repeated = self.repeated(max_repeats)
+            if repeated:
+                problems.append(
+                    "Possible N+1: identical statements executed repeatedly:\n"
+                    + "\n".join(f"  {n}x {sql}" for sql, n in repeated)
+                )
+        if problems:
+            raise QueryBudgetExceeded("\n\n".join(problems))
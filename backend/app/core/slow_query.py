@@ -0,0 +1,163 @@
+"""
+スロークエリログ
+
+閾値を超えたSQLを、パラメーター・呼び出し元ルート・実行時間とともに記録する。
+ログ自体が負荷にならないよう、サンプリングと1分あたりの件数上限をかける。
+EXPLAIN (ANALYZE, BUFFERS) の取得を有効にすると、別スレッド・別接続で
+同じクエリを再実行して実行計画をログに出す（PostgreSQLのSELECTのみ）。
+行ロック（FOR UPDATE / FOR SHARE）や副作用のある関数（pg_notify など）を含む
+SELECTは再実行すると本番の処理を邪魔するので、実行しない素の EXPLAIN にとどめる。
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import logging
+import random
+import re
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.core.metrics import request_timings
+
+logger = logging.getLogger(__name__)
+
+_MAX_PARAMETERS_LENGTH = 500
+
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|KEY\s+SHARE|UPDATE|SHARE)\b", re.IGNORECASE)
+_SIDE_EFFECT_FUNCTION = re.compile(
+    r"\b(?:pg_notify|nextval|setval|pg_(?:try_)?advisory_\w+|dblink\w*|lo_\w+)\s*\(",
+    re.IGNORECASE,
+)
+
+class RateLimiter:
+    """1分ごとの固定ウィンドウで件数を制限（スレッドセーフ）"""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.per_minute = per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window_start = clock()
+        self._count = 0
+        self.dropped = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = self._clock()
+            if now - self._window_start >= 60:
+                if self.dropped:
+                    logger.warning("Suppressed %d slow query log entries in the last minute", self.dropped)
+                self._window_start = now
+                self._count = 0
+                self.dropped = 0
+            if self._count >= self.per_minute:
+                self.dropped += 1
+                return False
+            self._count += 1
+            return True
+
+class SlowQueryLog:
+    """SQLAlchemyのカーソルイベントで実行時間を測り、閾値超過を記録する"""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        sample_rate: float = 1.0,
+        log_per_minute: int = 60,
+        explain: bool = False,
+        explain_per_minute: int = 6,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain = explain
+        self._log_limiter = RateLimiter(log_per_minute)
+        self._explain_limiter = RateLimiter(explain_per_minute)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def uninstall(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # 文ごとの実行コンテキストに置くので、失敗した文（after_cursor_execute が呼ばれない）の分も残らない
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._slow_query_start
+        if duration < self.threshold:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        if not self._log_limiter.allow():
+            return
+
+        timings = request_timings.get()
+        route = timings.route if timings is not None else None
+        logger.warning(
+            "Slow query (%.1f ms, route=%s): %s | parameters=%s",
+            duration * 1000,
+            route,
+            statement,
+            _truncate(repr(parameters)),
+        )
+
+        if (
+            self.explain
+            and not executemany
+            and conn.dialect.name == "postgresql"
+            and statement.lstrip().upper().startswith("SELECT")
+            and self._explain_limiter.allow()
+        ):
+            self._submit_explain(conn.engine, statement, parameters, route, _is_pure_read(statement))
+
+    def _submit_explain(
+        self, engine: Engine, statement: str, parameters: Any, route: Optional[str], analyze: bool
+    ) -> None:
+        # EXPLAINは応答を遅らせないよう1本のバックグラウンドスレッドで順番に実行
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._executor.submit(_explain, engine, statement, parameters, route, analyze)
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+def _is_pure_read(statement: str) -> bool:
+    """再実行しても行ロックや副作用を生まないSELECTか（ANALYZEで実行してよいか）"""
+    return not (_LOCKING_CLAUSE.search(statement) or _SIDE_EFFECT_FUNCTION.search(statement))
+
+def _explain(engine: Engine, statement: str, parameters: Any, route: Optional[str], analyze: bool) -> None:
+    options = "(ANALYZE, BUFFERS) " if analyze else ""
+    try:
+        # EXPLAIN文自体はSELECTで始まらないので、再帰的に計画を取得することはない
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"EXPLAIN {options}{statement}", parameters).fetchall()
+    except Exception as e:
+        logger.warning("Failed to capture EXPLAIN for slow query: %s", e)
+        return
+    plan = "\n".join(row[0] for row in rows)
+    logger.warning("EXPLAIN for slow query (route=%s): %s\n%s", route, statement, plan)
+
+def _truncate(text: str) -> str:
+    if len(text) <= _MAX_PARAMETERS_LENGTH:
+        return text
+    return text[:_MAX_PARAMETERS_LENGTH] + "..."
+
+def register_slow_query_log(engine: Engine) -> Optional[SlowQueryLog]:
+    """設定に従ってスロークエリログを有効化（閾値が0以下なら何もしない）"""
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return None
+    slow_query_log = SlowQueryLog(
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+        log_per_minute=settings.SLOW_QUERY_LOG_PER_MINUTE,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        explain_per_minute=settings.SLOW_QUERY_EXPLAIN_PER_MINUTE,
+    )
+    slow_query_log.install(engine)
+    return slow_query_log
@@ -0,0 +1,95 @@
+"""
+SQLite モード（DATABASE_URL が sqlite:/// の場合）
+
+組み込み・単一ノード向けに、接続ごとに次の PRAGMA を設定する。
+
+- journal_mode=WAL: 読み取りは書き込みをブロックせず並行に実行できる
+- synchronous=NORMAL: WAL ではコミットごとの fsync を省いても破損しない
+  （電源断時に直近のコミットが失われることはある）
+- mmap_size: データベースファイルをメモリマップして読み取りのコピーを減らす
+- foreign_keys=ON: Postgres と同じく外部キー（ON DELETE CASCADE を含む）を有効にする
+
+SQLite の書き込みは常に1つだけなので、書き込みはプロセス内のロックで1本に並べる
+（シングルライター）。最初の INSERT/UPDATE/DELETE（または SELECT ... FOR UPDATE）の前に
+ロックを取って BEGIN IMMEDIATE で書き込みトランザクションを始め、コミットかロールバックで
+解放する。ロック待ちのスレッドが SQLite のビジーハンドラーで待機・再試行を繰り返さずに済み、
+読み取りのみのトランザクションはロックを取らない。
+複数プロセス（WEB_CONCURRENCY > 1）の間は BEGIN IMMEDIATE と busy_timeout で待ち合わせる。
+"""
+import logging
+import sqlite3
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+# 書き込みロックを持っている接続の印（接続プールのレコードの info に置く）
+_WRITER_KEY = "sqlite_writer"
+
+_write_lock = threading.Lock()
+
+def _is_write(statement: str, context) -> bool:
+    if statement.lstrip()[:7].upper().startswith(_WRITE_PREFIXES):
+        return True
+    # SQLite は FOR UPDATE を出力しないので、行ロック付きの SELECT も書き込みとして扱う
+    compiled = getattr(context, "compiled", None)
+    return compiled is not None and getattr(compiled.statement, "_for_update_arg", None) is not None
+
+def configure_sqlite(engine: Engine) -> None:
+    """SQLite 用の PRAGMA とシングルライターのトランザクション制御を登録"""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _begin_write(conn, cursor, statement, parameters, context, executemany):
+        if conn.info.get(_WRITER_KEY) or not _is_write(statement, context):
+            return
+        if not _write_lock.acquire(timeout=settings.SQLITE_BUSY_TIMEOUT):
+            raise sqlite3.OperationalError("database is locked (waiting for the writer lock)")
+        try:
+            dbapi_connection = conn.connection.dbapi_connection
+            if dbapi_connection.in_transaction:
+                # 読み取りで始まったトランザクションは書き込みに昇格できないことがあるので終わらせる
+                dbapi_connection.commit()
+            cursor.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            _write_lock.release()
+            raise
+        conn.info[_WRITER_KEY] = True
+
+    # 実際のコミットが終わってからロックを解放する（SQLAlchemy が続けて呼ぶ commit() は何もしない）
+    @event.listens_for(engine, "commit")
+    def _commit_write(conn):
+        if conn.info.get(_WRITER_KEY):
+            conn.connection.dbapi_connection.commit()
+            conn.info.pop(_WRITER_KEY)
+            _write_lock.release()
+
+    @event.listens_for(engine, "rollback")
+    def _rollback_write(conn):
+        if conn.info.get(_WRITER_KEY):
+            try:
+                conn.connection.dbapi_connection.rollback()
+            finally:
+                conn.info.pop(_WRITER_KEY)
+                _write_lock.release()
+
+    # 接続が無効化されるなどで commit/rollback を通らずにプールへ戻った場合
+    @event.listens_for(engine, "checkin")
+    def _release_on_checkin(dbapi_connection, connection_record):
+        if connection_record.info.pop(_WRITER_KEY, None):
+            logger.warning("Releasing SQLite writer lock held by a connection returned to the pool")
+            _write_lock.release()
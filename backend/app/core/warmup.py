@@ -0,0 +1,42 @@
+from typing import List
+import asyncio
+import logging
+import time
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+def warm_db_pool(engine: Engine, connections: int) -> None:
+    """コネクションプールに接続を事前に確立しておく"""
+    opened: List[Connection] = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            opened.append(connection)
+    finally:
+        # closeでプールに返却され、次のリクエストで再利用される
+        for connection in opened:
+            connection.close()
+
+def prime_schemas(app: FastAPI) -> None:
+    """OpenAPIスキーマを生成し、Pydanticモデルのスキーマ構築を先に済ませる"""
+    app.openapi()
+
+async def warmup(app: FastAPI, engine: Engine, db_connections: int, probe) -> None:
+    """最初のリクエストがコールドスタートのコストを払わないよう起動時に温める"""
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        run_in_threadpool(warm_db_pool, engine, db_connections),
+        probe.refresh(),
+        return_exceptions=True,
+    )
+    prime_schemas(app)
+
+    for name, result in zip(("database pool", "AI probe"), results):
+        if isinstance(result, Exception):
+            logger.warning("Warmup of %s failed: %s", name, result)
+    logger.info("Warmup finished in %.1f ms", (time.perf_counter() - start) * 1000)
@@ -1,19 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
 from app.api.v1.router import api_router
+from app.core.admission import publish_limits
 from app.core.database import engine, Base
 from app.core.error_handlers import register_error_handlers
-import logging
+from app.core.idempotency import register_idempotency
+from app.core.logging_config import RequestIdMiddleware, configure_logging
+from app.core.metrics import register_metrics
+from app.core.profiling import register_profiling
+from app.core.slow_query import register_slow_query_log
+from app.core.warmup import warmup
+from app.services.ai_service import ai_service
+from app.services.ai_scoring_service import ai_scoring_workers
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    publish_limits()
+    
+    # Create database tables
+    if settings.DB_CREATE_TABLES:
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    
+    ai_service.load_power_model()
+    if settings.STARTUP_WARMUP:
+        await warmup(app, engine, settings.DB_WARMUP_CONNECTIONS, ai_service.probe)
+    
+    ai_service.probe.start()
+    ai_scoring_workers.start()
+    
+    yield
+    
+    await ai_scoring_workers.stop()
+    await ai_service.probe.stop()
+    await ai_service.aclose()
+    if slow_query_log is not None:
+        slow_query_log.shutdown()
+    engine.dispose()
 
 app = FastAPI(
     title="Pokemon TODO API",
@@ -21,11 +47,24 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Register error handlers
 register_error_handlers(app)
 
+# Idempotency-Key replay for retried writes (innermost, so replays are still measured and profiled)
+register_idempotency(app)
+
+# On-demand request profiling (PROFILING_SECRET / PROFILING_SLOWEST_DIR)
+register_profiling(app)
+
+# Prometheus metrics (/metrics) and Server-Timing headers
+register_metrics(app, engine)
+
+# Slow query log (SLOW_QUERY_THRESHOLD_MS)
+slow_query_log = register_slow_query_log(engine)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Correlation ID for logs (outermost so every log line of the request carries it)
+app.add_middleware(RequestIdMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
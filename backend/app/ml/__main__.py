@@ -0,0 +1,134 @@
+"""
+ローカル威力モデルの学習・評価CLI
+
+    python -m app.ml train --output models/power_model.npz
+    python -m app.ml evaluate --model models/power_model.npz
+"""
+from pathlib import Path
+from typing import List, Optional, Sequence
+import argparse
+import json
+import random
+import sys
+import time
+
+from app.config import settings
+from app.ml.power_model import PowerModel, PowerSample, evaluate, sample_text
+from app.services.ai_service import AIService
+
+def load_samples(jsonl_paths: Sequence[str], limit: Optional[int], from_db: bool) -> List[PowerSample]:
+    """
+    DBのMoveとJSONLファイル（name, description, power）から学習データを読み込む
+
+    DBからはAIの採点ジョブが完了し、採点結果の威力のまま残っているMoveだけを使う。
+    登録時の暫定威力（ローカルモデル・ルールベース）や既定値の50のままの行を
+    学習するとモデル自身の出力を正解として学習してしまうため除外する。
+    """
+    samples: List[PowerSample] = []
+
+    if from_db:
+        from sqlalchemy import exists
+        from app.core.database import SessionLocal
+        from app.models.ai_scoring_job import AIScoringJob
+        from app.models.move import Move
+
+        db = SessionLocal()
+        try:
+            # ユーザーが後から威力を変更した行も採点結果と一致しなくなるので除外される
+            ai_scored = exists().where(
+                AIScoringJob.move_id == Move.id,
+                AIScoringJob.status == "done",
+                AIScoringJob.scored_power == Move.power,
+            )
+            query = db.query(Move.name, Move.description, Move.power).filter(
+                ai_scored
+            ).order_by(Move.created_at.desc())
+            if limit:
+                query = query.limit(limit)
+            samples.extend(PowerSample(name, description, power) for name, description, power in query)
+        finally:
+            db.close()
+
+    for path in jsonl_paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    samples.append(PowerSample(row["name"], row.get("description"), int(row["power"])))
+
+    return samples[:limit] if limit else samples
+
+def report(label: str, metrics: dict) -> None:
+    print(f"{label:<12} MAE={metrics['mae']:.2f}  RMSE={metrics['rmse']:.2f}  R2={metrics['r2']:.3f}")
+
+def report_against_rules(model: PowerModel, samples: Sequence[PowerSample]) -> None:
+    actual = [s.power for s in samples]
+    report("model", evaluate(model.predict_batch([sample_text(s.name, s.description) for s in samples]), actual))
+    report("rule-based", evaluate([AIService.rule_based_power(s.name, s.description) for s in samples], actual))
+
+def train(args: argparse.Namespace) -> int:
+    samples = load_samples(args.jsonl, args.limit, not args.no_db)
+    if len(samples) < 10:
+        print(f"Not enough training samples ({len(samples)})", file=sys.stderr)
+        return 1
+
+    random.Random(args.seed).shuffle(samples)
+    n_test = int(len(samples) * args.test_size)
+    if n_test:
+        holdout, train_set = samples[:n_test], samples[n_test:]
+        model = PowerModel.train(train_set, n_features=args.features, alpha=args.alpha)
+        print(f"Holdout evaluation ({len(train_set)} train / {len(holdout)} test)")
+        report_against_rules(model, holdout)
+
+    model = PowerModel.train(samples, n_features=args.features, alpha=args.alpha)
+    model.save(Path(args.output))
+    print(f"Saved model trained on {len(samples)} samples to {args.output}")
+    return 0
+
+def evaluate_model(args: argparse.Namespace) -> int:
+    model = PowerModel.load(Path(args.model))
+    samples = load_samples(args.jsonl, args.limit, not args.no_db)
+    if not samples:
+        print("No evaluation samples", file=sys.stderr)
+        return 1
+
+    print(f"Evaluation on {len(samples)} samples")
+    report_against_rules(model, samples)
+
+    texts = [sample_text(s.name, s.description) for s in samples]
+    start = time.perf_counter()
+    for s in samples:
+        model.predict(s.name, s.description)
+    single = (time.perf_counter() - start) / len(samples)
+    start = time.perf_counter()
+    model.predict_batch(texts)
+    batch = (time.perf_counter() - start) / len(samples)
+    print(f"latency      single={single * 1e6:.1f}us  batch={batch * 1e6:.1f}us/item")
+    return 0
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.ml", description="Local power model tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--jsonl", action="append", default=[], help="Extra samples (name, description, power) in JSON Lines")
+    common.add_argument("--no-db", action="store_true", help="Do not read moves from the database")
+    common.add_argument("--limit", type=int, default=None, help="Maximum number of samples")
+
+    train_parser = subparsers.add_parser("train", parents=[common], help="Train and save a model")
+    train_parser.add_argument("--output", default=settings.POWER_MODEL_PATH)
+    train_parser.add_argument("--features", type=int, default=2 ** 12, help="Hashed feature dimension (power of two)")
+    train_parser.add_argument("--alpha", type=float, default=1.0, help="Ridge regularization strength")
+    train_parser.add_argument("--test-size", type=float, default=0.2, help="Holdout fraction for evaluation")
+    train_parser.add_argument("--seed", type=int, default=0)
+    train_parser.set_defaults(func=train)
+
+    evaluate_parser = subparsers.add_parser("evaluate", parents=[common], help="Evaluate a saved model")
+    evaluate_parser.add_argument("--model", default=settings.POWER_MODEL_PATH)
+    evaluate_parser.set_defaults(func=evaluate_model)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
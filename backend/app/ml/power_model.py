@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import math
+import zlib
+
+import numpy as np
+
+DEFAULT_N_FEATURES = 2 ** 12
+DEFAULT_NGRAM_RANGE = (1, 3)
+
+@dataclass
+class PowerSample:
+    name: str
+    description: Optional[str]
+    power: int
+
+def sample_text(name: str, description: Optional[str] = None) -> str:
+    """学習・推論で共通に使う入力テキスト"""
+    return f"{name} {description}" if description else name
+
+class PowerModel:
+    """
+    文字n-gram TF-IDF + リッジ回帰による威力推定モデル
+
+    文字n-gramを使うため、単語分割なしで日本語のタスク名も扱える。
+    特徴量はハッシュトリックで固定次元に写像するので語彙を保持する必要がない。
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        idf: np.ndarray,
+        intercept: float,
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+        metadata: Optional[Dict] = None,
+    ):
+        self.weights = weights
+        self.idf = idf
+        self.intercept = intercept
+        self.ngram_range = ngram_range
+        self.metadata = metadata or {}
+        self.n_features = len(weights)
+        # 推論時は idf と重みの積だけあればよい
+        self._idf_weights = idf * weights
+
+    # ---- 特徴量 ----
+
+    @staticmethod
+    def _hash_ngrams(
+        text: str, n_features: int, ngram_range: Tuple[int, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """テキストをハッシュ化した文字n-gramの (インデックス, サブリニアTF) に変換"""
+        normalized = f" {' '.join(text.lower().split())} "
+        mask = n_features - 1
+        counts: Dict[int, int] = {}
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            for i in range(len(normalized) - n + 1):
+                index = zlib.crc32(normalized[i:i + n].encode("utf-8")) & mask
+                counts[index] = counts.get(index, 0) + 1
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+        return indices, tf
+
+    @classmethod
+    def _featurize(
+        cls, texts: Sequence[str], n_features: int, ngram_range: Tuple[int, int]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """複数テキストをCOO形式 (行, 列, TF) の疎行列にまとめる"""
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        for row, text in enumerate(texts):
+            indices, tf = cls._hash_ngrams(text, n_features, ngram_range)
+            rows.append(np.full(len(indices), row, dtype=np.int64))
+            cols.append(indices)
+            values.append(tf)
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+
+    # ---- 推論 ----
+
+    def predict_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """複数テキストの威力をまとめて推定（1-100の整数配列）"""
+        rows, cols, tf = self._featurize(texts, self.n_features, self.ngram_range)
+        n = len(texts)
+        weighted = tf * self.idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weighted * weighted, minlength=n))
+        scores = np.bincount(rows, weights=tf * self._idf_weights[cols], minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.where(norms > 0, scores / norms, 0.0)
+        return np.clip(np.rint(scores + self.intercept), 1, 100).astype(np.int64)
+
+    def predict(self, name: str, description: Optional[str] = None) -> int:
+        """1件の威力を推定"""
+        indices, tf = self._hash_ngrams(
+            sample_text(name, description), self.n_features, self.ngram_range
+        )
+        weighted = tf * self.idf[indices]
+        norm = math.sqrt(float(weighted @ weighted))
+        score = float(tf @ self._idf_weights[indices]) / norm if norm else 0.0
+        return int(max(1, min(100, round(score + self.intercept))))
+
+    # ---- 学習 ----
+
+    @classmethod
+    def train(
+        cls,
+        samples: Sequence[PowerSample],
+        n_features: int = DEFAULT_N_FEATURES,
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+        alpha: float = 1.0,
+        batch_size: int = 2048,
+    ) -> "PowerModel":
+        """
+        リッジ回帰で学習
+
+        X^T X をバッチごとに積み上げるので、メモリ使用量はサンプル数ではなく
+        特徴量次元の2乗で決まる。
+        """
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        if not samples:
+            raise ValueError("No training samples")
+
+        texts = [sample_text(s.name, s.description) for s in samples]
+        y = np.array([s.power for s in samples], dtype=np.float64)
+        rows, cols, tf = cls._featurize(texts, n_features, ngram_range)
+
+        n = len(samples)
+        df = np.bincount(cols, minlength=n_features)
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+        values = tf * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n))
+        values = values / norms[rows]
+
+        intercept = float(y.mean())
+        y_centered = y - intercept
+
+        gram = np.zeros((n_features, n_features), dtype=np.float64)
+        xty = np.zeros(n_features, dtype=np.float64)
+        boundaries = list(range(0, n, batch_size)) + [n]
+        offsets = np.searchsorted(rows, boundaries)
+        for start, end, lo, hi in zip(
+            boundaries[:-1], boundaries[1:], offsets[:-1], offsets[1:]
+        ):
+            size = end - start
+            batch = np.zeros((size, n_features), dtype=np.float64)
+            batch[rows[lo:hi] - start, cols[lo:hi]] = values[lo:hi]
+            gram += batch.T @ batch
+            xty += batch.T @ y_centered[start:start + size]
+
+        gram[np.diag_indices_from(gram)] += alpha
+        weights = np.linalg.solve(gram, xty)
+
+        return cls(
+            weights=weights,
+            idf=idf,
+            intercept=intercept,
+            ngram_range=ngram_range,
+            metadata={"n_samples": n, "alpha": alpha},
+        )
+
+    # ---- 永続化 ----
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                weights=self.weights,
+                idf=self.idf,
+                intercept=np.array(self.intercept),
+                ngram_range=np.array(self.ngram_range),
+                metadata=np.array(json.dumps(self.metadata)),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "PowerModel":
+        with np.load(path) as data:
+            return cls(
+                weights=data["weights"],
+                idf=data["idf"],
+                intercept=float(data["intercept"]),
+                ngram_range=tuple(int(v) for v in data["ngram_range"]),
+                metadata=json.loads(str(data["metadata"])),
+            )
+
+def evaluate(predicted: Iterable[int], actual: Iterable[int]) -> Dict[str, float]:
+    """MAE / RMSE / R^2 を計算"""
+    predicted = np.asarray(list(predicted), dtype=np.float64)
+    actual = np.asarray(list(actual), dtype=np.float64)
+    errors = predicted - actual
+    variance = float(((actual - actual.mean()) ** 2).sum())
+    return {
+        "mae": float(np.abs(errors).mean()),
+        "rmse": float(np.sqrt((errors ** 2).mean())),
+        "r2": 1.0 - float((errors ** 2).sum()) / variance if variance else 0.0,
+    }
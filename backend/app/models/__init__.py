@@ -1,5 +1,8 @@
 from app.models.pokemon import Pokemon
 from app.models.move import Move
 from app.models.battle import Battle
+from app.models.ai_scoring_job import AIScoringJob
+from app.models.idempotency_key import IdempotencyKey
+from app.models.deletion import Deletion
 
-__all__ = ["Pokemon", "Move", "Battle"]
\ No newline at end of file
+__all__ = ["Pokemon", "Move", "Battle", "AIScoringJob", "IdempotencyKey", "Deletion"]
\ No newline at end of file
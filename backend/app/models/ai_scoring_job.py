@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Index, Uuid
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+from app.core.ids import uuid7
+
+class AIScoringJob(Base):
+    """MoveのAI威力計算ジョブ（SELECT ... FOR UPDATE SKIP LOCKED で取り出すキュー）"""
+    __tablename__ = "ai_scoring_jobs"
+    
+    id = Column(Uuid, primary_key=True, default=uuid7)
+    move_id = Column(Uuid, ForeignKey("moves.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending / running / done / failed
+    provisional_power = Column(Integer, nullable=False)
+    difficulty_level = Column(String, nullable=False, default="medium", server_default="medium")  # easy / medium / hard
+    scored_power = Column(Integer, nullable=True)  # AIが返した威力（status=done のとき）
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)  # 可視性タイムアウト
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    move = relationship("Move")
+    
+    __table_args__ = (
+        Index("ix_ai_scoring_jobs_status_available_at", "status", "available_at"),
+    )
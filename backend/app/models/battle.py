@@ -1,15 +1,14 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Float, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import uuid
 from app.core.database import Base
+from app.core.ids import uuid7
 
 class Battle(Base):
     __tablename__ = "battles"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    pokemon_id = Column(UUID(as_uuid=True), ForeignKey("pokemon.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid7)
+    pokemon_id = Column(Uuid, ForeignKey("pokemon.id"), nullable=False)
     enemy_name = Column(String, nullable=False)
     enemy_max_hp = Column(Integer, default=100)
     enemy_current_hp = Column(Integer, default=100)
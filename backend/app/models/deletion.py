@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, Index, Uuid
+from app.core.database import Base, utcnow
+from app.core.ids import uuid7
+
+class Deletion(Base):
+    """削除ログ（差分同期でクライアントに削除を伝えるトゥームストーン）"""
+    __tablename__ = "deletions"
+    
+    id = Column(Uuid, primary_key=True, default=uuid7)
+    entity = Column(String, nullable=False)  # pokemon / move
+    entity_id = Column(Uuid, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=utcnow(), server_default=utcnow())
+    
+    __table_args__ = (
+        Index("ix_deletions_deleted_at_id", "deleted_at", "id"),
+    )
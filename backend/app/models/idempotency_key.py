@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary, Index
+from app.core.database import Base
+
+class IdempotencyKey(Base):
+    """Idempotency-Key ごとの最初のレスポンス（期限切れの行は定期的に削除）"""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # メソッド・パス・ボディのSHA-256
+    status = Column(String, nullable=False, default="in_progress")  # in_progress / completed
+    response_status = Column(Integer, nullable=True)
+    response_content_type = Column(String, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
@@ -1,22 +1,21 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Uuid
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
-from app.core.database import Base
+from app.core.database import Base, utcnow
+from app.core.ids import uuid7
 
 class Move(Base):
     __tablename__ = "moves"
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    pokemon_id = Column(UUID(as_uuid=True), ForeignKey("pokemon.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid7)
+    pokemon_id = Column(Uuid, ForeignKey("pokemon.id"), nullable=False)
     name = Column(String, nullable=False)
     description = Column(Text)
     power = Column(Integer, default=50)  # 1-100
     is_completed = Column(Boolean, default=False)
     completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow(), index=True)
     
     # Relationships
     pokemon = relationship("Pokemon", back_populates="moves")
\ No newline at end of file
@@ -1,21 +1,22 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, DateTime, Uuid
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
-from app.core.database import Base
+from app.core.database import Base, utcnow
+from app.core.ids import uuid7
 
 class Pokemon(Base):
     __tablename__ = "pokemon"
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid7)
     name = Column(String, nullable=False)
     type = Column(String, nullable=False, default="normal")
     level = Column(Integer, default=1)
     experience = Column(Float, default=0)
     evolution_stage = Column(Integer, default=1)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps are set by the database and read back with RETURNING (eager_defaults).
+    # default= covers tables created before server_default was added.
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow(), index=True)
     
     # Relationships
     moves = relationship("Move", back_populates="pokemon", cascade="all, delete-orphan")
@@ -11,6 +11,21 @@ from app.schemas.move import (
     MoveUpdate,
     Move
 )
+from app.schemas.dashboard import (
+    DashboardEntry,
+    Dashboard
+)
+from app.schemas.sync import (
+    Tombstone,
+    SyncResponse
+)
+from app.schemas.projection import (
+    ProjectionStep,
+    ProjectionOutcome,
+    ProjectionScenario,
+    PokemonProjection,
+    PokemonProjectionSummary
+)
 from app.schemas.battle import (
     BattleBase,
     BattleCreate,
@@ -20,5 +35,9 @@ from app.schemas.battle import (
 __all__ = [
     "PokemonBase", "PokemonCreate", "PokemonUpdate", "Pokemon", "PokemonWithMoves",
     "MoveBase", "MoveCreate", "MoveUpdate", "Move",
+    "DashboardEntry", "Dashboard",
+    "Tombstone", "SyncResponse",
+    "ProjectionStep", "ProjectionOutcome", "ProjectionScenario",
+    "PokemonProjection", "PokemonProjectionSummary",
     "BattleBase", "BattleCreate", "Battle"
 ]
\ No newline at end of file
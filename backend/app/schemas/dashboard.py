@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List
+from app.schemas.move import Move
+from app.schemas.pokemon import Pokemon
+
+class DashboardEntry(BaseModel):
+    pokemon: Pokemon
+    pending_move_count: int = Field(ge=0, description="Number of moves not completed yet")
+    top_pending_moves: List[Move] = Field(description="Highest-power pending moves, strongest first")
+
+class Dashboard(BaseModel):
+    """Everything the home page needs in one response"""
+    pokemon: List[DashboardEntry]
+    recent_completions: List[Move] = Field(description="Most recently completed moves across all Pokemon")
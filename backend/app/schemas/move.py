@@ -2,9 +2,14 @@ from pydantic import BaseModel, Field, ConfigDict, field_validator, model_valida
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
-import re
 
-class MoveBase(BaseModel):
+class MoveFields(BaseModel):
+    """
+    Fields shared by the request and response schemas.
+    
+    Response schemas are built from rows that were sanitized on the way in,
+    so they inherit the constraints but not the sanitizing validators.
+    """
     name: str = Field(
         ..., 
         min_length=1, 
@@ -23,19 +28,17 @@ class MoveBase(BaseModel):
         le=100,
         description="Power/Priority level (1-100)"
     )
-    
+
+class MoveBase(MoveFields):
     @field_validator('name')
     @classmethod
     def validate_name(cls, v: str) -> str:
         """Validate and sanitize move name"""
-        # Remove leading/trailing whitespace
-        v = v.strip()
-        
-        # Normalize multiple spaces to single space
+        # Trim and collapse runs of whitespace (split() without arguments does both)
         v = ' '.join(v.split())
         
         # Check minimum meaningful length (allow shorter names for Japanese/CJK characters)
-        if len(v) < 1:
+        if not v:
             raise ValueError('Move name cannot be empty')
         
         return v
@@ -46,32 +49,17 @@ class MoveBase(BaseModel):
         """Validate and sanitize description"""
         if v is None:
             return v
-            
-        # Remove leading/trailing whitespace
-        v = v.strip()
         
-        # If empty after stripping, return None
-        if not v:
-            return None
-            
-        # Normalize multiple spaces/newlines
-        v = ' '.join(v.split())
-        
-        return v
-    
-    @field_validator('power')
-    @classmethod
-    def validate_power(cls, v: int) -> int:
-        """Validate power is in reasonable ranges"""
-        # Define power categories for better UX
-        if v <= 0:
-            raise ValueError('Power must be greater than 0')
-        if v > 100:
-            raise ValueError('Power cannot exceed 100')
-        return v
+        # Normalize whitespace; empty after stripping becomes None
+        return ' '.join(v.split()) or None
 
 class MoveCreate(MoveBase):
     pokemon_id: UUID
+    difficulty_level: str = Field(
+        default="medium",
+        pattern="^(easy|medium|hard)$",
+        description="Difficulty hint for the background AI power score (used when power is omitted)"
+    )
 
 class MoveUpdate(BaseModel):
     name: Optional[str] = Field(
@@ -102,9 +90,8 @@ class MoveUpdate(BaseModel):
         """Validate name if provided"""
         if v is None:
             return v
-        v = v.strip()
         v = ' '.join(v.split())
-        if len(v) < 1:
+        if not v:
             raise ValueError('Move name cannot be empty')
         return v
     
@@ -114,13 +101,9 @@ class MoveUpdate(BaseModel):
         """Validate description if provided"""
         if v is None:
             return v
-        v = v.strip()
-        if not v:
-            return None
-        v = ' '.join(v.split())
-        return v
+        return ' '.join(v.split()) or None
 
-class Move(MoveBase):
+class Move(MoveFields):
     model_config = ConfigDict(from_attributes=True)
     
     id: UUID
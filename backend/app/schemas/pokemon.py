@@ -2,7 +2,6 @@ from pydantic import BaseModel, Field, ConfigDict, field_validator, model_valida
 from typing import Optional, List, TYPE_CHECKING, Literal
 from datetime import datetime
 from uuid import UUID
-import re
 
 if TYPE_CHECKING:
     from app.schemas.move import Move
@@ -14,7 +13,13 @@ PokemonType = Literal[
     "rock", "ghost", "dragon", "dark", "steel", "fairy"
 ]
 
-class PokemonBase(BaseModel):
+class PokemonFields(BaseModel):
+    """
+    Fields shared by the request and response schemas.
+    
+    Response schemas are built from rows that were sanitized on the way in,
+    so they inherit the constraints but not the sanitizing validators.
+    """
     name: str = Field(
         ..., 
         min_length=1, 
@@ -26,20 +31,18 @@ class PokemonBase(BaseModel):
         default="normal",
         description="Pokemon type"
     )
-    
+
+class PokemonBase(PokemonFields):
     @field_validator('name')
     @classmethod
     def validate_name(cls, v: str) -> str:
         """Validate and sanitize Pokemon name"""
-        # Remove leading/trailing whitespace
-        v = v.strip()
-        
-        # Normalize multiple spaces to single space
+        # Trim and collapse runs of whitespace (split() without arguments does both)
         v = ' '.join(v.split())
         
         # Allow any characters for Pokemon names (including Japanese, emojis, etc.)
         # Just ensure it's not empty and not too long
-        if len(v) == 0:
+        if not v:
             raise ValueError('Pokemon name cannot be empty')
         
         return v
@@ -65,20 +68,17 @@ class PokemonUpdate(BaseModel):
         """Validate and sanitize Pokemon name if provided"""
         if v is None:
             return v
-            
-        # Apply same validation as PokemonBase
-        v = v.strip()
         
-        # Normalize multiple spaces to single space
+        # Apply same validation as PokemonBase
         v = ' '.join(v.split())
         
         # Allow any characters for Pokemon names
-        if len(v) == 0:
+        if not v:
             raise ValueError('Pokemon name cannot be empty')
         
         return v
 
-class Pokemon(PokemonBase):
+class Pokemon(PokemonFields):
     model_config = ConfigDict(from_attributes=True)
     
     id: UUID
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from uuid import UUID
+
+ProjectionOrdering = Literal["listed", "strongest_first", "weakest_first"]
+
+class ProjectionStep(BaseModel):
+    """State after completing one pending move"""
+    move_id: UUID
+    power: int
+    experience_gain: int
+    level: int
+    evolution_stage: int
+    total_damage: int = Field(description="Damage dealt to the enemy so far")
+
+class ProjectionOutcome(BaseModel):
+    ordering: ProjectionOrdering
+    final_level: int
+    final_experience: float
+    final_evolution_stage: int
+    total_experience: int = Field(description="Experience gained from all pending moves")
+    total_damage: int = Field(description="Damage dealt by all pending moves")
+    moves_to_level_up: Optional[int] = Field(description="Moves to complete until the next level (null if the pending moves are not enough)")
+    moves_to_evolve: Optional[int] = Field(description="Moves to complete until the next evolution (null if the pending moves are not enough)")
+    moves_to_defeat_enemy: Optional[int] = Field(description="Moves to complete until the current enemy is defeated (null without an active battle or if not enough)")
+    enemy_remaining_hp: Optional[int] = Field(description="Enemy HP left after all pending moves (null without an active battle)")
+
+class ProjectionScenario(ProjectionOutcome):
+    steps: List[ProjectionStep] = Field(description="Pending moves in this ordering with the state after each")
+
+class PokemonProjection(BaseModel):
+    """What-if projection of one Pokemon's pending moves"""
+    pokemon_id: UUID
+    pending_move_count: int
+    enemy_name: Optional[str] = None
+    enemy_hp: Optional[int] = None
+    scenarios: List[ProjectionScenario]
+
+class PokemonProjectionSummary(ProjectionOutcome):
+    """Projection of one Pokemon on the dashboard"""
+    pokemon_id: UUID
+    pending_move_count: int
+    enemy_name: Optional[str] = None
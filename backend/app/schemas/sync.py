@@ -0,0 +1,21 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal
+from datetime import datetime
+from uuid import UUID
+from app.schemas.move import Move
+from app.schemas.pokemon import Pokemon
+
+class Tombstone(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    entity: Literal["pokemon", "move"]
+    entity_id: UUID
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    """Changes since the given sync token"""
+    pokemon: List[Pokemon] = Field(description="Pokemon created or updated since the token")
+    moves: List[Move] = Field(description="Moves created or updated since the token")
+    deleted: List[Tombstone] = Field(description="Deleted Pokemon and moves (a deleted Pokemon's moves are gone too)")
+    next_token: str = Field(description="Pass as 'since' on the next sync")
+    has_more: bool = Field(description="More changes are pending; sync again with next_token right away")
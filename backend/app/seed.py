@@ -0,0 +1,289 @@
+"""
+スケール検証用の合成データ投入CLI
+
+    python -m app.seed --pokemon 100000 --moves 10000000 --seed 42
+
+同じ --seed と件数からは常に同じデータを生成する。各行は通し番号から決まるため、
+件数を増やして再実行すると既存の行の続きだけを追加する（トップアップ）。
+サービス層を通さず、PostgreSQLでは COPY で一括投入する（それ以外のDBではexecutemany）。
+
+- Pokemonごとの技数は対数正規分布で偏らせる（少数のPokemonに技が集中する）
+- 日本語と英語の名前を混在させ、約4割の技を完了済みにする
+- Moveの持ち主の選び方は --pokemon に依存する（Pokemonを増やした後に追加したMoveだけが新しいPokemonにも割り当てられる）
+- 生成した行のIDは作成時刻をタイムスタンプにしたUUIDv7で、乱数部の先頭32ビットが
+  シードごとのタグになっている。チャンクは通し番号順にコミットするので投入済みの行は
+  常に先頭からの連続した範囲になり、通し番号から求めたIDの有無を二分探索して
+  投入済みの行数を求める（シードで投入した行は個別に削除しないこと）
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+import argparse
+import csv
+import io
+import sys
+import time
+import uuid
+import zlib
+
+import numpy as np
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import Engine
+
+from app.core.database import Base, engine as default_engine
+from app.core.ids import uuid7_from
+from app.models.move import Move
+from app.models.pokemon import Pokemon
+
+# 生成データの基準時刻（実行時刻に依存させない）
+EPOCH = datetime(2024, 1, 1)
+# 作成時刻の間隔（秒）。既定の件数でおよそ2年分になり、件数を増やしても既存行の時刻は変わらない
+POKEMON_INTERVAL_SECONDS = 600
+MOVE_INTERVAL_SECONDS = 6
+# 行の種類（kind）ごとの作成時刻の間隔。0: Pokemon、1: Move
+INTERVALS = (POKEMON_INTERVAL_SECONDS, MOVE_INTERVAL_SECONDS)
+EPOCH_MS = int((EPOCH - datetime(1970, 1, 1)).total_seconds()) * 1000
+
+POKEMON_NAMES = [
+    "Pikachu", "Charizard", "Bulbasaur", "Squirtle", "Eevee", "Snorlax", "Gengar", "Lucario",
+    "ピカチュウ", "リザードン", "フシギダネ", "ゼニガメ", "イーブイ", "カビゴン", "ゲンガー", "ルカリオ",
+]
+POKEMON_TYPES = [
+    "normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+    "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+MOVE_VERBS_EN = ["Write", "Review", "Fix", "Refactor", "Design", "Plan", "Clean", "Update", "Research", "Buy"]
+MOVE_OBJECTS_EN = ["the report", "pull request", "login bug", "battle engine", "slides", "budget", "kitchen", "groceries", "API docs", "test suite"]
+MOVE_NAMES_JA = ["資料を作成する", "レビューを返す", "バグを修正する", "部屋を掃除する", "買い物に行く", "設計書を書く", "メールを返信する", "勉強会の準備", "家計簿をつける", "ジョギング"]
+DESCRIPTIONS = [
+    "Break it into smaller steps before starting.",
+    "Needs input from the team.",
+    "締め切りは今週末。",
+    "前回の続きから進める。",
+]
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def seed_tag(seed: int) -> int:
+    """シードごとのIDのタグ（32ビット）"""
+    return zlib.crc32(f"pokemon-todo-seed:{seed}".encode())
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _hash(seed: int, kind: int, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """通し番号から決まる64ビットのハッシュ2つ"""
+    with np.errstate(over="ignore"):
+        base = np.asarray(indices).astype(np.uint64) * np.uint64(4) + np.uint64(kind)
+        high = _splitmix64(base ^ np.uint64(seed & 0xFFFFFFFF))
+        low = _splitmix64(high ^ _MASK64)
+    return high, low
+
+def created_offsets(seed: int, kind: int, indices: np.ndarray) -> np.ndarray:
+    """通し番号にほぼ比例して増える作成時刻（EPOCHからの秒）"""
+    _, low = _hash(seed, kind, indices)
+    return (indices + (low >> np.uint64(11)) / float(1 << 53)) * INTERVALS[kind]
+
+def make_ids(seed: int, kind: int, indices: np.ndarray) -> List[uuid.UUID]:
+    """
+    通し番号から決まるUUIDv7
+
+    タイムスタンプは行の作成時刻（ミリ秒）なので、IDの順序は作成順と一致する。
+    74ビットの乱数部は先頭32ビットがシードタグ、残り42ビットが通し番号のハッシュ。
+    """
+    tag = seed_tag(seed) << 42
+    high, _ = _hash(seed, kind, indices)
+    # 作成時刻の間隔は1ミリ秒より長いので、同じ種類の行でタイムスタンプが重なることはない
+    unix_ms = EPOCH_MS + np.floor(created_offsets(seed, kind, indices) * 1000).astype(np.int64)
+    return [
+        uuid7_from(ms, tag | (hashed >> 22))
+        for ms, hashed in zip(unix_ms.tolist(), high.tolist())
+    ]
+
+def id_seed_tag(value: uuid.UUID) -> int:
+    """make_ids で生成したIDのシードタグ（seed_tag と比べてシードで投入した行か判定する）"""
+    random_bits = ((value.int >> 64) & 0xFFF) << 62 | (value.int & ((1 << 62) - 1))
+    return random_bits >> 42
+
+def _chunk_rng(seed: int, kind: int, chunk: int) -> np.random.Generator:
+    return np.random.default_rng([seed, kind, chunk])
+
+def generate_pokemon(seed: int, start: int, end: int, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Pokemon[start:end] をチャンク単位で生成"""
+    for chunk in range(start // chunk_size, (end - 1) // chunk_size + 1 if end > start else 0):
+        lo, hi = chunk * chunk_size, (chunk + 1) * chunk_size
+        rng = _chunk_rng(seed, 0, chunk)
+        index = np.arange(lo, hi)
+        names = rng.integers(0, len(POKEMON_NAMES), chunk_size)
+        types = rng.integers(0, len(POKEMON_TYPES), chunk_size)
+        # 多くは低レベル、一部が高レベル
+        levels = np.clip(np.rint(rng.gamma(1.5, 12, chunk_size)) + 1, 1, 100).astype(int)
+        experience = np.round(rng.uniform(0, 100, chunk_size), 1)
+        created = created_offsets(seed, 0, index)
+        updated = created + rng.uniform(0, 30 * 24 * 3600, chunk_size)
+        ids = make_ids(seed, 0, index)
+
+        rows = []
+        for i in range(max(lo, start) - lo, min(hi, end) - lo):
+            level = int(levels[i])
+            rows.append({
+                "id": ids[i],
+                "name": f"{POKEMON_NAMES[names[i]]} #{lo + i}",
+                "type": POKEMON_TYPES[types[i]],
+                "level": level,
+                "experience": min(float(experience[i]), 99.9),
+                "evolution_stage": 3 if level >= 36 else 2 if level >= 16 else 1,
+                "created_at": EPOCH + timedelta(seconds=float(created[i])),
+                "updated_at": EPOCH + timedelta(seconds=float(updated[i])),
+            })
+        yield rows
+
+def pokemon_weights(seed: int, pokemon_total: int) -> np.ndarray:
+    """技の割り当て確率（対数正規分布で偏らせる）の累積分布"""
+    weights = np.random.default_rng([seed, 2]).lognormal(0.0, 1.5, pokemon_total)
+    cumulative = np.cumsum(weights)
+    return cumulative / cumulative[-1]
+
+def generate_moves(
+    seed: int, start: int, end: int, pokemon_total: int, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Move[start:end] をチャンク単位で生成（持ち主はPokemon[0:pokemon_total]から選ぶ）"""
+    cumulative = pokemon_weights(seed, pokemon_total)
+    pokemon_ids = make_ids(seed, 0, np.arange(pokemon_total))
+
+    for chunk in range(start // chunk_size, (end - 1) // chunk_size + 1 if end > start else 0):
+        lo, hi = chunk * chunk_size, (chunk + 1) * chunk_size
+        rng = _chunk_rng(seed, 1, chunk)
+        index = np.arange(lo, hi)
+        owners = np.minimum(np.searchsorted(cumulative, rng.random(chunk_size)), pokemon_total - 1)
+        japanese = rng.random(chunk_size) < 0.4
+        verbs = rng.integers(0, len(MOVE_VERBS_EN), chunk_size)
+        objects = rng.integers(0, len(MOVE_OBJECTS_EN), chunk_size)
+        names_ja = rng.integers(0, len(MOVE_NAMES_JA), chunk_size)
+        descriptions = rng.integers(-len(DESCRIPTIONS), len(DESCRIPTIONS), chunk_size)  # 負なら説明なし
+        powers = np.clip(np.rint(rng.beta(2, 3, chunk_size) * 100), 1, 100).astype(int)
+        completed = rng.random(chunk_size) < 0.4
+        created = created_offsets(seed, 1, index)
+        completed_after = rng.exponential(3 * 24 * 3600, chunk_size)
+        ids = make_ids(seed, 1, index)
+
+        rows = []
+        for i in range(max(lo, start) - lo, min(hi, end) - lo):
+            created_at = EPOCH + timedelta(seconds=float(created[i]))
+            completed_at = created_at + timedelta(seconds=float(completed_after[i])) if completed[i] else None
+            name = (
+                MOVE_NAMES_JA[names_ja[i]] if japanese[i]
+                else f"{MOVE_VERBS_EN[verbs[i]]} {MOVE_OBJECTS_EN[objects[i]]}"
+            )
+            rows.append({
+                "id": ids[i],
+                "pokemon_id": pokemon_ids[owners[i]],
+                "name": name,
+                "description": DESCRIPTIONS[descriptions[i]] if descriptions[i] >= 0 else None,
+                "power": int(powers[i]),
+                "is_completed": bool(completed[i]),
+                "completed_at": completed_at,
+                "created_at": created_at,
+                "updated_at": completed_at or created_at,
+            })
+        yield rows
+
+def _copy_rows(engine: Engine, table: str, columns: List[str], rows: List[Dict[str, Any]]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            "" if row[c] is None else ("t" if row[c] else "f") if isinstance(row[c], bool) else row[c]
+            for c in columns
+        ])
+    buffer.seek(0)
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        connection.commit()
+    finally:
+        connection.close()
+
+def load_rows(engine: Engine, model, rows: List[Dict[str, Any]]) -> None:
+    """1チャンク分を投入してコミット（PostgreSQLはCOPY）"""
+    if not rows:
+        return
+    table = model.__table__
+    if engine.dialect.name == "postgresql":
+        _copy_rows(engine, table.name, list(rows[0]), rows)
+    else:
+        with engine.begin() as conn:
+            conn.execute(insert(table), rows)
+
+def count_seeded(engine: Engine, model, seed: int, kind: int) -> int:
+    """
+    このシードで投入済みの行数
+
+    投入済みの行は通し番号の先頭からの連続した範囲なので、通し番号 i の行の有無を
+    主キーで調べ、指数探索と二分探索で境界を求める（O(log n) 回の主キー検索）。
+    """
+    with engine.connect() as conn:
+        def seeded(index: int) -> bool:
+            row_id = make_ids(seed, kind, np.array([index]))[0]
+            return conn.execute(select(model.id).where(model.id == row_id)).first() is not None
+
+        lo, hi = 0, 1
+        while seeded(hi - 1):
+            lo, hi = hi, hi * 2
+        # 通し番号 lo - 1 の行はあり、hi - 1 の行はない
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if seeded(mid):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+def seed_table(engine: Engine, model, label: str, existing: int, target: int, batches: Iterator) -> None:
+    if existing >= target:
+        print(f"{label}: {existing} rows already present (target {target})")
+        return
+    start = time.perf_counter()
+    loaded = 0
+    for rows in batches:
+        load_rows(engine, model, rows)
+        loaded += len(rows)
+        elapsed = time.perf_counter() - start
+        print(f"\r{label}: {existing + loaded}/{target} rows  ({loaded / elapsed:,.0f} rows/s)", end="", flush=True)
+    print()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.seed", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pokemon", type=int, default=100_000, help="Target number of seeded Pokemon")
+    parser.add_argument("--moves", type=int, default=10_000_000, help="Target number of seeded moves")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=50_000,
+                        help="Rows per COPY/commit (part of the generation scheme: keep it fixed for a dataset)")
+    parser.add_argument("--no-analyze", action="store_true", help="Skip ANALYZE after loading")
+    args = parser.parse_args()
+
+    if args.pokemon < 1 and args.moves > 0:
+        parser.error("--moves requires at least one Pokemon")
+
+    engine = default_engine
+    Base.metadata.create_all(bind=engine)
+
+    existing = count_seeded(engine, Pokemon, args.seed, 0)
+    seed_table(engine, Pokemon, "pokemon", existing, args.pokemon,
+               generate_pokemon(args.seed, existing, args.pokemon, args.chunk_size))
+
+    existing = count_seeded(engine, Move, args.seed, 1)
+    seed_table(engine, Move, "moves", existing, args.moves,
+               generate_moves(args.seed, existing, args.moves, args.pokemon, args.chunk_size))
+
+    if engine.dialect.name == "postgresql" and not args.no_analyze:
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE pokemon"))
+            conn.execute(text("ANALYZE moves"))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+APIサーバーの起動エントリーポイント
+
+    python -m app.serve
+
+APP_ENV=production の場合はGunicornのマスタープロセスがCPU数に応じた
+UvicornWorker（uvloop + httptools）を起動する。アプリはフォーク前に読み込み（preload）、
+一定数のリクエストを処理したワーカーは入れ替える。SIGTERMでは処理中のリクエストを
+GRACEFUL_TIMEOUT 秒まで待ってから終了する。
+それ以外の環境ではuvicornのオートリロード付き単一プロセスで起動する。
+"""
+from typing import Any, Dict
+import os
+import tempfile
+import uvicorn
+from app.config import settings
+
+APP_URI = "app.main:app"
+
+try:
+    from uvicorn.workers import UvicornWorker
+
+    class ProductionUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+except ImportError:  # gunicornが使えない環境（Windowsの開発環境など）
+    UvicornWorker = None
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY が未指定ならCPU数から決める"""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return os.cpu_count() or 1
+
+def gunicorn_options() -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": worker_count(),
+        "worker_class": "app.serve.ProductionUvicornWorker",
+        # インポート時に副作用がないので、フォーク前に読み込んでも接続は共有されない
+        "preload_app": True,
+        "max_requests": settings.MAX_REQUESTS,
+        "max_requests_jitter": settings.MAX_REQUESTS_JITTER,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+        "timeout": settings.WORKER_TIMEOUT,
+        "keepalive": settings.KEEPALIVE,
+        "accesslog": "-" if settings.ACCESS_LOG else None,
+        "errorlog": "-",
+        "child_exit": child_exit,
+    }
+
+def child_exit(server, worker) -> None:
+    """終了したワーカーのGauge値をマルチプロセス集計から外す"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+def prepare_multiprocess_metrics() -> None:
+    """ワーカー間でPrometheusメトリクスを集計するためのディレクトリを用意"""
+    # メトリクス定義（アプリのインポート）より前に設定しておく必要がある
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+def run_production() -> None:
+    from gunicorn.app.base import BaseApplication
+    from gunicorn.util import import_app
+
+    class Application(BaseApplication):
+        def __init__(self, app_uri: str, options: Dict[str, Any]):
+            self.app_uri = app_uri
+            self.options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return import_app(self.app_uri)
+
+    prepare_multiprocess_metrics()
+    Application(APP_URI, gunicorn_options()).run()
+
+def run_development() -> None:
+    uvicorn.run(APP_URI, host=settings.HOST, port=settings.PORT, reload=True)
+
+def main() -> None:
+    if settings.APP_ENV == "production":
+        run_production()
+    else:
+        run_development()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+import httpx
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AIServerSnapshot:
+    """LM Studioの最新の状態（バックグラウンドプローブが更新）"""
+    status: str = "unknown"  # unknown / healthy / unhealthy / unreachable
+    available_models: List[str] = field(default_factory=list)
+    latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+class AIServerProbe:
+    """
+    LM Studioの死活監視とモデル検出を定期的に行うバックグラウンドタスク
+
+    リクエスト処理側はネットワークに触れずにキャッシュされたスナップショットを参照し、
+    使用するモデルの選択やダウンしているサーバーの回避に使う。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        preferred_model: str,
+        interval: float = 15.0,
+        timeout: float = 5.0,
+    ):
+        self.base_url = base_url
+        self.preferred_model = preferred_model
+        self.interval = interval
+        self.timeout = timeout
+        self.snapshot = AIServerSnapshot()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_available(self) -> bool:
+        """AI呼び出しを試みる価値があるか（未確認の間は試す）"""
+        return self.snapshot.status in ("unknown", "healthy")
+
+    def select_model(self) -> str:
+        """ロード済みモデルから使用するモデルを選ぶ"""
+        models = self.snapshot.available_models
+        if not models or self.preferred_model in models:
+            return self.preferred_model
+        # 同じモデルファミリー（例: gemma）を優先し、なければ先頭のモデル
+        family = self.preferred_model.split("/")[-1].split("-")[0].lower()
+        for model in models:
+            if family and family in model.lower():
+                return model
+        return models[0]
+
+    def to_health(self) -> Dict[str, Any]:
+        """/ai/health のレスポンス形式に変換"""
+        snapshot = self.snapshot
+        return {
+            "status": snapshot.status,
+            "available_models": snapshot.available_models,
+            "preferred_model_available": self.preferred_model in snapshot.available_models,
+            "selected_model": self.select_model(),
+            "latency_ms": snapshot.latency_ms,
+            "checked_at": snapshot.checked_at,
+            "error": snapshot.error,
+        }
+
+    async def refresh(self) -> AIServerSnapshot:
+        """/v1/models を1回問い合わせてスナップショットを更新"""
+        start = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(f"{self.base_url}/v1/models")
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            if response.status_code == 200:
+                snapshot = AIServerSnapshot(
+                    status="healthy",
+                    available_models=[model["id"] for model in response.json().get("data", [])],
+                    latency_ms=latency_ms,
+                )
+            else:
+                snapshot = AIServerSnapshot(
+                    status="unhealthy",
+                    latency_ms=latency_ms,
+                    error=f"Status {response.status_code}",
+                )
+        except Exception as e:
+            snapshot = AIServerSnapshot(status="unreachable", error=str(e))
+
+        snapshot.checked_at = datetime.utcnow()
+        if snapshot.status != self.snapshot.status:
+            logger.info("LM Studio status changed: %s -> %s", self.snapshot.status, snapshot.status)
+        self.snapshot = snapshot
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    def start(self) -> None:
+        """定期プローブを開始（初回の状態は事前に refresh() で取得しておく）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,229 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from datetime import datetime, timedelta
+import asyncio
+import json
+import logging
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.database import SessionLocal
+from app.models.ai_scoring_job import AIScoringJob
+from app.models.move import Move
+from app.services.ai_service import ai_service
+
+logger = logging.getLogger(__name__)
+
+# Moveの変更を通知するPostgresのチャンネル（LISTEN move_changes で購読）
+MOVE_CHANGES_CHANNEL = "move_changes"
+
+class AIScoringJobService:
+    @staticmethod
+    def enqueue(db: Session, move: Move, provisional_power: int, difficulty_level: str = "medium") -> AIScoringJob:
+        """AI威力計算ジョブを登録（コミットは呼び出し側のトランザクションで行う）"""
+        job = AIScoringJob(
+            move=move,
+            provisional_power=provisional_power,
+            difficulty_level=difficulty_level,
+            max_attempts=settings.AI_SCORING_MAX_ATTEMPTS,
+        )
+        db.add(job)
+        return job
+
+    @staticmethod
+    def claim_job(db: Session) -> Optional[Dict[str, Any]]:
+        """
+        実行可能なジョブを1件取り出して実行中にする
+
+        待機中で実行時刻を過ぎたジョブと、可視性タイムアウトが切れた実行中ジョブが対象。
+        他のワーカーがロック中の行は SKIP LOCKED で読み飛ばす。
+        可視性タイムアウト切れのまま試行回数を使い切ったジョブは失敗にして次の行を見る。
+        """
+        while True:
+            now = datetime.utcnow()
+            job = db.query(AIScoringJob).filter(
+                or_(
+                    and_(AIScoringJob.status == "pending", AIScoringJob.available_at <= now),
+                    and_(AIScoringJob.status == "running", AIScoringJob.locked_until < now),
+                )
+            ).order_by(AIScoringJob.available_at).with_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            if job.attempts < job.max_attempts:
+                break
+            job.status = "failed"
+            job.finished_at = now
+            job.last_error = job.last_error or "Visibility timeout expired"
+            db.commit()
+
+        move = db.get(Move, job.move_id)
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = job.started_at or now
+        job.locked_until = now + timedelta(seconds=settings.AI_SCORING_VISIBILITY_TIMEOUT)
+        claimed = {
+            "job_id": job.id,
+            "move_id": job.move_id,
+            "attempt": job.attempts,
+            "move_name": move.name,
+            "move_description": move.description,
+            "difficulty_level": job.difficulty_level,
+        }
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def complete_job(db: Session, job_id: UUID, power: int) -> None:
+        """AIの結果をMoveに書き戻してジョブを完了し、変更イベントを発行"""
+        job = db.get(AIScoringJob, job_id)
+        if job is None or job.status != "running":
+            db.rollback()
+            return
+
+        move = db.get(Move, job.move_id)
+        # ジョブ登録後にユーザーが威力を変更していたら上書きしない
+        if move is not None and move.power == job.provisional_power:
+            move.power = power
+            db.flush()
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {
+                        "channel": MOVE_CHANGES_CHANNEL,
+                        "payload": json.dumps({
+                            "event": "move.power_scored",
+                            "move_id": str(move.id),
+                            "pokemon_id": str(move.pokemon_id),
+                            "power": power,
+                        }),
+                    },
+                )
+
+        job.status = "done"
+        job.scored_power = power
+        job.locked_until = None
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+    @staticmethod
+    def fail_job(db: Session, job_id: UUID, error: str) -> None:
+        """失敗を記録し、試行回数が残っていれば指数バックオフで再実行待ちにする"""
+        job = db.get(AIScoringJob, job_id)
+        if job is None or job.status != "running":
+            db.rollback()
+            return
+
+        now = datetime.utcnow()
+        job.last_error = error
+        job.locked_until = None
+        if job.attempts >= job.max_attempts:
+            job.status = "failed"
+            job.finished_at = now
+        else:
+            job.status = "pending"
+            job.available_at = now + timedelta(
+                seconds=settings.AI_SCORING_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            )
+        db.commit()
+
+    @staticmethod
+    def get_metrics(db: Session, sample_size: int = 1000) -> Dict[str, Any]:
+        """キューの深さとジョブのレイテンシを集計"""
+        counts = dict(
+            db.query(AIScoringJob.status, func.count()).group_by(AIScoringJob.status).all()
+        )
+        oldest_pending = db.query(func.min(AIScoringJob.created_at)).filter(
+            AIScoringJob.status == "pending"
+        ).scalar()
+
+        finished = db.query(
+            AIScoringJob.created_at, AIScoringJob.started_at, AIScoringJob.finished_at
+        ).filter(
+            AIScoringJob.status == "done"
+        ).order_by(AIScoringJob.finished_at.desc()).limit(sample_size).all()
+
+        now = datetime.utcnow()
+        return {
+            "depth": {status: counts.get(status, 0) for status in ("pending", "running", "done", "failed")},
+            "oldest_pending_age_seconds": (now - oldest_pending).total_seconds() if oldest_pending else None,
+            "queue_wait_seconds": _summarize([(s - c).total_seconds() for c, s, _ in finished]),
+            "total_latency_seconds": _summarize([(f - c).total_seconds() for c, _, f in finished]),
+        }
+
+def _summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "avg": None, "p50": None, "p95": None, "max": None}
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "avg": sum(values) / len(values),
+        "p50": values[int(0.50 * (len(values) - 1))],
+        "p95": values[int(0.95 * (len(values) - 1))],
+        "max": values[-1],
+    }
+
+class AIScoringWorkerPool:
+    """AI威力計算ジョブを処理するワーカーコルーチン群"""
+
+    def __init__(self, concurrency: int, poll_interval: float = 1.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._run(i)) for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: int) -> None:
+        while True:
+            try:
+                processed = await self.process_one()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("AI scoring worker %d crashed while processing a job", worker_id)
+                processed = False
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def process_one(self) -> bool:
+        """ジョブを1件処理する（キューが空ならFalse）"""
+        claimed = await run_in_threadpool(_with_session, AIScoringJobService.claim_job)
+        if claimed is None:
+            return False
+
+        result = await ai_service.score_move_power(
+            claimed["move_name"], claimed["move_description"], claimed["difficulty_level"]
+        )
+        if result is None:
+            await run_in_threadpool(
+                _with_session, AIScoringJobService.fail_job, claimed["job_id"], "AI service unavailable"
+            )
+        else:
+            await run_in_threadpool(
+                _with_session, AIScoringJobService.complete_job, claimed["job_id"], result["power"]
+            )
+        return True
+
+def _with_session(func, *args):
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+# シングルトンインスタンス
+ai_scoring_workers = AIScoringWorkerPool(
+    concurrency=settings.AI_SCORING_WORKERS,
+    poll_interval=settings.AI_SCORING_POLL_INTERVAL,
+)
@@ -1,24 +1,81 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, AsyncIterator, TYPE_CHECKING
+import asyncio
 import httpx
 import json
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
-from app.config import get_settings
+import re
+import time
+from pathlib import Path
+from app.config import settings
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import CircuitBreaker
+from app.services.ai_probe import AIServerProbe
+
+if TYPE_CHECKING:
+    from app.ml.power_model import PowerModel
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+# 生成途中のJSONから威力値を取り出すパターン（数値の直後に区切りが来た時点で確定）
+_PARTIAL_POWER_PATTERN = re.compile(r'"power"\s*:\s*(\d+)\s*[,}\n]')
 
 class AIService:
     """LM Studio連携サービス"""
     
-    def __init__(self):
-        self.base_url = settings.LM_STUDIO_URL
-        self.timeout = 30.0
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or settings.LM_STUDIO_URL
+        self.timeout = settings.AI_REQUEST_TIMEOUT
+        self.latency_budget = (
+            settings.AI_LATENCY_BUDGET_MS / 1000 if settings.AI_LATENCY_BUDGET_MS > 0 else None
+        )
+        self.circuit_breaker = CircuitBreaker(
+            "lm_studio",
+            failure_threshold=settings.AI_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.AI_CIRCUIT_RECOVERY_TIMEOUT,
+        )
+        self.probe = AIServerProbe(
+            self.base_url,
+            preferred_model=settings.LM_STUDIO_MODEL,
+            interval=settings.AI_PROBE_INTERVAL,
+            timeout=settings.AI_PROBE_TIMEOUT,
+        )
+        self._cache = TTLCache(
+            max_entries=settings.AI_CACHE_MAX_ENTRIES,
+            ttl=settings.AI_CACHE_TTL,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        # 同一タスクへの同時リクエストはLM Studio呼び出しを共有する
+        self._in_flight: Dict[Tuple[str, Optional[str], str], asyncio.Task] = {}
+        self.power_model: Optional["PowerModel"] = None
+        self.local_model_first = settings.AI_LOCAL_MODEL_MODE == "first_tier"
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """LM Studio用のHTTPクライアント（初回使用時に生成し、接続を使い回す）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+        return self._client
+    
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def load_power_model(self, path: Optional[str] = None) -> None:
+        """学習済みのローカル威力モデルを読み込む（ファイルがなければルールベースのまま）"""
+        if settings.AI_LOCAL_MODEL_MODE == "off":
+            return
+        model_path = Path(path or settings.POWER_MODEL_PATH)
+        if not model_path.exists():
+            logger.info("Local power model not found at %s, using rule-based fallback", model_path)
+            return
+        # NumPyの読み込みはモデルを使う場合だけに限定して起動を軽くする
+        from app.ml.power_model import PowerModel
+        
+        self.power_model = PowerModel.load(model_path)
+        logger.info("Loaded local power model from %s", model_path)
         
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     async def calculate_move_power(
         self, 
         move_name: str, 
@@ -28,6 +85,12 @@ class AIService:
         """
         AIを使用してMove（タスク）の威力を計算
         
+        ローカルモデルを第1段として使う設定ならその推定値を即座に返す。
+        キャッシュ済みの結果があればそれを返す。プローブがLM Studioのダウンを
+        検出している間やサーキットブレーカーがOPENの間、
+        またはレイテンシ予算内にAIが応答しなかった場合はフォールバック計算を返す。
+        予算超過時もAI呼び出しはバックグラウンドで継続し、結果はキャッシュに格納される。
+        
         Args:
             move_name: タスク名
             move_description: タスクの詳細説明
@@ -36,44 +99,246 @@ class AIService:
         Returns:
             Dict with power (1-100), difficulty_score, reasoning
         """
+        if self.local_model_first and self.power_model is not None:
+            metrics.count_ai_result("local_model")
+            return self._local_power_calculation(move_name, move_description)
+        
+        key = (move_name, move_description, difficulty_level)
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            metrics.count_ai_result("cache")
+            return cached
+        
+        task = self._get_or_start_request(key)
+        if task is None:
+            metrics.count_ai_result("fallback")
+            return self._fallback_power_calculation(move_name, move_description)
+        
+        start = time.perf_counter()
         try:
-            prompt = self._create_power_calculation_prompt(
-                move_name, move_description, difficulty_level
-            )
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json={
-                        "model": "google/gemma-3n-e4b",
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 200
-                    }
-                )
-                
-                if response.status_code != 200:
-                    raise httpx.HTTPError(f"LM Studio API error: {response.status_code}")
-                
-                result = response.json()
-                ai_response = result["choices"][0]["message"]["content"]
-                
-                return self._parse_ai_response(ai_response, move_name)
-                
+            result = await asyncio.wait_for(asyncio.shield(task), timeout=self.latency_budget)
+        except asyncio.TimeoutError:
+            logger.warning("AI latency budget exceeded, serving fallback")
+            result = self._fallback_power_calculation(move_name, move_description)
+        finally:
+            metrics.add_ai_time(time.perf_counter() - start)
+        
+        metrics.count_ai_result("ai" if result["ai_generated"] else "fallback")
+        return result
+    
+    async def score_move_power(
+        self,
+        move_name: str,
+        move_description: Optional[str] = None,
+        difficulty_level: str = "medium"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        AIの計算結果を待って返す（バックグラウンドジョブ用）
+        
+        レイテンシ予算は適用しない。AIが利用できずフォールバックになる場合はNoneを返す。
+        """
+        key = (move_name, move_description, difficulty_level)
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        task = self._get_or_start_request(key)
+        if task is None:
+            return None
+        
+        result = await asyncio.shield(task)
+        return result if result["ai_generated"] else None
+    
+    def estimate_power(self, move_name: str, move_description: Optional[str] = None) -> int:
+        """AIを呼ばずに即座に威力を見積もる（ローカルモデルまたはルールベース）"""
+        return self._fallback_power_calculation(move_name, move_description)["power"]
+    
+    def _get_or_start_request(
+        self,
+        key: Tuple[str, Optional[str], str]
+    ) -> Optional[asyncio.Task]:
+        """実行中のLM Studio呼び出しを返すか新たに開始する（呼び出せない状態ならNone）"""
+        task = self._in_flight.get(key)
+        if task is not None:
+            return task
+        
+        if not self.probe.is_available or not self.circuit_breaker.allow_request():
+            return None
+        
+        task = asyncio.create_task(self._request_and_cache(key, *key))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return task
+    
+    async def _request_and_cache(
+        self,
+        key: Tuple[str, Optional[str], str],
+        move_name: str,
+        move_description: Optional[str],
+        difficulty_level: str
+    ) -> Dict[str, Any]:
+        """LM Studioを呼び出し、結果をサーキットブレーカーとキャッシュに反映"""
+        start = time.perf_counter()
+        try:
+            result = await self._request_ai_power(move_name, move_description, difficulty_level)
         except httpx.TimeoutException:
             logger.error("AI service timeout")
+            metrics.observe_ai_call(time.perf_counter() - start, "timeout")
+            self.circuit_breaker.record_failure()
             return self._fallback_power_calculation(move_name, move_description)
         except httpx.HTTPError as e:
-            logger.error(f"AI service HTTP error: {e}")
+            logger.error("AI service HTTP error: %s", e)
+            metrics.observe_ai_call(time.perf_counter() - start, "error")
+            self.circuit_breaker.record_failure()
             return self._fallback_power_calculation(move_name, move_description)
         except Exception as e:
-            logger.error(f"AI service unexpected error: {e}")
+            logger.error("AI service unexpected error: %s", e)
+            metrics.observe_ai_call(time.perf_counter() - start, "error")
+            self.circuit_breaker.record_failure()
             return self._fallback_power_calculation(move_name, move_description)
+        
+        metrics.observe_ai_call(
+            time.perf_counter() - start, "success" if result["ai_generated"] else "unparsable"
+        )
+        self.circuit_breaker.record_success()
+        if result["ai_generated"]:
+            self._cache.set(key, result)
+        return result
+    
+    async def _request_ai_power(
+        self,
+        move_name: str,
+        move_description: Optional[str],
+        difficulty_level: str
+    ) -> Dict[str, Any]:
+        """LM Studioに威力計算を問い合わせる（通信エラーは例外として送出）"""
+        prompt = self._create_power_calculation_prompt(
+            move_name, move_description, difficulty_level
+        )
+        
+        response = await self.client.post(
+            "/v1/chat/completions",
+            json=self._create_completion_payload(prompt)
+        )
+        
+        if response.status_code != 200:
+            raise httpx.HTTPError(f"LM Studio API error: {response.status_code}")
+        
+        result = response.json()
+        ai_response = result["choices"][0]["message"]["content"]
+        
+        return self._parse_ai_response(ai_response, move_name)
+    
+    async def stream_move_power(
+        self,
+        move_name: str,
+        move_description: Optional[str] = None,
+        difficulty_level: str = "medium"
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        LM Studioのストリーミング応答を中継しながら威力を計算
+        
+        ("token", {"content": ...}) を生成トークンごとに、("power", {"power": ...}) を
+        部分JSONから威力値を取り出せた時点で1回、最後に ("result", {...}) を
+        calculate_move_power と同じ形式で返す。
+        ローカルモデル優先時、キャッシュヒット時、LM Studioがダウンしている間や
+        サーキットブレーカーがOPENの間は power と result のみを返す。
+        """
+        key = (move_name, move_description, difficulty_level)
+        
+        source = "local_model"
+        if self.local_model_first and self.power_model is not None:
+            result = self._local_power_calculation(move_name, move_description)
+        else:
+            source = "cache"
+            result = self._cache.get(key)
+        if result is None and (
+            not self.probe.is_available or not self.circuit_breaker.allow_request()
+        ):
+            source = "fallback"
+            result = self._fallback_power_calculation(move_name, move_description)
+        if result is not None:
+            metrics.count_ai_result(source)
+            yield "power", {"power": result["power"]}
+            yield "result", result
+            return
+        
+        prompt = self._create_power_calculation_prompt(
+            move_name, move_description, difficulty_level
+        )
+        content = ""
+        power_sent = False
+        outcome_recorded = False
+        
+        try:
+            try:
+                async with self.client.stream(
+                    "POST",
+                    "/v1/chat/completions",
+                    json=self._create_completion_payload(prompt, stream=True)
+                ) as response:
+                    if response.status_code != 200:
+                        raise httpx.HTTPError(f"LM Studio API error: {response.status_code}")
+                    
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        
+                        choice = json.loads(data)["choices"][0]
+                        delta = choice.get("delta", {}).get("content")
+                        if not delta:
+                            continue
+                        
+                        content += delta
+                        yield "token", {"content": delta}
+                        
+                        if not power_sent:
+                            match = _PARTIAL_POWER_PATTERN.search(content)
+                            if match:
+                                power_sent = True
+                                yield "power", {"power": max(1, min(100, int(match.group(1))))}
+            except (httpx.HTTPError, json.JSONDecodeError, KeyError, IndexError) as e:
+                logger.error("AI streaming error: %s", e)
+                self.circuit_breaker.record_failure()
+                outcome_recorded = True
+                result = self._fallback_power_calculation(move_name, move_description)
+            else:
+                self.circuit_breaker.record_success()
+                outcome_recorded = True
+                result = self._parse_ai_response(content, move_name)
+                if result["ai_generated"]:
+                    self._cache.set(key, result)
+        finally:
+            # クライアント切断などで判定できなかった場合も試験呼び出し枠を解放する
+            if not outcome_recorded:
+                self.circuit_breaker.release_probe()
+        
+        metrics.count_ai_result("ai" if result["ai_generated"] else "fallback")
+        if not power_sent:
+            yield "power", {"power": result["power"]}
+        yield "result", result
+    
+    def _create_completion_payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        """chat/completions APIのリクエストボディを生成"""
+        payload: Dict[str, Any] = {
+            "model": self.probe.select_model(),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 200
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
     
     def _create_power_calculation_prompt(
         self, 
@@ -130,7 +395,7 @@ Respond in this exact JSON format:
                 raise ValueError("No JSON found in response")
                 
         except (json.JSONDecodeError, ValueError, KeyError) as e:
-            logger.error(f"Failed to parse AI response: {e}")
+            logger.error("Failed to parse AI response: %s", e)
             return self._fallback_power_calculation(move_name, None)
     
     def _fallback_power_calculation(
@@ -138,9 +403,40 @@ Respond in this exact JSON format:
         move_name: str, 
         move_description: Optional[str]
     ) -> Dict[str, Any]:
-        """AI連携失敗時のフォールバック計算"""
+        """AI連携失敗時のフォールバック計算（ローカルモデルがあればそちらを優先）"""
+        
+        if self.power_model is not None:
+            return self._local_power_calculation(move_name, move_description)
+        
+        power = self.rule_based_power(move_name, move_description)
+        
+        return {
+            "power": power,
+            "difficulty_score": max(1, min(10, power // 10)),
+            "reasoning": "Calculated using fallback rule-based system due to AI service unavailability",
+            "estimated_time": self._estimate_time_from_power(power),
+            "ai_generated": False
+        }
+    
+    def _local_power_calculation(
+        self,
+        move_name: str,
+        move_description: Optional[str]
+    ) -> Dict[str, Any]:
+        """過去のAI結果から学習したローカルモデルによる計算"""
+        power = self.power_model.predict(move_name, move_description)
         
-        # シンプルなルールベース計算
+        return {
+            "power": power,
+            "difficulty_score": max(1, min(10, power // 10)),
+            "reasoning": "Estimated by local power model trained on past AI results",
+            "estimated_time": self._estimate_time_from_power(power),
+            "ai_generated": False
+        }
+    
+    @staticmethod
+    def rule_based_power(move_name: str, move_description: Optional[str]) -> int:
+        """キーワードと名前の長さによるシンプルなルールベース計算"""
         power = 50  # デフォルト
         
         # 名前の長さベース
@@ -170,15 +466,7 @@ Respond in this exact JSON format:
                 power -= 15
                 break
         
-        power = max(1, min(100, power))
-        
-        return {
-            "power": power,
-            "difficulty_score": max(1, min(10, power // 10)),
-            "reasoning": "Calculated using fallback rule-based system due to AI service unavailability",
-            "estimated_time": self._estimate_time_from_power(power),
-            "ai_generated": False
-        }
+        return max(1, min(100, power))
     
     def _estimate_time_from_power(self, power: int) -> str:
         """威力値から推定時間を計算"""
@@ -194,26 +482,8 @@ Respond in this exact JSON format:
             return "Multiple days"
 
     async def health_check(self) -> Dict[str, Any]:
-        """LM Studio接続確認"""
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/v1/models")
-                
-                if response.status_code == 200:
-                    models = response.json()
-                    return {
-                        "status": "healthy",
-                        "available_models": [model["id"] for model in models.get("data", [])],
-                        "preferred_model_available": any(
-                            "gemma" in model["id"].lower() 
-                            for model in models.get("data", [])
-                        )
-                    }
-                else:
-                    return {"status": "unhealthy", "error": f"Status {response.status_code}"}
-                    
-        except Exception as e:
-            return {"status": "unreachable", "error": str(e)}
+        """LM Studio接続確認（バックグラウンドプローブのキャッシュを返す）"""
+        return self.probe.to_health()
 
 
 # シングルトンインスタンス
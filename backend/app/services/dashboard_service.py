@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+from uuid import UUID
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, aliased
+from app.models.move import Move
+from app.models.pokemon import Pokemon
+
+class DashboardService:
+    @staticmethod
+    def get_dashboard(
+        db: Session, skip: int = 0, limit: int = 100, top_k: int = 3, recent: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Build the home page view with three statements, independent of the number of Pokemon:
+        Pokemon with pending-move counts, top-K pending moves per Pokemon (window function),
+        and the most recent completions.
+        """
+        pending_count = func.count(Move.id).label("pending_move_count")
+        rows = db.execute(
+            select(Pokemon, pending_count)
+            .outerjoin(Move, and_(Move.pokemon_id == Pokemon.id, Move.is_completed == False))
+            .group_by(Pokemon.id)
+            .order_by(Pokemon.created_at, Pokemon.id)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        
+        top_moves: Dict[UUID, List[Move]] = {pokemon.id: [] for pokemon, _ in rows}
+        if rows and top_k > 0:
+            ranked = select(
+                Move,
+                func.row_number().over(
+                    partition_by=Move.pokemon_id,
+                    order_by=(Move.power.desc(), Move.created_at, Move.id),
+                ).label("rank"),
+            ).where(
+                Move.is_completed == False,
+                Move.pokemon_id.in_(list(top_moves)),
+            ).subquery()
+            ranked_move = aliased(Move, ranked)
+            for move in db.scalars(
+                select(ranked_move).where(ranked.c.rank <= top_k).order_by(ranked.c.pokemon_id, ranked.c.rank)
+            ):
+                top_moves[move.pokemon_id].append(move)
+        
+        recent_completions = db.scalars(
+            select(Move)
+            .where(Move.is_completed == True)
+            .order_by(Move.completed_at.desc(), Move.id)
+            .limit(recent)
+        ).all() if recent > 0 else []
+        
+        return {
+            "pokemon": [
+                {"pokemon": pokemon, "pending_move_count": count, "top_pending_moves": top_moves[pokemon.id]}
+                for pokemon, count in rows
+            ],
+            "recent_completions": recent_completions,
+        }
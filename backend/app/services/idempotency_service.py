@@ -0,0 +1,96 @@
+from typing import Optional
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.idempotency_key import IdempotencyKey
+
+class IdempotencyService:
+    @staticmethod
+    def claim(
+        db: Session, key: str, request_hash: str, claimed_at: datetime, ttl: float, lock_timeout: float
+    ) -> Optional[IdempotencyKey]:
+        """
+        キーを処理中として登録する
+
+        登録できた場合は None、既に登録済みならその行を返す。期限切れの行と、
+        lock_timeout を過ぎても処理中のままの行（元のリクエストが異常終了した）は置き換える。
+        claimed_at は行の created_at になり、complete / release で所有者の確認に使う。
+        """
+        now = claimed_at
+        for _ in range(2):
+            db.add(IdempotencyKey(
+                key=key,
+                request_hash=request_hash,
+                status="in_progress",
+                created_at=now,
+                expires_at=now + timedelta(seconds=ttl),
+            ))
+            try:
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+
+            existing = db.get(IdempotencyKey, key)
+            if existing is None:
+                continue  # 直前に削除された
+            abandoned = existing.status == "in_progress" and existing.created_at < now - timedelta(seconds=lock_timeout)
+            if existing.expires_at > now and not abandoned:
+                return existing
+            db.delete(existing)
+            db.commit()
+        return db.get(IdempotencyKey, key)
+
+    @staticmethod
+    def get(db: Session, key: str) -> Optional[IdempotencyKey]:
+        return db.get(IdempotencyKey, key)
+
+    @staticmethod
+    def _owned(key: str, request_hash: str, claimed_at: datetime):
+        # lock_timeout を過ぎて別のリクエストに置き換えられた行は、元のリクエストからは変更しない
+        return and_(
+            IdempotencyKey.key == key,
+            IdempotencyKey.request_hash == request_hash,
+            IdempotencyKey.status == "in_progress",
+            IdempotencyKey.created_at == claimed_at,
+        )
+
+    @staticmethod
+    def complete(
+        db: Session,
+        key: str,
+        request_hash: str,
+        claimed_at: datetime,
+        status_code: int,
+        content_type: Optional[str],
+        body: bytes,
+    ) -> bool:
+        """最初のレスポンスを保存する（キーを登録したリクエストのままでなければ何もせず False）"""
+        result = db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyService._owned(key, request_hash, claimed_at))
+            .values(
+                status="completed",
+                response_status=status_code,
+                response_content_type=content_type,
+                response_body=body,
+            )
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def release(db: Session, key: str, request_hash: str, claimed_at: datetime) -> bool:
+        """処理に失敗したキーを削除し、再試行で再実行できるようにする（complete と同じく所有者を確認）"""
+        result = db.execute(
+            delete(IdempotencyKey).where(IdempotencyService._owned(key, request_hash, claimed_at))
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow()))
+        db.commit()
+        return result.rowcount
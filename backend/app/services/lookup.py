@@ -0,0 +1,20 @@
+from typing import Callable, Type, TypeVar
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+ModelT = TypeVar("ModelT")
+
+def get_or_404(db: Session, model: Type[ModelT], obj_id: UUID, not_found: Callable[[str], HTTPException]) -> ModelT:
+    """
+    Fetch a row by primary key or raise the given not-found exception
+
+    Uses Session.get, which returns objects already in the session's identity
+    map without a query and otherwise runs the mapper's cached primary-key
+    SELECT, skipping the Query construction and compile-cache lookup of
+    db.query(Model).filter(Model.id == obj_id).first().
+    """
+    obj = db.get(model, obj_id)
+    if obj is None:
+        raise not_found(str(obj_id))
+    return obj
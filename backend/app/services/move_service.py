@@ -1,42 +1,48 @@
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from datetime import datetime
 from app.models.move import Move
 from app.models.pokemon import Pokemon
+from app.core.database import utcnow
 from app.schemas.move import MoveCreate, MoveUpdate
 from app.core.exceptions import MoveNotFoundException, PokemonNotFoundException
+from app.config import settings
+from app.services.ai_scoring_service import AIScoringJobService
+from app.services.ai_service import ai_service
+from app.services.sync_service import SyncService
+from app.services.lookup import get_or_404
 
 class MoveService:
     @staticmethod
     def create_move(db: Session, move_data: MoveCreate) -> Move:
-        """Create a new Move for a Pokemon"""
+        """
+        Create a new Move for a Pokemon
+        
+        When no power is given, the move is stored with a provisional power from
+        the local estimator and an AI scoring job is queued to refine it.
+        """
         # Check if Pokemon exists
-        pokemon = db.query(Pokemon).filter(Pokemon.id == move_data.pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(move_data.pokemon_id))
+        get_or_404(db, Pokemon, move_data.pokemon_id, PokemonNotFoundException)
         
-        move = Move(**move_data.model_dump())
+        move = Move(**move_data.model_dump(exclude={"difficulty_level"}))
+        if settings.AI_SCORING_ENABLED and "power" not in move_data.model_fields_set:
+            move.power = ai_service.estimate_power(move.name, move.description)
+            AIScoringJobService.enqueue(db, move, move.power, move_data.difficulty_level)
         db.add(move)
         db.commit()
-        db.refresh(move)
         return move
     
     @staticmethod
     def get_move(db: Session, move_id: UUID) -> Optional[Move]:
         """Get a Move by ID"""
-        move = db.query(Move).filter(Move.id == move_id).first()
-        if not move:
-            raise MoveNotFoundException(str(move_id))
-        return move
+        return get_or_404(db, Move, move_id, MoveNotFoundException)
     
     @staticmethod
     def get_moves_by_pokemon(db: Session, pokemon_id: UUID, skip: int = 0, limit: int = 100) -> List[Move]:
         """Get all moves for a specific Pokemon"""
         # Check if Pokemon exists
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(pokemon_id))
+        get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
         
         return db.query(Move).filter(
             Move.pokemon_id == pokemon_id
@@ -44,52 +50,51 @@ class MoveService:
     
     @staticmethod
     def update_move(db: Session, move_id: UUID, move_update: MoveUpdate) -> Move:
-        """Update a Move"""
-        move = db.query(Move).filter(Move.id == move_id).first()
+        """Update a Move with a single UPDATE ... RETURNING"""
+        update_data = move_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return MoveService.get_move(db, move_id)
+        
+        move = db.scalars(
+            update(Move).where(Move.id == move_id).values(**update_data).returning(Move)
+        ).one_or_none()
         if not move:
             raise MoveNotFoundException(str(move_id))
         
-        update_data = move_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(move, field, value)
-        
         db.commit()
-        db.refresh(move)
         return move
     
     @staticmethod
     def delete_move(db: Session, move_id: UUID) -> bool:
         """Delete a Move"""
-        move = db.query(Move).filter(Move.id == move_id).first()
-        if not move:
-            raise MoveNotFoundException(str(move_id))
+        move = get_or_404(db, Move, move_id, MoveNotFoundException)
         
         db.delete(move)
+        SyncService.record_deletion(db, "move", move.id)
         db.commit()
         return True
     
     @staticmethod
     def complete_move(db: Session, move_id: UUID) -> Move:
         """Mark a move as completed and return updated move"""
-        move = db.query(Move).filter(Move.id == move_id).first()
+        move = db.scalars(
+            update(Move)
+            .where(Move.id == move_id, Move.is_completed == False)
+            .values(is_completed=True, completed_at=utcnow())
+            .returning(Move)
+        ).one_or_none()
         if not move:
-            raise MoveNotFoundException(str(move_id))
-        
-        if not move.is_completed:
-            move.is_completed = True
-            move.completed_at = datetime.utcnow()
-            db.commit()
-            db.refresh(move)
+            # Already completed (returned unchanged) or missing
+            return MoveService.get_move(db, move_id)
         
+        db.commit()
         return move
     
     @staticmethod
     def get_completed_moves(db: Session, pokemon_id: UUID) -> List[Move]:
         """Get all completed moves for a Pokemon"""
         # Check if Pokemon exists
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(pokemon_id))
+        get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
         
         return db.query(Move).filter(
             Move.pokemon_id == pokemon_id,
@@ -100,9 +105,7 @@ class MoveService:
     def get_pending_moves(db: Session, pokemon_id: UUID) -> List[Move]:
         """Get all pending (incomplete) moves for a Pokemon"""
         # Check if Pokemon exists
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(pokemon_id))
+        get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
         
         return db.query(Move).filter(
             Move.pokemon_id == pokemon_id,
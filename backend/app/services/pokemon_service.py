@@ -1,9 +1,12 @@
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models.pokemon import Pokemon
 from app.schemas.pokemon import PokemonCreate, PokemonUpdate
 from app.core.exceptions import PokemonNotFoundException
+from app.services.sync_service import SyncService
+from app.services.lookup import get_or_404
 
 class PokemonService:
     @staticmethod
@@ -12,16 +15,12 @@ class PokemonService:
         pokemon = Pokemon(**pokemon_data.model_dump())
         db.add(pokemon)
         db.commit()
-        db.refresh(pokemon)
         return pokemon
     
     @staticmethod
     def get_pokemon(db: Session, pokemon_id: UUID) -> Optional[Pokemon]:
         """Get a Pokemon by ID"""
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(pokemon_id))
-        return pokemon
+        return get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
     
     @staticmethod
     def get_all_pokemon(db: Session, skip: int = 0, limit: int = 100) -> List[Pokemon]:
@@ -30,36 +29,34 @@ class PokemonService:
     
     @staticmethod
     def update_pokemon(db: Session, pokemon_id: UUID, pokemon_update: PokemonUpdate) -> Pokemon:
-        """Update a Pokemon"""
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
+        """Update a Pokemon with a single UPDATE ... RETURNING"""
+        update_data = pokemon_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return PokemonService.get_pokemon(db, pokemon_id)
+        
+        pokemon = db.scalars(
+            update(Pokemon).where(Pokemon.id == pokemon_id).values(**update_data).returning(Pokemon)
+        ).one_or_none()
         if not pokemon:
             raise PokemonNotFoundException(str(pokemon_id))
         
-        update_data = pokemon_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(pokemon, field, value)
-        
         db.commit()
-        db.refresh(pokemon)
         return pokemon
     
     @staticmethod
     def delete_pokemon(db: Session, pokemon_id: UUID) -> bool:
         """Delete a Pokemon"""
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(pokemon_id))
+        pokemon = get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
         
         db.delete(pokemon)
+        SyncService.record_deletion(db, "pokemon", pokemon.id)
         db.commit()
         return True
     
     @staticmethod
     def add_experience(db: Session, pokemon_id: UUID, experience: float) -> Pokemon:
         """Add experience to a Pokemon and handle level up"""
-        pokemon = db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
-        if not pokemon:
-            raise PokemonNotFoundException(str(pokemon_id))
+        pokemon = get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
         
         pokemon.experience += experience
         
@@ -75,5 +72,4 @@ class PokemonService:
                 pokemon.evolution_stage = 3
         
         db.commit()
-        db.refresh(pokemon)
         return pokemon
\ No newline at end of file
@@ -0,0 +1,276 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.exceptions import PokemonNotFoundException
+from app.models.battle import Battle
+from app.models.move import Move
+from app.models.pokemon import Pokemon
+from app.services.lookup import get_or_404
+
+# Same rules as PokemonService.add_experience and the frontend's experience gain
+EXPERIENCE_PER_LEVEL = 100
+EVOLUTION_LEVELS = (16, 36)
+MIN_EXPERIENCE_GAIN = 5
+
+ORDERINGS = ("listed", "strongest_first", "weakest_first")
+
+@dataclass
+class Projection:
+    """
+    Projected outcome of completing pending moves
+
+    Per-Pokemon arrays have one entry per Pokemon; -1 in the moves_to_* arrays
+    means the pending moves are not enough. Per-move arrays follow `order`
+    (indices into the input moves, grouped by Pokemon in projected order).
+    """
+    counts: np.ndarray
+    final_level: np.ndarray
+    final_experience: np.ndarray
+    final_stage: np.ndarray
+    total_experience: np.ndarray
+    total_damage: np.ndarray
+    moves_to_level_up: np.ndarray
+    moves_to_evolve: np.ndarray
+    moves_to_defeat: np.ndarray
+    enemy_remaining_hp: np.ndarray
+    order: np.ndarray
+    experience_gain: np.ndarray
+    level_after: np.ndarray
+    stage_after: np.ndarray
+    damage_after: np.ndarray
+
+def experience_gain(power: np.ndarray) -> np.ndarray:
+    """Experience for completing a move: max(5, floor(power / 10))"""
+    return np.maximum(MIN_EXPERIENCE_GAIN, np.asarray(power, dtype=np.int64) // 10)
+
+def evolution_stage(start_level: np.ndarray, start_stage: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """Stage after levelling up from start_level to level (evolves when passing 16 and 36)"""
+    first, second = EVOLUTION_LEVELS
+    stage = start_stage + ((start_stage == 1) & (start_level < first) & (level >= first))
+    return stage + ((stage == 2) & (start_level < second) & (level >= second))
+
+def _segment_cumsum(values: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Running total restarting at each Pokemon's first move"""
+    total = np.cumsum(values)
+    offsets = np.concatenate(([0], total))[starts]
+    return total - np.repeat(offsets, counts)
+
+def _moves_until(reached: np.ndarray, owner: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # Levels, stages and damage only grow, so `reached` is False...True within each
+    # Pokemon and the number of moves needed is the number of False entries + 1
+    not_reached = np.bincount(owner[~reached], minlength=len(counts))
+    return np.where(not_reached < counts, not_reached + 1, -1)
+
+def _sort_key(ordering: str, powers: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    if ordering == "strongest_first":
+        return -powers
+    if ordering == "weakest_first":
+        return powers
+    if ordering == "listed":
+        return positions
+    raise ValueError(f"Unknown ordering: {ordering}")
+
+def project(
+    levels: Sequence[int],
+    experience: Sequence[float],
+    stages: Sequence[int],
+    enemy_hp: Sequence[float],
+    owner: Sequence[int],
+    powers: Sequence[int],
+    orderings: Sequence[str],
+) -> Projection:
+    """
+    Project every Pokemon in one vectorized pass
+
+    owner[i] is the index of the Pokemon that pending move i (with powers[i])
+    belongs to, with moves in listed order. orderings[j] is the what-if order
+    used for Pokemon j. enemy_hp is NaN for Pokemon without an active battle.
+    """
+    levels = np.asarray(levels, dtype=np.int64)
+    experience = np.asarray(experience, dtype=np.float64)
+    stages = np.asarray(stages, dtype=np.int64)
+    enemy_hp = np.asarray(enemy_hp, dtype=np.float64)
+    owner = np.asarray(owner, dtype=np.int64)
+    powers = np.asarray(powers, dtype=np.int64)
+
+    positions = np.arange(len(powers))
+    keys = np.zeros(len(powers), dtype=np.int64)
+    for ordering in set(orderings):
+        rows = np.asarray(orderings) == ordering
+        selected = rows[owner]
+        keys[selected] = _sort_key(ordering, powers[selected], positions[selected])
+    # Group by Pokemon, then by the ordering key (ties keep the listed order)
+    order = np.lexsort((positions, keys, owner))
+    owner = owner[order]
+    powers = powers[order]
+
+    counts = np.bincount(owner, minlength=len(levels))
+    starts = np.cumsum(counts) - counts
+    gains = experience_gain(powers)
+
+    exp_after = experience[owner] + _segment_cumsum(gains, starts, counts)
+    level_after = levels[owner] + (exp_after // EXPERIENCE_PER_LEVEL).astype(np.int64)
+    stage_after = evolution_stage(levels[owner], stages[owner], level_after)
+    damage_after = _segment_cumsum(powers, starts, counts)
+
+    total_experience = np.bincount(owner, weights=gains, minlength=len(levels)).astype(np.int64)
+    total_damage = np.bincount(owner, weights=powers, minlength=len(levels)).astype(np.int64)
+    final_total = experience + total_experience
+    final_level = levels + (final_total // EXPERIENCE_PER_LEVEL).astype(np.int64)
+
+    return Projection(
+        counts=counts,
+        final_level=final_level,
+        final_experience=final_total % EXPERIENCE_PER_LEVEL,
+        final_stage=evolution_stage(levels, stages, final_level),
+        total_experience=total_experience,
+        total_damage=total_damage,
+        moves_to_level_up=_moves_until(level_after > levels[owner], owner, counts),
+        moves_to_evolve=_moves_until(stage_after > stages[owner], owner, counts),
+        # NaN (no enemy) never compares as reached
+        moves_to_defeat=_moves_until(damage_after >= enemy_hp[owner], owner, counts),
+        enemy_remaining_hp=np.maximum(enemy_hp - total_damage, 0),
+        order=order,
+        experience_gain=gains,
+        level_after=level_after,
+        stage_after=stage_after,
+        damage_after=damage_after,
+    )
+
+def _optional(value: Any) -> Optional[int]:
+    return None if value < 0 else int(value)
+
+def _outcome(result: Projection, i: int) -> Dict[str, Any]:
+    remaining = result.enemy_remaining_hp[i]
+    return {
+        "final_level": int(result.final_level[i]),
+        "final_experience": float(result.final_experience[i]),
+        "final_evolution_stage": int(result.final_stage[i]),
+        "total_experience": int(result.total_experience[i]),
+        "total_damage": int(result.total_damage[i]),
+        "moves_to_level_up": _optional(result.moves_to_level_up[i]),
+        "moves_to_evolve": _optional(result.moves_to_evolve[i]),
+        "moves_to_defeat_enemy": _optional(result.moves_to_defeat[i]),
+        "enemy_remaining_hp": None if np.isnan(remaining) else int(remaining),
+    }
+
+class ProjectionService:
+    @staticmethod
+    def _pending_moves(db: Session, pokemon_ids: List[UUID]) -> List[Any]:
+        """Pending moves of the given Pokemon in listed (creation) order"""
+        # power is nullable (MoveUpdate accepts null); cleared powers count as the column default
+        power = func.coalesce(Move.power, Move.__table__.c.power.default.arg).label("power")
+        return db.execute(
+            select(Move.id, Move.pokemon_id, power)
+            .where(Move.is_completed == False, Move.pokemon_id.in_(pokemon_ids))
+            .order_by(Move.created_at, Move.id)
+        ).all()
+
+    @staticmethod
+    def _active_battles(db: Session, pokemon_ids: List[UUID]) -> Dict[UUID, Any]:
+        """Latest unfinished battle per Pokemon"""
+        battles: Dict[UUID, Any] = {}
+        for battle in db.execute(
+            select(Battle.pokemon_id, Battle.enemy_name, Battle.enemy_current_hp)
+            .where(Battle.completed_at.is_(None), Battle.is_victory == False, Battle.pokemon_id.in_(pokemon_ids))
+            .order_by(Battle.created_at)
+        ):
+            battles[battle.pokemon_id] = battle
+        return battles
+
+    @staticmethod
+    def project_pokemon(db: Session, pokemon_id: UUID, orderings: Sequence[str] = ORDERINGS) -> Dict[str, Any]:
+        """
+        Project one Pokemon's pending moves under each what-if ordering
+
+        Every ordering is projected in the same pass by treating it as a copy of the Pokemon.
+        """
+        pokemon = get_or_404(db, Pokemon, pokemon_id, PokemonNotFoundException)
+        moves = ProjectionService._pending_moves(db, [pokemon_id])
+        battle = ProjectionService._active_battles(db, [pokemon_id]).get(pokemon_id)
+
+        n, k = len(moves), len(orderings)
+        powers = np.fromiter((move.power for move in moves), dtype=np.int64, count=n)
+        enemy_hp = np.nan if battle is None else battle.enemy_current_hp
+        result = project(
+            levels=np.full(k, pokemon.level),
+            experience=np.full(k, pokemon.experience),
+            stages=np.full(k, pokemon.evolution_stage),
+            enemy_hp=np.full(k, enemy_hp, dtype=np.float64),
+            owner=np.repeat(np.arange(k), n),
+            powers=np.tile(powers, k),
+            orderings=orderings,
+        )
+
+        scenarios = []
+        for i, ordering in enumerate(orderings):
+            steps = slice(i * n, (i + 1) * n)
+            scenarios.append({
+                "ordering": ordering,
+                **_outcome(result, i),
+                "steps": [
+                    {
+                        "move_id": moves[index % n].id,
+                        "power": moves[index % n].power,
+                        "experience_gain": int(gain),
+                        "level": int(level),
+                        "evolution_stage": int(stage),
+                        "total_damage": int(damage),
+                    }
+                    for index, gain, level, stage, damage in zip(
+                        result.order[steps],
+                        result.experience_gain[steps],
+                        result.level_after[steps],
+                        result.stage_after[steps],
+                        result.damage_after[steps],
+                    )
+                ],
+            })
+        return {
+            "pokemon_id": pokemon.id,
+            "pending_move_count": n,
+            "enemy_name": battle.enemy_name if battle else None,
+            "enemy_hp": battle.enemy_current_hp if battle else None,
+            "scenarios": scenarios,
+        }
+
+    @staticmethod
+    def project_many(
+        db: Session, skip: int = 0, limit: int = 100, ordering: str = "listed"
+    ) -> List[Dict[str, Any]]:
+        """Project a page of Pokemon (dashboard order) with three statements and one NumPy pass"""
+        pokemon = db.execute(
+            select(Pokemon.id, Pokemon.level, Pokemon.experience, Pokemon.evolution_stage)
+            .order_by(Pokemon.created_at, Pokemon.id)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        if not pokemon:
+            return []
+        ids = [row.id for row in pokemon]
+        index = {pokemon_id: i for i, pokemon_id in enumerate(ids)}
+        moves = ProjectionService._pending_moves(db, ids)
+        battles = ProjectionService._active_battles(db, ids)
+
+        result = project(
+            levels=[row.level for row in pokemon],
+            experience=[row.experience for row in pokemon],
+            stages=[row.evolution_stage for row in pokemon],
+            enemy_hp=[battles[i].enemy_current_hp if i in battles else np.nan for i in ids],
+            owner=np.fromiter((index[move.pokemon_id] for move in moves), dtype=np.int64, count=len(moves)),
+            powers=np.fromiter((move.power for move in moves), dtype=np.int64, count=len(moves)),
+            orderings=[ordering] * len(ids),
+        )
+        return [
+            {
+                "pokemon_id": pokemon_id,
+                "ordering": ordering,
+                "pending_move_count": int(result.counts[i]),
+                "enemy_name": battles[pokemon_id].enemy_name if pokemon_id in battles else None,
+                **_outcome(result, i),
+            }
+            for i, pokemon_id in enumerate(ids)
+        ]
@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from datetime import datetime, timedelta
+import base64
+import binascii
+import json
+import random
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.database import utcnow
+from app.core.exceptions import InvalidSyncTokenException, SyncTokenExpiredException
+from app.models.deletion import Deletion
+from app.models.move import Move
+from app.models.pokemon import Pokemon
+
+# 同期対象ごとの続き位置: (時刻, ID)。IDがNoneなら「時刻以降すべて」（重なり分を含む）
+Cursor = Tuple[datetime, Optional[UUID]]
+
+_TOKEN_VERSION = 1
+# 削除のたびにこの確率で保持期間切れのトゥームストーンを削除する
+_PURGE_PROBABILITY = 0.01
+
+def encode_token(cursors: Dict[str, Cursor]) -> str:
+    payload = {
+        "v": _TOKEN_VERSION,
+        **{name: [at.isoformat(), str(last_id) if last_id else None] for name, (at, last_id) in cursors.items()},
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_token(token: str) -> Dict[str, Cursor]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload.get("v") != _TOKEN_VERSION:
+            raise ValueError("unsupported token version")
+        return {
+            name: (datetime.fromisoformat(payload[name][0]), UUID(payload[name][1]) if payload[name][1] else None)
+            for name in ("pokemon", "moves", "deleted")
+        }
+    except (binascii.Error, ValueError, KeyError, TypeError, IndexError, AttributeError):
+        raise InvalidSyncTokenException()
+
+class SyncService:
+    @staticmethod
+    def record_deletion(db: Session, entity: str, entity_id: UUID) -> None:
+        """削除ログに記録（コミットは呼び出し側のトランザクションで行う）"""
+        db.add(Deletion(entity=entity, entity_id=entity_id))
+        if random.random() < _PURGE_PROBABILITY:
+            cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+            db.execute(delete(Deletion).where(Deletion.deleted_at < cutoff))
+
+    @staticmethod
+    def _changed_since(db: Session, timestamp_column, id_column, cursor: Optional[Cursor], limit: int) -> List[Any]:
+        """(時刻, ID) 順に cursor より後の行を limit + 1 件まで取得"""
+        entity = id_column.class_
+        stmt = select(entity)
+        if cursor is not None:
+            at, last_id = cursor
+            if last_id is None:
+                stmt = stmt.where(timestamp_column >= at)
+            else:
+                stmt = stmt.where(or_(timestamp_column > at, and_(timestamp_column == at, id_column > last_id)))
+        return db.scalars(stmt.order_by(timestamp_column, id_column).limit(limit + 1)).all()
+
+    @staticmethod
+    def get_changes(db: Session, since: Optional[str], limit: int = 500) -> Dict[str, Any]:
+        """
+        トークン以降に作成・更新されたPokemonとMove、削除のトゥームストーンを返す
+
+        since を省略すると全件（削除ログは現在以降）から始める。いずれかの対象が limit 件を
+        超えた場合は has_more=True となり、返されたトークンで続きを取得する。
+        後から古い時刻でコミットされる変更を取りこぼさないよう、直近 SYNC_OVERLAP_SECONDS の
+        変更は次回も重複して返ることがある（クライアントはIDで上書きする）。
+        続き位置はページが途中で切れた場合も重なり期間の手前で止めるので、重なり期間内の
+        変更だけで limit 件を超える分は has_more にせず、期間を過ぎてからの同期で返す。
+        Pokemonの削除ではそのMoveのトゥームストーンは記録しない（Pokemonと一緒に消す）。
+        """
+        # 時刻はDBの時計で比べる（updated_at はDB側で設定される）
+        now = db.scalar(select(utcnow()))
+        # これより前の時刻の変更はコミット済みとみなす
+        settled = now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+        if since is None:
+            # 削除ログは同期開始時点以降だけを見ればよい
+            cursors: Dict[str, Optional[Cursor]] = {"pokemon": None, "moves": None, "deleted": (settled, None)}
+        else:
+            cursors = decode_token(since)
+            if cursors["deleted"][0] < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+                raise SyncTokenExpiredException()
+
+        targets = {
+            "pokemon": (Pokemon.updated_at, Pokemon.id),
+            "moves": (Move.updated_at, Move.id),
+            "deleted": (Deletion.deleted_at, Deletion.id),
+        }
+        results: Dict[str, List[Any]] = {}
+        next_cursors: Dict[str, Cursor] = {}
+        has_more = False
+        for name, (timestamp_column, id_column) in targets.items():
+            cursor = cursors[name]
+            rows = SyncService._changed_since(db, timestamp_column, id_column, cursor, limit)
+            truncated = len(rows) > limit
+            if truncated:
+                rows = rows[:limit]
+            if rows:
+                last_at = getattr(rows[-1], timestamp_column.key)
+                # 直近の変更より前にコミット待ちの変更があり得る間は、次回も settled 以降を返す
+                if last_at <= settled:
+                    cursor = (last_at, rows[-1].id)
+                    has_more = has_more or truncated
+                else:
+                    cursor = (settled, None)
+                    # ページ全体が重なり期間内なら続けて取得しても同じページが返るだけ
+                    first_at = getattr(rows[0], timestamp_column.key)
+                    has_more = has_more or (truncated and first_at <= settled)
+            elif cursor is None or cursor[0] <= settled:
+                cursor = (settled, None)
+            results[name] = rows
+            next_cursors[name] = cursor
+
+        return {
+            "pokemon": results["pokemon"],
+            "moves": results["moves"],
+            "deleted": results["deleted"],
+            "next_token": encode_token(next_cursors),
+            "has_more": has_more,
+        }
@@ -0,0 +1,49 @@
+"""
+テスト用のpytestプラグイン（pyproject.toml の addopts で読み込む）
+
+    def test_list_pokemon(client, query_budget):
+        with query_budget(2):
+            client.get("/api/v1/pokemon/")
+
+予算を超えた場合や同一SQLが繰り返された場合（N+1）は、
+発行されたSQLの一覧を含めてテストを失敗させる。
+計測はエンジンの全接続が対象なので、APIプロセス内のAI採点ワーカーは止めておく。
+"""
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, Optional
+import os
+import pytest
+from sqlalchemy.engine import Engine
+from app.core.query_counter import QueryCounter
+
+def pytest_configure(config: pytest.Config) -> None:
+    # ワーカーのポーリングSQLが予算に混ざらないようにする（設定の読み込み前に行う）
+    os.environ.setdefault("AI_SCORING_WORKERS", "0")
+
+@pytest.fixture
+def query_engine() -> Engine:
+    """計測対象のエンジン（テスト用のデータベースを使う場合は conftest.py で上書きする）"""
+    from app.core.database import engine
+
+    return engine
+
+@pytest.fixture
+def query_counter(query_engine: Engine) -> Iterator[QueryCounter]:
+    """テスト中にアプリのエンジンが発行したSQLをすべて記録"""
+    with QueryCounter(query_engine) as counter:
+        yield counter
+
+@pytest.fixture
+def query_budget(query_engine: Engine) -> Callable[..., ContextManager[QueryCounter]]:
+    """with ブロック内のSQL発行回数に上限を設ける"""
+    @contextmanager
+    def budget(
+        max_queries: int,
+        max_repeats: Optional[int] = 1,
+        engine: Optional[Engine] = None,
+    ) -> Iterator[QueryCounter]:
+        with QueryCounter(engine or query_engine) as counter:
+            yield counter
+        counter.assert_budget(max_queries, max_repeats)
+
+    return budget
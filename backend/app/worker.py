@@ -0,0 +1,40 @@
+"""
+AI威力計算ジョブのワーカーをAPIサーバーとは別プロセスで実行する
+
+    python -m app.worker --concurrency 4
+
+APIプロセス内のワーカーを止める場合は AI_SCORING_WORKERS=0 を設定する。
+"""
+import argparse
+import asyncio
+from app.config import settings
+from app.core.logging_config import configure_logging
+from app.services.ai_scoring_service import AIScoringWorkerPool
+from app.services.ai_service import ai_service
+
+async def run(concurrency: int) -> None:
+    ai_service.load_power_model()
+    await ai_service.probe.refresh()
+    ai_service.probe.start()
+    workers = AIScoringWorkerPool(concurrency, poll_interval=settings.AI_SCORING_POLL_INTERVAL)
+    workers.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await workers.stop()
+        await ai_service.probe.stop()
+        await ai_service.aclose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description="AI scoring job worker")
+    parser.add_argument("--concurrency", type=int, default=max(1, settings.AI_SCORING_WORKERS))
+    args = parser.parse_args()
+
+    configure_logging()
+    try:
+        asyncio.run(run(args.concurrency))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+AIService の経路ベンチマーク（偽LM Studioサーバー使用）
+
+    python -m benchmarks.ai_path --requests 500 --concurrency 20 --latency lognormal:600,0.6 --error-rate 0.05
+
+--url を指定しない場合は benchmarks.fake_lmstudio をプロセス内で起動する。
+レイテンシのp50/p95/p99、フォールバック率、スループットを出力する。
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import logging
+import threading
+import time
+import uvicorn
+from benchmarks.common import find_free_port, format_summary, summarize_latencies, write_json
+from benchmarks.fake_lmstudio import FakeServerConfig, create_app
+
+class BackgroundServer:
+    """uvicornを別スレッドで起動する"""
+
+    def __init__(self, app, port: int):
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+async def run_benchmark(
+    base_url: str,
+    mode: str,
+    total: int,
+    concurrency: int,
+    repeat_ratio: float,
+    latency_budget_ms: Optional[int],
+) -> Dict[str, Any]:
+    # 設定値を変更してから読み込めるよう遅延インポート
+    from app.services.ai_service import AIService
+
+    service = AIService(base_url=base_url)
+    if latency_budget_ms is not None:
+        service.latency_budget = latency_budget_ms / 1000 if latency_budget_ms > 0 else None
+
+    latencies: List[float] = []
+    first_power: List[float] = []
+    fallbacks = 0
+    errors = 0
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    distinct = max(1, int(total * (1 - repeat_ratio)))
+
+    async def worker() -> None:
+        nonlocal fallbacks, errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            name = f"Benchmark task {i % distinct}"
+            start = time.perf_counter()
+            try:
+                if mode == "stream":
+                    result = None
+                    async for event, data in service.stream_move_power(name):
+                        if event == "power":
+                            first_power.append(time.perf_counter() - start)
+                        elif event == "result":
+                            result = data
+                elif mode == "score":
+                    result = await service.score_move_power(name)
+                else:
+                    result = await service.calculate_move_power(name)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if result is None or not result["ai_generated"]:
+                fallbacks += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    # レイテンシ予算超過でバックグラウンドに回った呼び出しの完了を待つ
+    if service._in_flight:
+        await asyncio.gather(*service._in_flight.values(), return_exceptions=True)
+    await service.aclose()
+
+    return {
+        "mode": mode,
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "fallback_rate": fallbacks / total if total else 0.0,
+        "errors": errors,
+        "circuit_state": service.circuit_breaker.state.value,
+        "latency": summarize_latencies(latencies),
+        "time_to_power": summarize_latencies(first_power) if mode == "stream" else None,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ai_path", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Use an already running LM Studio compatible server")
+    parser.add_argument("--mode", choices=["calculate", "stream", "score"], default="calculate")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--repeat-ratio", type=float, default=0.0, help="Fraction of requests repeating an earlier task (cache hits)")
+    parser.add_argument("--latency-budget-ms", type=int, default=None, help="Override AI_LATENCY_BUDGET_MS (0 disables)")
+    parser.add_argument("--latency", default="lognormal:400,0.5", help="Fake server latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--verbose", action="store_true", help="Show per-request warnings from AIService")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("app").setLevel(logging.CRITICAL)
+
+    def run(base_url: str) -> Dict[str, Any]:
+        return asyncio.run(run_benchmark(
+            base_url, args.mode, args.requests, args.concurrency, args.repeat_ratio, args.latency_budget_ms
+        ))
+
+    if args.url:
+        results = run(args.url)
+    else:
+        port = find_free_port()
+        config = FakeServerConfig(args.latency, args.error_rate, args.malformed_rate, seed=args.seed)
+        with BackgroundServer(create_app(config), port):
+            results = run(f"http://127.0.0.1:{port}")
+        results["fake_server"] = vars(config)
+
+    print(f"mode={results['mode']} requests={results['requests']} concurrency={results['concurrency']}")
+    print(format_summary("latency", results["latency"]))
+    if results["time_to_power"]:
+        print(format_summary("time to power", results["time_to_power"]))
+    print(f"throughput: {results['throughput_rps']:.1f} req/s   fallback rate: {results['fallback_rate']:.1%}   "
+          f"errors: {results['errors']}   circuit: {results['circuit_state']}")
+
+    if args.output:
+        write_json(args.output, results)
+
+if __name__ == "__main__":
+    main()
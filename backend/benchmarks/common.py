@@ -0,0 +1,50 @@
+"""ベンチマーク共通の集計・出力ヘルパー"""
+from typing import Dict, Iterable, List, Sequence
+import json
+import math
+import socket
+from pathlib import Path
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """ソート済みの値から線形補間でパーセンタイルを求める"""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize_latencies(latencies: Iterable[float]) -> Dict[str, float]:
+    """秒単位のレイテンシをミリ秒のp50/p95/p99などに要約"""
+    values: List[float] = sorted(v * 1000 for v in latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values),
+        "p50_ms": percentile(values, 0.50),
+        "p95_ms": percentile(values, 0.95),
+        "p99_ms": percentile(values, 0.99),
+        "max_ms": values[-1],
+    }
+
+def format_summary(name: str, summary: Dict[str, float]) -> str:
+    if not summary.get("count"):
+        return f"{name:<28} (no samples)"
+    return (
+        f"{name:<28} n={summary['count']:<6} "
+        f"p50={summary['p50_ms']:8.2f}ms  p95={summary['p95_ms']:8.2f}ms  "
+        f"p99={summary['p99_ms']:8.2f}ms  max={summary['max_ms']:8.2f}ms"
+    )
+
+def write_json(path: str, data: dict) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
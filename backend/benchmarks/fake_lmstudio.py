@@ -0,0 +1,141 @@
+"""
+LM Studio互換（OpenAI互換）のスタンドインサーバー
+
+GPUなしで /ai/* 経路を負荷試験するための偽サーバー。応答レイテンシの分布、
+エラー率、壊れたJSONを返す割合を指定できる。
+
+    python -m benchmarks.fake_lmstudio --port 1234 --latency lognormal:400,0.6 --error-rate 0.05
+
+レイテンシ指定:
+    fixed:<ms>                 常に一定
+    uniform:<min_ms>,<max_ms>  一様分布
+    lognormal:<median_ms>,<sigma>  対数正規分布（LLMの応答時間に近い裾の重さ）
+"""
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+MODEL_ID = "google/gemma-3n-e4b"
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """レイテンシ指定を、秒を返すサンプラーに変換"""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise argparse.ArgumentTypeError(f"Invalid latency spec: {spec}")
+
+@dataclass
+class FakeServerConfig:
+    latency: str = "lognormal:400,0.5"
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    tokens_per_response: int = 40
+    seed: Optional[int] = None
+
+def create_app(config: FakeServerConfig) -> FastAPI:
+    rng = random.Random(config.seed)
+    sample_latency = parse_latency(config.latency)
+    app = FastAPI(title="Fake LM Studio")
+    app.state.requests = 0
+
+    def completion_text() -> str:
+        if rng.random() < config.malformed_rate:
+            # JSONの途中で途切れた応答、またはJSONを含まない応答
+            return rng.choice([
+                '{"power": 42, "difficulty_score": 4, "reasoning": "unterminated',
+                "I think this task is moderately complex.",
+            ])
+        power = rng.randint(1, 100)
+        return json.dumps({
+            "power": power,
+            "difficulty_score": max(1, min(10, power // 10)),
+            "reasoning": "Synthetic response from the fake LM Studio server",
+            "estimated_time": f"{max(1, power // 10)} hours",
+        }, indent=2)
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": MODEL_ID, "object": "model"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        latency = sample_latency(rng)
+
+        if rng.random() < config.error_rate:
+            await asyncio.sleep(latency)
+            return JSONResponse({"error": "Injected failure"}, status_code=500)
+
+        content = completion_text()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", MODEL_ID),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+            }
+
+        async def stream() -> AsyncIterator[str]:
+            size = max(1, math.ceil(len(content) / config.tokens_per_response))
+            chunks = [content[i:i + size] for i in range(0, len(content), size)]
+            delay = latency / len(chunks)
+            for chunk in chunks:
+                await asyncio.sleep(delay)
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "model": body.get("model", MODEL_ID),
+                    "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(payload)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_lmstudio", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency", default=FakeServerConfig.latency, type=str)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of responses without valid JSON")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    parse_latency(args.latency)
+    import uvicorn
+    uvicorn.run(
+        create_app(FakeServerConfig(args.latency, args.error_rate, args.malformed_rate, seed=args.seed)),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+主キーの挿入ベンチマーク（UUIDv4とUUIDv7の比較）
+
+    python -m benchmarks.ids --rows 1000000
+    python -m benchmarks.ids --rows 200000 --output ids.json
+
+DATABASE_URL のデータベースに主キーだけが異なる2つの一時テーブルを作り、
+同じ件数のバッチを交互に挿入して、スループット（全体と最後の10%）と
+主キーインデックスのサイズを比較する。PostgreSQLで pgstattuple 拡張が
+使える場合はリーフページの充填率も表示する。テーブルは終了時に削除する。
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import time
+import uuid
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from app.config import settings
+from app.core.ids import uuid7
+from benchmarks.common import write_json
+
+KEYS: Dict[str, Callable[[], uuid.UUID]] = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+# 行の中身はMoveの1行と同程度の大きさにする
+PAYLOAD = "Refactor the battle engine and write docs " * 3
+
+def table_name(key: str) -> str:
+    return f"bench_ids_{key}"
+
+def create_tables(conn: Connection, dialect: str) -> None:
+    id_type = "uuid" if dialect == "postgresql" else "CHAR(32)"
+    for key in KEYS:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name(key)}"))
+        conn.execute(text(f"CREATE TABLE {table_name(key)} (id {id_type} PRIMARY KEY, payload TEXT NOT NULL)"))
+
+def index_stats(conn: Connection, dialect: str, key: str) -> Dict[str, Any]:
+    """主キーインデックスのサイズ（取得できる範囲で）"""
+    table = table_name(key)
+    if dialect == "postgresql":
+        index = conn.execute(text(
+            "SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = CAST(:table AS regclass) AND indisprimary"
+        ), {"table": table}).scalar_one()
+        stats: Dict[str, Any] = {
+            "index_bytes": conn.execute(text("SELECT pg_relation_size(CAST(:index AS regclass))"), {"index": index}).scalar_one(),
+            "table_bytes": conn.execute(text("SELECT pg_relation_size(CAST(:table AS regclass))"), {"table": table}).scalar_one(),
+        }
+        try:
+            row = conn.execute(text(
+                "SELECT leaf_pages, avg_leaf_density FROM pgstatindex(:index)"
+            ), {"index": index}).one()
+            stats["leaf_pages"] = row.leaf_pages
+            stats["avg_leaf_density"] = row.avg_leaf_density
+        except Exception:
+            pass  # pgstattuple拡張がない
+        return stats
+    if dialect == "sqlite":
+        try:
+            pages = conn.execute(text(
+                "SELECT sum(pgsize) FROM dbstat WHERE name = :index"
+            ), {"index": f"sqlite_autoindex_{table}_1"}).scalar()
+            return {"index_bytes": pages}
+        except Exception:
+            pass  # dbstatが有効でないビルド
+    return {}
+
+def run(url: str, rows: int, batch: int) -> Dict[str, Any]:
+    engine = create_engine(url)
+    dialect = engine.dialect.name
+    insert_sql = {key: text(f"INSERT INTO {table_name(key)} (id, payload) VALUES (:id, :payload)") for key in KEYS}
+    to_param = (lambda value: value) if dialect == "postgresql" else (lambda value: value.hex)
+
+    elapsed: Dict[str, List[float]] = {key: [] for key in KEYS}
+    try:
+        with engine.begin() as conn:
+            create_tables(conn, dialect)
+
+        done = 0
+        while done < rows:
+            size = min(batch, rows - done)
+            # 片方だけが不利な時間帯に当たらないよう、バッチごとに交互に挿入する
+            for key, generate in KEYS.items():
+                params = [{"id": to_param(generate()), "payload": PAYLOAD} for _ in range(size)]
+                start = time.perf_counter()
+                with engine.begin() as conn:
+                    conn.execute(insert_sql[key], params)
+                elapsed[key].append(time.perf_counter() - start)
+            done += size
+            print(f"\r{done}/{rows} rows", end="", flush=True)
+        print()
+
+        results = {}
+        # VACUUMはトランザクション外で実行する必要がある
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if dialect == "postgresql":
+                for key in KEYS:
+                    conn.execute(text(f"VACUUM ANALYZE {table_name(key)}"))
+            for key in KEYS:
+                tail = elapsed[key][-max(1, len(elapsed[key]) // 10):]
+                tail_rows = min(rows, len(tail) * batch)
+                results[key] = {
+                    "rows": rows,
+                    "rows_per_s": rows / sum(elapsed[key]),
+                    "last_10pct_rows_per_s": tail_rows / sum(tail),
+                    **index_stats(conn, dialect, key),
+                }
+    finally:
+        with engine.begin() as conn:
+            for key in KEYS:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table_name(key)}"))
+        engine.dispose()
+
+    return {"dialect": dialect, "rows": rows, "batch": batch, "keys": results}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ids", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="Database URL (default: DATABASE_URL)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows inserted per key type")
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per INSERT transaction")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.url, args.rows, args.batch)
+    for key, result in results["keys"].items():
+        line = (
+            f"{key:<6} {result['rows_per_s']:10,.0f} rows/s  "
+            f"last 10%: {result['last_10pct_rows_per_s']:10,.0f} rows/s"
+        )
+        if result.get("index_bytes"):
+            line += f"  pk index: {result['index_bytes'] / 1024 / 1024:8.1f} MiB"
+        if "avg_leaf_density" in result:
+            line += f"  leaf pages: {result['leaf_pages']}  leaf density: {result['avg_leaf_density']:.1f}%"
+        print(line)
+
+    if args.output:
+        write_json(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+CRUD API の負荷ベンチマーク
+
+    python -m benchmarks.load --requests 500 --concurrency 16
+    python -m benchmarks.load --save-baseline benchmarks/baselines/load.json
+    python -m benchmarks.load --baseline benchmarks/baselines/load.json --threshold 0.2
+
+--url を指定しない場合は実際のFastAPIアプリをプロセス内のuvicornで起動し、
+DATABASE_URL のデータベース（ローカルのPostgres、または sqlite:///./bench.db）に対して実行する。
+計測前にベンチマーク用のPokemonとMoveをAPI経由で作成し、終了後に削除する。
+
+シナリオごとにスループットとp50/p95/p99を出力する。--baseline を指定すると、
+p95の悪化またはスループットの低下が閾値を超えたシナリオがあれば終了コード1で終了する。
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import httpx
+from benchmarks.common import find_free_port, format_summary, summarize_latencies, write_json
+
+API = "/api/v1"
+
+@dataclass
+class Fixture:
+    """計測前に作成したデータ"""
+    pokemon_ids: List[str]
+    pending_move_ids: List[str]
+
+Scenario = Callable[[httpx.AsyncClient, Fixture, int, random.Random], Awaitable[httpx.Response]]
+
+async def list_pokemon(client: httpx.AsyncClient, fixture: Fixture, i: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"{API}/pokemon/")
+
+async def pokemon_detail(client: httpx.AsyncClient, fixture: Fixture, i: int, rng: random.Random) -> httpx.Response:
+    return await client.get(f"{API}/pokemon/{rng.choice(fixture.pokemon_ids)}")
+
+async def create_move(client: httpx.AsyncClient, fixture: Fixture, i: int, rng: random.Random) -> httpx.Response:
+    # powerを指定してAI採点ジョブを発生させない
+    return await client.post(f"{API}/moves/", json={
+        "name": f"Benchmark move {i}",
+        "description": "Created by benchmarks.load",
+        "power": rng.randint(1, 100),
+        "pokemon_id": rng.choice(fixture.pokemon_ids),
+    })
+
+async def complete_move(client: httpx.AsyncClient, fixture: Fixture, i: int, rng: random.Random) -> httpx.Response:
+    return await client.post(f"{API}/moves/{fixture.pending_move_ids[i]}/complete")
+
+async def add_experience(client: httpx.AsyncClient, fixture: Fixture, i: int, rng: random.Random) -> httpx.Response:
+    return await client.post(
+        f"{API}/pokemon/{rng.choice(fixture.pokemon_ids)}/add-experience",
+        params={"experience": rng.randint(5, 30)},
+    )
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list_pokemon": list_pokemon,
+    "pokemon_detail": pokemon_detail,
+    "create_move": create_move,
+    "complete_move": complete_move,
+    "add_experience": add_experience,
+}
+
+async def create_fixture(
+    client: httpx.AsyncClient, pokemon_count: int, moves_per_pokemon: int, pending_moves: int
+) -> Fixture:
+    """ベンチマーク用のPokemonとMoveを作成（complete_move用の未完了Moveを含む）"""
+    pokemon_ids = []
+    for i in range(pokemon_count):
+        response = await client.post(f"{API}/pokemon/", json={"name": f"Bench {i}", "type": "electric"})
+        response.raise_for_status()
+        pokemon_ids.append(response.json()["id"])
+
+    move_ids = []
+    for i in range(pokemon_count * moves_per_pokemon + pending_moves):
+        response = await client.post(f"{API}/moves/", json={
+            "name": f"Fixture move {i}",
+            "power": (i * 37) % 100 + 1,
+            "pokemon_id": pokemon_ids[i % pokemon_count],
+        })
+        response.raise_for_status()
+        move_ids.append(response.json()["id"])
+
+    return Fixture(pokemon_ids=pokemon_ids, pending_move_ids=move_ids[-pending_moves:] if pending_moves else [])
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    fixture: Fixture,
+    total: int,
+    concurrency: int,
+    seed: int,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count(offset)
+    end = offset + total
+    rng = random.Random(seed)
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= end:
+                return
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, fixture, i, rng)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": summarize_latencies(latencies),
+    }
+
+async def run_benchmark(
+    base_url: str,
+    scenarios: List[str],
+    total: int,
+    concurrency: int,
+    warmup: int,
+    pokemon_count: int,
+    moves_per_pokemon: int,
+    seed: int,
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        pending = (total + warmup) if "complete_move" in scenarios else 0
+        fixture = await create_fixture(client, pokemon_count, moves_per_pokemon, pending)
+
+        results = {}
+        for name in scenarios:
+            # ウォームアップ分の未完了Moveは計測対象と重ならないよう先頭を使う
+            await run_scenario(client, SCENARIOS[name], fixture, warmup, concurrency, seed)
+            results[name] = await run_scenario(
+                client, SCENARIOS[name], fixture, total, concurrency, seed, offset=warmup
+            )
+
+        # 次回の実行が同じデータ量から始まるよう、作成したデータを削除（Moveはカスケード削除）
+        for pokemon_id in fixture.pokemon_ids:
+            await client.delete(f"{API}/pokemon/{pokemon_id}")
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "pokemon": pokemon_count,
+        "moves_per_pokemon": moves_per_pokemon,
+        "scenarios": results,
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """ベースラインと比べて閾値を超えて悪化したシナリオを列挙"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous["latency"].get("count") or not current["latency"].get("count"):
+            continue
+        p95_ratio = current["latency"]["p95_ms"] / previous["latency"]["p95_ms"] - 1
+        if p95_ratio > threshold:
+            regressions.append(
+                f"{name}: p95 {previous['latency']['p95_ms']:.2f}ms -> {current['latency']['p95_ms']:.2f}ms "
+                f"(+{p95_ratio:.0%})"
+            )
+        throughput_ratio = 1 - current["throughput_rps"] / previous["throughput_rps"]
+        if throughput_ratio > threshold:
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s "
+                f"(-{throughput_ratio:.0%})"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark an already running API server instead of starting one")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument("--pokemon", type=int, default=20)
+    parser.add_argument("--moves-per-pokemon", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against this baseline (created if missing)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative p95 increase / throughput drop before failing")
+    args = parser.parse_args()
+    scenarios = args.scenario or list(SCENARIOS)
+
+    def run(base_url: str) -> Dict[str, Any]:
+        return asyncio.run(run_benchmark(
+            base_url, scenarios, args.requests, args.concurrency, args.warmup,
+            args.pokemon, args.moves_per_pokemon, args.seed,
+        ))
+
+    if args.url:
+        results = run(args.url)
+    else:
+        # 計測を乱すバックグラウンド処理とリクエストごとのログを止めてからアプリを読み込む
+        os.environ.setdefault("AI_SCORING_WORKERS", "0")
+        os.environ.setdefault("DEBUG", "false")
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        from app.main import app
+        from benchmarks.ai_path import BackgroundServer
+
+        port = find_free_port()
+        with BackgroundServer(app, port):
+            results = run(f"http://127.0.0.1:{port}")
+
+    print(f"requests={results['requests']} concurrency={results['concurrency']}")
+    for name, result in results["scenarios"].items():
+        print(f"{format_summary(name, result['latency'])}  {result['throughput_rps']:8.1f} req/s  errors={result['errors']}")
+
+    if args.output:
+        write_json(args.output, results)
+    if args.save_baseline:
+        write_json(args.save_baseline, results)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        path = Path(args.baseline)
+        if not path.exists():
+            write_json(args.baseline, results)
+            print(f"no baseline found, saved current results to {args.baseline}")
+            return
+        regressions = compare(results, json.loads(path.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%} against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+主キー取得のマイクロベンチマーク
+
+    python -m benchmarks.lookup --iterations 20000
+    python -m benchmarks.lookup --url sqlite:// --output lookup.json
+
+DATABASE_URL のデータベースにベンチマーク用のPokemonを作成し、1件取得あたりの時間を
+次の方法で比較する（作成した行は終了時に削除する）。
+
+- query_first: db.query(Pokemon).filter(Pokemon.id == id).first()（以前の実装）
+- session_get: db.get(Pokemon, id)（get_or_404）。毎回 expunge_all して必ずSQLを発行する
+- session_get_hit: 同じセッションで取得済みの行を db.get（アイデンティティマップから返り、SQLなし）
+
+query_first と session_get の差がクエリ組み立てとコンパイルキャッシュ参照の分のPython側の
+オーバーヘッドになる。
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import random
+import time
+import uuid
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import settings
+from app.core.database import Base
+from app.models.pokemon import Pokemon
+from benchmarks.common import write_json
+
+BENCH_NAME = "bench-lookup"
+
+def query_first(db: Session, pokemon_id: uuid.UUID) -> Any:
+    db.expunge_all()
+    return db.query(Pokemon).filter(Pokemon.id == pokemon_id).first()
+
+def session_get(db: Session, pokemon_id: uuid.UUID) -> Any:
+    db.expunge_all()
+    return db.get(Pokemon, pokemon_id)
+
+def session_get_hit(db: Session, pokemon_id: uuid.UUID) -> Any:
+    return db.get(Pokemon, pokemon_id)
+
+METHODS: Dict[str, Callable[[Session, uuid.UUID], Any]] = {
+    "query_first": query_first,
+    "session_get": session_get,
+    "session_get_hit": session_get_hit,
+}
+
+def run(url: str, rows: int, iterations: int, rounds: int) -> Dict[str, Any]:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[Pokemon.__table__])
+    SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    with SessionFactory() as db:
+        pokemon = [Pokemon(name=BENCH_NAME) for _ in range(rows)]
+        db.add_all(pokemon)
+        db.commit()
+        ids = [p.id for p in pokemon]
+
+    rng = random.Random(0)
+    loaded: List[Any] = []
+    elapsed: Dict[str, List[float]] = {name: [] for name in METHODS}
+    try:
+        with SessionFactory() as db:
+            # 計測前に各方法を一通り実行してキャッシュを温める
+            for method in METHODS.values():
+                for pokemon_id in ids[:100]:
+                    method(db, pokemon_id)
+            for _ in range(rounds):
+                # 片方だけが不利な時間帯に当たらないよう、ラウンドごとに交互に計測する
+                sample = [rng.choice(ids) for _ in range(iterations)]
+                for name, method in METHODS.items():
+                    if name == "session_get_hit":
+                        # アイデンティティマップは弱参照なので、参照を持っておく
+                        loaded.extend(db.get(Pokemon, pokemon_id) for pokemon_id in sample)
+                    start = time.perf_counter()
+                    for pokemon_id in sample:
+                        method(db, pokemon_id)
+                    elapsed[name].append(time.perf_counter() - start)
+                loaded.clear()
+                db.expunge_all()
+    finally:
+        with SessionFactory() as db:
+            db.execute(delete(Pokemon).where(Pokemon.id.in_(ids)))
+            db.commit()
+        engine.dispose()
+
+    # ラウンドの最小値を採用（ノイズの少ない回）
+    results = {name: {"us_per_call": min(times) / iterations * 1e6} for name, times in elapsed.items()}
+    baseline = results["query_first"]["us_per_call"]
+    for result in results.values():
+        result["saving_us"] = baseline - result["us_per_call"]
+        result["speedup"] = baseline / result["us_per_call"]
+    return {"dialect": engine.dialect.name, "rows": rows, "iterations": iterations, "rounds": rounds, "methods": results}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.lookup", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="Database URL (default: DATABASE_URL)")
+    parser.add_argument("--rows", type=int, default=1000, help="Pokemon created for the benchmark")
+    parser.add_argument("--iterations", type=int, default=5000, help="Lookups per method per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds (the fastest round is reported)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.url, args.rows, args.iterations, args.rounds)
+    for name, result in results["methods"].items():
+        print(
+            f"{name:<16} {result['us_per_call']:8.1f} us/call  "
+            f"saving: {result['saving_us']:7.1f} us  x{result['speedup']:.2f}"
+        )
+
+    if args.output:
+        write_json(args.output, results)
+
+if __name__ == "__main__":
+    main()
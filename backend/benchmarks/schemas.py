@@ -0,0 +1,140 @@
+"""
+リクエスト/レスポンススキーマのマイクロベンチマーク
+
+    python -m benchmarks.schemas
+    python -m benchmarks.schemas --output before.json
+    python -m benchmarks.schemas --baseline before.json
+
+- validate: リクエストボディ（dict）からの検証
+- response: ORMオブジェクト相当からの検証とJSON用シリアライズ
+  （FastAPIが response_model に対して行う validate_python(from_attributes=True) と dump_python(mode="json")）
+
+--baseline を指定すると、保存済みの結果に対する速度比を表示する。
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import json
+import timeit
+import uuid
+from pathlib import Path
+from benchmarks.common import write_json
+
+Case = Tuple[str, Callable[[], Any]]
+
+def _text(length: int, messy: bool) -> str:
+    """指定長の文字列（messyなら前後と語間に余分な空白を含む）"""
+    words = ("Refactor", "the", "battle", "engine", "and", "write", "docs")
+    text = ""
+    i = 0
+    while len(text) < length:
+        text += words[i % len(words)] + ("  \n" if messy and i % 3 == 0 else " ")
+        i += 1
+    text = text[:length].strip()
+    return f"  {text}  " if messy else text
+
+def _move_row(pokemon_id: uuid.UUID, i: int, description_length: int) -> SimpleNamespace:
+    now = datetime(2024, 1, 1) + timedelta(minutes=i)
+    completed = i % 2 == 0
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        pokemon_id=pokemon_id,
+        name=_text(40, False),
+        description=_text(description_length, False) if description_length else None,
+        power=(i * 37) % 100 + 1,
+        is_completed=completed,
+        completed_at=now if completed else None,
+        created_at=now,
+        updated_at=now,
+    )
+
+def _pokemon_row(move_count: int, description_length: int) -> SimpleNamespace:
+    pokemon_id = uuid.uuid4()
+    now = datetime(2024, 1, 1)
+    return SimpleNamespace(
+        id=pokemon_id,
+        name="Pikachu",
+        type="electric",
+        level=20,
+        experience=42.0,
+        evolution_stage=2,
+        created_at=now,
+        updated_at=now,
+        moves=[_move_row(pokemon_id, i, description_length) for i in range(move_count)],
+    )
+
+def build_cases() -> List[Case]:
+    from app.schemas.move import Move, MoveCreate, MoveUpdate
+    from app.schemas.pokemon import Pokemon, PokemonCreate, PokemonWithMoves
+
+    cases: List[Case] = []
+    pokemon_id = str(uuid.uuid4())
+
+    for label, name_length, description_length, messy in (
+        ("short", 20, 0, False),
+        ("long", 100, 500, False),
+        ("long+whitespace", 96, 490, True),
+    ):
+        body = {
+            "name": _text(name_length, messy),
+            "description": _text(description_length, messy) if description_length else None,
+            "power": 42,
+            "pokemon_id": pokemon_id,
+        }
+        cases.append((f"MoveCreate.validate[{label}]", lambda body=body: MoveCreate.model_validate(body)))
+        update = {k: body[k] for k in ("name", "description")}
+        cases.append((f"MoveUpdate.validate[{label}]", lambda update=update: MoveUpdate.model_validate(update)))
+
+    for label, name in (("short", "Pikachu"), ("whitespace", "  Pika   chu  ")):
+        body = {"name": name, "type": "electric"}
+        cases.append((f"PokemonCreate.validate[{label}]", lambda body=body: PokemonCreate.model_validate(body)))
+
+    def response(model, row):
+        return lambda: model.model_validate(row, from_attributes=True).model_dump(mode="json")
+
+    move = _move_row(uuid.uuid4(), 0, 200)
+    cases.append(("Move.response", response(Move, move)))
+    pokemon = _pokemon_row(0, 0)
+    cases.append(("Pokemon.response", response(Pokemon, pokemon)))
+    for move_count in (0, 10, 100):
+        row = _pokemon_row(move_count, 200)
+        cases.append((f"PokemonWithMoves.response[{move_count} moves]", response(PokemonWithMoves, row)))
+    return cases
+
+def measure(func: Callable[[], Any], min_time: float, repeat: int) -> float:
+    """1回あたりの実行時間（マイクロ秒、repeat回の最小値）"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.schemas", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run cases containing this string")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Show speedup against a previous --output file")
+    args = parser.parse_args()
+
+    baseline: Dict[str, float] = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["cases"]
+
+    results: Dict[str, float] = {}
+    for name, func in build_cases():
+        if args.filter not in name:
+            continue
+        results[name] = measure(func, args.min_time, args.repeat)
+        line = f"{name:<42} {results[name]:10.2f} us"
+        if name in baseline:
+            line += f"   {baseline[name]:10.2f} us before   x{baseline[name] / results[name]:.2f}"
+        print(line)
+
+    if args.output:
+        write_json(args.output, {"unit": "us/op", "cases": results})
+
+if __name__ == "__main__":
+    main()
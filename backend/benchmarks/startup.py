@@ -0,0 +1,89 @@
+"""
+起動時間ベンチマーク
+
+    python -m benchmarks.startup --runs 5 --path /api/v1/pokemon/
+
+- import: 新しいプロセスで `import app.main` にかかる時間
+- time to first request: uvicornプロセスの起動から --path への最初の成功応答までの時間
+- first / second request: 起動直後の1回目と2回目のリクエストのレイテンシ（コールドスタートの残り）
+"""
+from typing import Dict, List
+import argparse
+import os
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.common import find_free_port, format_summary, summarize_latencies, write_json
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_import() -> float:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def measure_first_request(path: str, timeout: float) -> Dict[str, float]:
+    port = find_free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while True:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"Server did not answer {path} within {timeout}s")
+                if process.poll() is not None:
+                    raise RuntimeError("Server exited during startup")
+                try:
+                    request_start = time.perf_counter()
+                    response = client.get(path)
+                except httpx.TransportError:
+                    time.sleep(0.02)
+                    continue
+                if response.status_code < 500:
+                    break
+                time.sleep(0.02)
+            ready = time.perf_counter()
+            first = ready - request_start
+
+            request_start = time.perf_counter()
+            client.get(path)
+            second = time.perf_counter() - request_start
+    finally:
+        process.terminate()
+        process.wait()
+    return {"time_to_first_request": ready - start, "first_request": first, "second_request": second}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/health", help="Request used to detect readiness")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--skip-server", action="store_true", help="Only measure import time")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    results = {"import": summarize_latencies(imports)}
+    print(format_summary("import app.main", results["import"]))
+
+    if not args.skip_server:
+        runs: Dict[str, List[float]] = {"time_to_first_request": [], "first_request": [], "second_request": []}
+        for _ in range(args.runs):
+            for key, value in measure_first_request(args.path, args.timeout).items():
+                runs[key].append(value)
+        for key, values in runs.items():
+            results[key] = summarize_latencies(values)
+            print(format_summary(key.replace("_", " "), results[key]))
+
+    if args.output:
+        write_json(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""AdmissionLimiter の待機キュー（FIFO・タイムアウト・取り消し）"""
+import asyncio
+from typing import List
+
+import pytest
+
+from app.core.admission import AdmissionLimiter
+from app.core.exceptions import ServiceOverloadedException
+
+
+def make_limiter(limit: int = 1, max_queue: int = 10, queue_timeout: float = 5.0) -> AdmissionLimiter:
+    return AdmissionLimiter("test", limit=limit, max_queue=max_queue, queue_timeout=queue_timeout, retry_after=7)
+
+async def acquire_and_record(limiter: AdmissionLimiter, name: str, admitted: List[str]) -> None:
+    await limiter.acquire()
+    admitted.append(name)
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_in_arrival_order():
+    limiter = make_limiter()
+    await limiter.acquire()
+    admitted: List[str] = []
+    waiters = []
+    for name in ("a", "b", "c"):
+        waiters.append(asyncio.create_task(acquire_and_record(limiter, name, admitted)))
+        await asyncio.sleep(0)
+    assert (limiter.active, limiter.queued) == (1, 3)
+
+    limiter.release()
+    # 空きを待っている間に来たリクエストも、先に並んでいる待機者を追い越さない
+    waiters.append(asyncio.create_task(acquire_and_record(limiter, "d", admitted)))
+    for _ in range(3):
+        await asyncio.sleep(0)
+        limiter.release()
+    await asyncio.gather(*waiters)
+
+    assert admitted == ["a", "b", "c", "d"]
+    assert (limiter.active, limiter.queued) == (1, 0)
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_immediately():
+    limiter = make_limiter(max_queue=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceOverloadedException) as error:
+        await limiter.acquire()
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "7"}
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+@pytest.mark.asyncio
+async def test_queue_timeout_returns_503_with_retry_after():
+    limiter = make_limiter(queue_timeout=0.01)
+    await limiter.acquire()
+
+    with pytest.raises(ServiceOverloadedException) as error:
+        await limiter.acquire()
+
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "7"}
+    assert (limiter.active, limiter.queued) == (1, 0)
+    limiter.release()
+    assert limiter.active == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = make_limiter()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queued == 0
+
+    limiter.release()
+    assert limiter.active == 0
+    await asyncio.wait_for(limiter.acquire(), 0.1)
+
+@pytest.mark.asyncio
+async def test_slot_handed_to_a_cancelled_waiter_is_not_lost():
+    limiter = make_limiter()
+    await limiter.acquire()
+    admitted: List[str] = []
+
+    async def handle(name: str) -> None:
+        # AdmissionLimiter.dependency と同じく、取得できたら必ず返す
+        await limiter.acquire()
+        try:
+            admitted.append(name)
+        finally:
+            limiter.release()
+
+    first = asyncio.create_task(handle("first"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(handle("second"))
+    await asyncio.sleep(0)
+
+    # スロットを譲られた直後、再開する前に取り消された（クライアント切断）。
+    # 取り消しが間に合えばスロットは次の待機者に渡り、間に合わなければ
+    # first がスロットを使ってから返す（Python のバージョンによる）
+    limiter.release()
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    await asyncio.wait_for(second, 0.1)
+
+    assert admitted[-1] == "second"
+    assert (limiter.active, limiter.queued) == (0, 0)
+
+@pytest.mark.asyncio
+async def test_dependency_holds_the_slot_until_the_response_is_sent():
+    limiter = make_limiter()
+    dependency = limiter.dependency()
+    await dependency.__anext__()
+    assert limiter.active == 1
+
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    assert limiter.active == 0
@@ -0,0 +1,62 @@
+"""AI威力計算ジョブのキュー（難易度の引き継ぎと、試行回数切れのジョブの読み飛ばし）"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.ai_scoring_job import AIScoringJob
+from app.models.pokemon import Pokemon
+from app.schemas.move import MoveCreate
+from app.services import ai_scoring_service
+from app.services.ai_scoring_service import AIScoringJobService, AIScoringWorkerPool
+from app.services.move_service import MoveService
+
+
+def create_moves(*difficulties: str) -> list:
+    """威力を指定せずにMoveを作成し、登録されたジョブを作成順に返す"""
+    with SessionLocal() as db:
+        pokemon = Pokemon(name="Pikachu")
+        db.add(pokemon)
+        db.commit()
+        for i, difficulty in enumerate(difficulties):
+            fields = {"pokemon_id": pokemon.id, "name": f"Task {i}"}
+            if difficulty is not None:
+                fields["difficulty_level"] = difficulty
+            MoveService.create_move(db, MoveCreate(**fields))
+        return db.scalars(select(AIScoringJob).order_by(AIScoringJob.created_at, AIScoringJob.id)).all()
+
+@pytest.mark.asyncio
+async def test_worker_scores_with_the_requested_difficulty(db, monkeypatch):
+    jobs = create_moves("hard", None)
+    assert [job.difficulty_level for job in jobs] == ["hard", "medium"]
+
+    calls = []
+
+    async def score_move_power(name, description=None, difficulty_level="medium"):
+        calls.append((name, difficulty_level))
+        return {"power": 80, "ai_generated": True}
+
+    monkeypatch.setattr(ai_scoring_service.ai_service, "score_move_power", score_move_power)
+    pool = AIScoringWorkerPool(concurrency=1)
+    while await pool.process_one():
+        pass
+
+    assert sorted(calls) == [("Task 0", "hard"), ("Task 1", "medium")]
+
+def test_claim_skips_jobs_that_exhausted_their_attempts(db):
+    exhausted, ready = create_moves("medium", "medium")
+    with SessionLocal() as session:
+        job = session.get(AIScoringJob, exhausted.id)
+        job.status = "running"
+        job.attempts = job.max_attempts
+        job.available_at = datetime.utcnow() - timedelta(hours=1)
+        job.locked_until = datetime.utcnow() - timedelta(minutes=1)
+        session.commit()
+
+        claimed = AIScoringJobService.claim_job(session)
+
+        assert claimed is not None and claimed["job_id"] == ready.id
+        session.expire_all()
+        assert session.get(AIScoringJob, exhausted.id).status == "failed"
+        assert AIScoringJobService.claim_job(session) is None
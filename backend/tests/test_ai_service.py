@@ -0,0 +1,114 @@
+"""AIService の同時リクエストの共有・キャッシュ・サーキットブレーカー（LM Studio は呼ばない）"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.ai_service import AIService
+
+
+class StubLMStudio:
+    """_request_ai_power の代わり。release() されるまで応答を保留する"""
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+        self._released = asyncio.Event()
+
+    def release(self) -> None:
+        self._released.set()
+
+    async def __call__(self, move_name, move_description, difficulty_level):
+        self.calls.append((move_name, move_description, difficulty_level))
+        await self._released.wait()
+        if self.error is not None:
+            raise self.error
+        return {"power": 77, "difficulty_score": 7.7, "reasoning": "stub", "ai_generated": True}
+
+@pytest.fixture
+def lm_studio() -> StubLMStudio:
+    return StubLMStudio()
+
+@pytest.fixture
+def service(lm_studio, clock) -> AIService:
+    service = AIService(base_url="http://lm-studio.invalid")
+    service.latency_budget = None
+    service.local_model_first = False
+    service.circuit_breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30, clock=clock)
+    service._cache = TTLCache(max_entries=10, ttl=60, clock=clock)
+    service._request_ai_power = lm_studio
+    return service
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call(service, lm_studio):
+    requests = [asyncio.create_task(service.calculate_move_power("Write tests")) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert len(service._in_flight) == 1
+    lm_studio.release()
+
+    results = await asyncio.gather(*requests)
+
+    assert len(lm_studio.calls) == 1
+    assert all(result["power"] == 77 and result["ai_generated"] for result in results)
+    assert service._in_flight == {}
+
+@pytest.mark.asyncio
+async def test_different_tasks_are_not_shared(service, lm_studio):
+    lm_studio.release()
+    await asyncio.gather(
+        service.calculate_move_power("Write tests"),
+        service.calculate_move_power("Write tests", difficulty_level="hard"),
+    )
+    assert len(lm_studio.calls) == 2
+
+@pytest.mark.asyncio
+async def test_results_are_cached_until_ttl(service, lm_studio, clock):
+    lm_studio.release()
+    await service.calculate_move_power("Write tests")
+    await service.calculate_move_power("Write tests")
+    assert len(lm_studio.calls) == 1
+
+    clock.advance(60)
+    await service.calculate_move_power("Write tests")
+    assert len(lm_studio.calls) == 2
+
+@pytest.mark.asyncio
+async def test_latency_budget_serves_fallback_and_caches_late_result(service, lm_studio):
+    service.latency_budget = 0.01
+
+    result = await service.calculate_move_power("Write tests")
+    assert not result["ai_generated"]
+    # 呼び出しは継続しており、次のリクエストも同じ呼び出しを待つ
+    task = service._in_flight[("Write tests", None, "medium")]
+    lm_studio.release()
+    await task
+
+    result = await service.calculate_move_power("Write tests")
+    assert result["power"] == 77
+    assert len(lm_studio.calls) == 1
+
+@pytest.mark.asyncio
+async def test_failures_open_the_circuit_and_a_probe_closes_it(service, lm_studio, clock):
+    lm_studio.error = httpx.ConnectError("refused")
+    lm_studio.release()
+    for _ in range(2):
+        assert not (await service.calculate_move_power("Write tests"))["ai_generated"]
+    assert service.circuit_breaker.state == CircuitState.OPEN
+
+    # OPEN の間は LM Studio を呼ばない
+    assert not (await service.calculate_move_power("Write tests"))["ai_generated"]
+    assert len(lm_studio.calls) == 2
+
+    clock.advance(30)
+    lm_studio.error = None
+    assert (await service.calculate_move_power("Write tests"))["ai_generated"]
+    assert len(lm_studio.calls) == 3
+    assert service.circuit_breaker.state == CircuitState.CLOSED
+
+@pytest.mark.asyncio
+async def test_unavailable_server_is_not_called(service, lm_studio, monkeypatch):
+    monkeypatch.setattr(service.probe.snapshot, "status", "unreachable")
+    assert await service.score_move_power("Write tests") is None
+    assert lm_studio.calls == []
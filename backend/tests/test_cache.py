@@ -0,0 +1,37 @@
+"""TTLCache の有効期限とLRU"""
+from app.core.cache import TTLCache
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(max_entries=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.advance(59.9)
+    assert cache.get("a") == 1
+    clock.advance(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_set_refreshes_ttl(clock):
+    cache = TTLCache(max_entries=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+    clock.advance(50)
+    cache.set("a", 2)
+    clock.advance(50)
+    assert cache.get("a") == 2
+
+def test_evicts_least_recently_used(clock):
+    cache = TTLCache(max_entries=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a が最近使われた
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_zero_max_entries_disables_caching(clock):
+    cache = TTLCache(max_entries=0, ttl=60, clock=clock)
+    cache.set("a", 1)
+    assert cache.get("a") is None
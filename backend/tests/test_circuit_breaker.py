@@ -0,0 +1,79 @@
+"""CircuitBreaker の状態遷移"""
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def make_breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker("test", failure_threshold=3, recovery_timeout=30, clock=clock)
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = make_breaker(clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # 成功で連続失敗数がリセットされる
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+
+    clock.advance(29.9)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.advance(0.1)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_successful_probe_closes(clock):
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+    clock.advance(30)
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    # 失敗数もリセットされ、再び閾値まで失敗しないと開かない
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+def test_failed_probe_reopens_for_a_full_recovery_timeout(clock):
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+    clock.advance(30)
+    assert breaker.allow_request()
+
+    clock.advance(5)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    clock.advance(29.9)
+    assert not breaker.allow_request()
+    clock.advance(0.1)
+    assert breaker.allow_request()
+
+def test_release_probe_lets_the_next_request_probe(clock):
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+    clock.advance(30)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # 試験呼び出しが成否不明のまま終わった（クライアント切断など）
+    breaker.release_probe()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
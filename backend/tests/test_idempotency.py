@@ -0,0 +1,43 @@
+"""Idempotency-Key の再送とキーの所有者の確認"""
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal
+from app.services.idempotency_service import IdempotencyService
+
+
+def test_retried_request_replays_the_stored_response(client, create_pokemon):
+    pokemon = create_pokemon()
+    payload = {"pokemon_id": pokemon["id"], "name": "Write tests", "power": 40}
+    headers = {"Idempotency-Key": "create-move-1"}
+
+    first = client.post("/api/v1/moves/", json=payload, headers=headers)
+    second = client.post("/api/v1/moves/", json=payload, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert len(client.get(f"/api/v1/moves/pokemon/{pokemon['id']}").json()) == 1
+
+    other = client.post("/api/v1/moves/", json={**payload, "power": 41}, headers=headers)
+    assert other.status_code == 422
+
+def test_request_that_lost_the_key_does_not_overwrite_it(db):
+    first_claim = datetime.utcnow() - timedelta(seconds=120)
+    takeover = datetime.utcnow()
+    with SessionLocal() as session:
+        assert IdempotencyService.claim(session, "k", "hash", first_claim, ttl=3600, lock_timeout=60) is None
+        # 元のリクエストが lock_timeout を超えたので、再送が処理中の行を引き継ぐ
+        assert IdempotencyService.claim(session, "k", "hash", takeover, ttl=3600, lock_timeout=60) is None
+
+        assert not IdempotencyService.complete(session, "k", "hash", first_claim, 201, "application/json", b"stale")
+        assert not IdempotencyService.release(session, "k", "hash", first_claim)
+        record = IdempotencyService.get(session, "k")
+        assert (record.status, record.created_at, record.response_body) == ("in_progress", takeover, None)
+
+        assert not IdempotencyService.complete(session, "k", "other", takeover, 201, None, b"")
+        assert IdempotencyService.complete(session, "k", "hash", takeover, 201, "application/json", b"fresh")
+        session.expire_all()
+        record = IdempotencyService.get(session, "k")
+        assert (record.status, record.response_body) == ("completed", b"fresh")
+        # 完了済みの行は解放されない
+        assert not IdempotencyService.release(session, "k", "hash", takeover)
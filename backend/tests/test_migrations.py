@@ -0,0 +1,58 @@
+"""alembic のリビジョン（create_all で作成済みのデータベースへの適用を含む）"""
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+from alembic import command
+
+SCRIPT_LOCATION = Path(__file__).resolve().parent.parent / "alembic"
+
+@pytest.fixture
+def alembic_run(db):
+    def run(action: str, *args: str) -> None:
+        with db.begin() as conn:
+            # alembic.ini は読まない（ログ設定を置き換えないように）
+            config = Config()
+            config.set_main_option("script_location", str(SCRIPT_LOCATION))
+            config.attributes["connection"] = conn
+            getattr(command, action)(config, *args)
+
+    yield run
+    # 他のテストのためにモデルどおりのスキーマに戻す（各リビジョンは作成済みのものを飛ばす）
+    run("upgrade", "head")
+    with db.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+
+def index_names(engine, table: str) -> set:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+def column_names(engine, table: str) -> set:
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+def test_upgrade_adds_sync_schema_to_an_existing_database(db, alembic_run):
+    # 差分同期の追加前に create_all で作成されたデータベース
+    with db.begin() as conn:
+        conn.execute(text("DROP INDEX ix_pokemon_updated_at"))
+        conn.execute(text("DROP INDEX ix_moves_updated_at"))
+        conn.execute(text("DROP TABLE deletions"))
+        conn.execute(text("ALTER TABLE ai_scoring_jobs DROP COLUMN scored_power"))
+        conn.execute(text("ALTER TABLE ai_scoring_jobs DROP COLUMN difficulty_level"))
+
+    alembic_run("upgrade", "head")
+
+    assert "deletions" in inspect(db).get_table_names()
+    assert "ix_deletions_deleted_at_id" in index_names(db, "deletions")
+    assert "ix_pokemon_updated_at" in index_names(db, "pokemon")
+    assert "ix_moves_updated_at" in index_names(db, "moves")
+    assert {"scored_power", "difficulty_level"} <= column_names(db, "ai_scoring_jobs")
+
+def test_upgrade_is_a_no_op_on_a_current_schema_and_downgrades(db, alembic_run):
+    alembic_run("upgrade", "head")
+    alembic_run("downgrade", "base")
+
+    assert "deletions" not in inspect(db).get_table_names()
+    assert "ix_pokemon_updated_at" not in index_names(db, "pokemon")
+    assert "ix_moves_updated_at" not in index_names(db, "moves")
+    assert not {"scored_power", "difficulty_level"} & column_names(db, "ai_scoring_jobs")
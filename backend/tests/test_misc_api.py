@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.ai_service import ai_service
+
+
+@pytest.fixture
+def lm_studio_down(monkeypatch):
+    """LM Studio をダウン扱いにして、AIエンドポイントをフォールバック計算にする"""
+    monkeypatch.setattr(ai_service.probe.snapshot, "status", "unreachable")
+
+def test_dashboard(client, create_pokemon, create_move, query_budget):
+    for name in ("Bulbasaur", "Charmander"):
+        pokemon = create_pokemon(name)
+        for power in (10, 60, 30, 90):
+            create_move(pokemon["id"], name=f"{name} task {power}", power=power)
+    with query_budget(3):
+        response = client.get("/api/v1/dashboard/", params={"top_k": 2})
+    assert response.status_code == 200
+    entries = response.json()["pokemon"]
+    assert [entry["pending_move_count"] for entry in entries] == [4, 4]
+    assert [move["power"] for move in entries[0]["top_pending_moves"]] == [90, 60]
+
+    revalidated = client.get("/api/v1/dashboard/", params={"top_k": 2}, headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+def test_dashboard_projections(client, create_pokemon, create_move, query_budget):
+    for name in ("Bulbasaur", "Charmander", "Squirtle"):
+        pokemon = create_pokemon(name)
+        create_move(pokemon["id"], power=100)
+    with query_budget(3):
+        response = client.get("/api/v1/dashboard/projections")
+    assert response.status_code == 200
+    assert [entry["total_experience"] for entry in response.json()] == [10, 10, 10]
+
+def test_sync(client, create_pokemon, query_budget):
+    create_pokemon()
+    with query_budget(4):
+        response = client.get("/api/v1/sync/")
+    assert response.status_code == 200
+    assert len(response.json()["pokemon"]) == 1
+
+def test_job_queue_metrics(client, query_budget):
+    with query_budget(3):
+        response = client.get("/api/v1/ai/jobs/metrics")
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("path", ["/api/v1/ai/calculate-power", "/api/v1/ai/suggest-power"])
+def test_power_calculation_falls_back_without_queries(client, lm_studio_down, query_budget, path):
+    with query_budget(0):
+        response = client.post(path, json={"move_name": "Refactor the battle engine"})
+    assert response.status_code == 200
+    assert response.json()["ai_generated"] is False
+
+def test_power_calculation_stream(client, lm_studio_down, query_budget):
+    with query_budget(0):
+        response = client.post("/api/v1/ai/calculate-power/stream", json={"move_name": "Refactor the battle engine"})
+    assert response.status_code == 200
+    assert "event: result" in response.text
+
+def test_ai_health(client, query_budget):
+    with query_budget(0):
+        response = client.get("/api/v1/ai/health")
+    assert response.status_code == 200
+
+def test_health(client, query_budget):
+    with query_budget(0):
+        assert client.get("/health").json() == {"status": "healthy"}
@@ -0,0 +1,25 @@
+"""威力モデルの学習データの読み込み"""
+from app.core.database import SessionLocal
+from app.ml.__main__ import load_samples
+from app.services.ai_scoring_service import AIScoringJobService
+
+
+def score_all(power: int) -> None:
+    with SessionLocal() as db:
+        while (claimed := AIScoringJobService.claim_job(db)) is not None:
+            AIScoringJobService.complete_job(db, claimed["job_id"], power)
+
+def test_load_samples_uses_only_ai_scored_moves(client, create_pokemon, create_move):
+    pokemon = create_pokemon()
+    response = client.post("/api/v1/moves/", json={"pokemon_id": pokemon["id"], "name": "Scored"})
+    assert response.status_code == 201
+    edited = client.post("/api/v1/moves/", json={"pokemon_id": pokemon["id"], "name": "Edited after scoring"}).json()
+    score_all(power=87)
+    client.put(f"/api/v1/moves/{edited['id']}", json={"power": 20})
+    # 採点待ち（暫定威力）と、威力を指定して登録した行
+    client.post("/api/v1/moves/", json={"pokemon_id": pokemon["id"], "name": "Provisional"})
+    create_move(pokemon["id"], name="Default power")
+
+    samples = load_samples([], None, from_db=True)
+
+    assert [(s.name, s.power) for s in samples] == [("Scored", 87)]
@@ -0,0 +1,76 @@
+import uuid
+
+
+def test_create_move(client, create_pokemon, query_budget):
+    pokemon = create_pokemon()
+    with query_budget(2):
+        response = client.post(
+            "/api/v1/moves/", json={"pokemon_id": pokemon["id"], "name": "Write the report", "power": 30}
+        )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["power"] == 30 and body["is_completed"] is False
+
+def test_create_move_for_missing_pokemon(client, query_budget):
+    with query_budget(1):
+        response = client.post(
+            "/api/v1/moves/", json={"pokemon_id": str(uuid.uuid4()), "name": "Write the report", "power": 30}
+        )
+    assert response.status_code == 404
+
+def test_get_move(client, create_pokemon, create_move, query_budget):
+    move = create_move(create_pokemon()["id"])
+    with query_budget(1):
+        response = client.get(f"/api/v1/moves/{move['id']}")
+    assert response.status_code == 200
+    assert response.json()["id"] == move["id"]
+
+def test_update_move(client, create_pokemon, create_move, query_budget):
+    move = create_move(create_pokemon()["id"])
+    with query_budget(1):
+        response = client.put(f"/api/v1/moves/{move['id']}", json={"power": 80})
+    assert response.status_code == 200
+    assert response.json()["power"] == 80
+
+def test_complete_move(client, create_pokemon, create_move, query_budget):
+    move = create_move(create_pokemon()["id"])
+    with query_budget(1):
+        response = client.post(f"/api/v1/moves/{move['id']}/complete")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["is_completed"] is True and body["completed_at"] is not None
+
+def test_complete_move_twice_returns_it_unchanged(client, create_pokemon, create_move, query_budget):
+    move = create_move(create_pokemon()["id"])
+    first = client.post(f"/api/v1/moves/{move['id']}/complete").json()
+    with query_budget(2):
+        response = client.post(f"/api/v1/moves/{move['id']}/complete")
+    assert response.json()["completed_at"] == first["completed_at"]
+
+def test_delete_move(client, create_pokemon, create_move, query_budget):
+    move = create_move(create_pokemon()["id"])
+    with query_budget(3):
+        response = client.delete(f"/api/v1/moves/{move['id']}")
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/moves/{move['id']}").status_code == 404
+
+def test_moves_by_pokemon(client, create_pokemon, create_move, query_budget):
+    pokemon = create_pokemon()
+    for i in range(3):
+        create_move(pokemon["id"], name=f"Task {i}")
+    with query_budget(2):
+        response = client.get(f"/api/v1/moves/pokemon/{pokemon['id']}")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+def test_completed_and_pending_moves(client, create_pokemon, create_move, query_budget):
+    pokemon = create_pokemon()
+    done = create_move(pokemon["id"], name="Done task")
+    create_move(pokemon["id"], name="Open task")
+    client.post(f"/api/v1/moves/{done['id']}/complete")
+    with query_budget(2):
+        completed = client.get(f"/api/v1/moves/pokemon/{pokemon['id']}/completed")
+    with query_budget(2):
+        pending = client.get(f"/api/v1/moves/pokemon/{pokemon['id']}/pending")
+    assert [m["name"] for m in completed.json()] == ["Done task"]
+    assert [m["name"] for m in pending.json()] == ["Open task"]
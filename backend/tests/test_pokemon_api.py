@@ -0,0 +1,69 @@
+import uuid
+
+
+def test_create_pokemon(client, query_budget):
+    with query_budget(1):
+        response = client.post("/api/v1/pokemon/", json={"name": "  Pikachu  ", "type": "electric"})
+    assert response.status_code == 201
+    body = response.json()
+    assert body["name"] == "Pikachu"
+    assert body["level"] == 1 and body["evolution_stage"] == 1
+
+def test_list_pokemon(client, create_pokemon, query_budget):
+    for name in ("Bulbasaur", "Charmander", "Squirtle"):
+        create_pokemon(name)
+    with query_budget(1):
+        response = client.get("/api/v1/pokemon/")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+def test_get_pokemon_with_moves(client, create_pokemon, create_move, query_budget):
+    pokemon = create_pokemon()
+    for i in range(3):
+        create_move(pokemon["id"], name=f"Task {i}")
+    with query_budget(2):
+        response = client.get(f"/api/v1/pokemon/{pokemon['id']}")
+    assert response.status_code == 200
+    assert len(response.json()["moves"]) == 3
+
+def test_get_missing_pokemon(client, query_budget):
+    with query_budget(1):
+        response = client.get(f"/api/v1/pokemon/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+def test_update_pokemon(client, create_pokemon, query_budget):
+    pokemon = create_pokemon()
+    with query_budget(1):
+        response = client.put(f"/api/v1/pokemon/{pokemon['id']}", json={"name": "Raichu"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Raichu"
+
+def test_delete_pokemon(client, create_pokemon, create_move, query_budget):
+    pokemon = create_pokemon()
+    create_move(pokemon["id"])
+    with query_budget(6):
+        response = client.delete(f"/api/v1/pokemon/{pokemon['id']}")
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/pokemon/{pokemon['id']}").status_code == 404
+
+def test_add_experience_levels_up_and_evolves(client, create_pokemon, query_budget):
+    pokemon = create_pokemon()
+    with query_budget(2):
+        response = client.post(f"/api/v1/pokemon/{pokemon['id']}/add-experience", params={"experience": 1550})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["level"] == 16
+    assert body["experience"] == 50
+    assert body["evolution_stage"] == 2
+
+def test_projection(client, create_pokemon, create_move, query_budget):
+    pokemon = create_pokemon()
+    for power in (10, 90, 40):
+        create_move(pokemon["id"], name=f"Task {power}", power=power)
+    with query_budget(3):
+        response = client.get(f"/api/v1/pokemon/{pokemon['id']}/projection", params={"orderings": ["strongest_first"]})
+    assert response.status_code == 200
+    [scenario] = response.json()["scenarios"]
+    assert [step["power"] for step in scenario["steps"]] == [90, 40, 10]
+    # max(5, power // 10) = 9 + 5 + 5
+    assert scenario["total_experience"] == 19
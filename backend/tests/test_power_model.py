@@ -0,0 +1,73 @@
+"""威力推定モデル（文字n-gram TF-IDF + リッジ回帰）"""
+import numpy as np
+import pytest
+
+from app.ml.power_model import PowerModel, PowerSample, sample_text
+
+N_FEATURES = 2 ** 10
+
+URGENT = ["報告書", "請求書", "障害対応", "release notes", "tax return", "client call"]
+ROUTINE = ["洗濯", "散歩", "読書", "dishes", "stretching", "plants"]
+
+def training_samples() -> list:
+    """「至急」が付いたタスクは強く、それ以外は弱いという1つだけの規則"""
+    samples = []
+    for i, task in enumerate(URGENT + ROUTINE):
+        samples.append(PowerSample(name=f"至急 {task}", description=None, power=90))
+        samples.append(PowerSample(name=task, description=f"メモ {i}", power=20))
+    return samples
+
+@pytest.fixture(scope="module")
+def model() -> PowerModel:
+    return PowerModel.train(training_samples(), n_features=N_FEATURES, alpha=0.1)
+
+def test_learns_a_clear_pattern(model):
+    for sample in training_samples():
+        assert abs(model.predict(sample.name, sample.description) - sample.power) <= 10
+    # 学習にないタスクでも「至急」が付くだけで強くなる
+    assert model.predict("至急 見積書") - model.predict("見積書") >= 30
+
+def test_predict_and_predict_batch_agree(model):
+    inputs = [
+        ("至急 報告書", None),
+        ("Write the weekly report", "for the team"),
+        ("ピカチュウと散歩", "公園まで"),
+        ("x", None),
+        ("", None),
+    ]
+    batch = model.predict_batch([sample_text(name, description) for name, description in inputs])
+
+    assert batch.tolist() == [model.predict(name, description) for name, description in inputs]
+    assert model.predict_batch([]).tolist() == []
+
+def test_save_and_load_round_trip(model, tmp_path):
+    path = tmp_path / "models" / "power.npz"
+    model.save(path)
+    loaded = PowerModel.load(path)
+
+    texts = [sample_text(s.name, s.description) for s in training_samples()] + ["未知のタスク"]
+    assert loaded.predict_batch(texts).tolist() == model.predict_batch(texts).tolist()
+    assert loaded.intercept == model.intercept
+    assert loaded.ngram_range == model.ngram_range
+    assert loaded.metadata == model.metadata
+    np.testing.assert_array_equal(loaded.weights, model.weights)
+
+@pytest.mark.parametrize("text", ["洗濯物をたたむ", "Ｐｏｋéｍｏｎ", "🍙"])
+def test_non_ascii_text_featurizes_to_a_non_zero_vector(text):
+    indices, tf = PowerModel._hash_ngrams(text, N_FEATURES, (1, 3))
+
+    assert len(indices) > 0
+    assert np.all((indices >= 0) & (indices < N_FEATURES))
+    assert np.all(tf > 0)
+    # 空白だけのテキストとは別の特徴量になる
+    blank, _ = PowerModel._hash_ngrams("", N_FEATURES, (1, 3))
+    assert set(indices.tolist()) - set(blank.tolist())
+
+@pytest.mark.parametrize("n_features", [1000, 3, 2 ** 10 + 1])
+def test_rejects_n_features_that_is_not_a_power_of_two(n_features):
+    with pytest.raises(ValueError, match="power of two"):
+        PowerModel.train(training_samples(), n_features=n_features)
+
+def test_rejects_empty_training_set():
+    with pytest.raises(ValueError, match="No training samples"):
+        PowerModel.train([], n_features=N_FEATURES)
@@ -0,0 +1,50 @@
+"""オンデマンドのプロファイリング（X-Profile ヘッダーのみ、GET / HEAD のみ）"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfilingMiddleware
+
+SECRET = "s3cret"
+
+@pytest.fixture
+def profiled_client() -> TestClient:
+    app = FastAPI()
+    app.state.writes = 0
+
+    @app.get("/items")
+    def list_items():
+        return {"items": []}
+
+    @app.post("/items")
+    def create_item():
+        app.state.writes += 1
+        return {"writes": app.state.writes}
+
+    app.add_middleware(ProfilingMiddleware, secret=SECRET)
+    return TestClient(app)
+
+def test_header_returns_the_profile_instead_of_the_response(profiled_client):
+    response = profiled_client.get("/items", headers={"X-Profile": SECRET})
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert "function calls" in response.text
+
+def test_wrong_secret_is_not_profiled(profiled_client):
+    response = profiled_client.get("/items", headers={"X-Profile": "guess"})
+
+    assert response.json() == {"items": []}
+    assert "x-profiled-status" not in response.headers
+
+def test_secret_in_query_string_is_ignored(profiled_client):
+    response = profiled_client.get("/items", params={"profile": SECRET})
+
+    assert response.json() == {"items": []}
+    assert "x-profiled-status" not in response.headers
+
+def test_writes_are_handled_normally_even_with_the_header(profiled_client):
+    response = profiled_client.post("/items", headers={"X-Profile": SECRET})
+
+    assert response.json() == {"writes": 1}
+    assert "x-profiled-status" not in response.headers
@@ -0,0 +1,120 @@
+"""project() のベクトル化カーネルと、威力が NULL の技の扱い"""
+from uuid import UUID
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from app.core.database import SessionLocal
+from app.models.move import Move
+from app.services.projection_service import project
+
+NAN = float("nan")
+
+def project_one(level, experience, stage, powers, enemy_hp=NAN, ordering="listed"):
+    return project(
+        levels=[level], experience=[experience], stages=[stage], enemy_hp=[enemy_hp],
+        owner=[0] * len(powers), powers=powers, orderings=[ordering],
+    )
+
+def test_evolves_at_level_16():
+    result = project_one(15, 90, 1, [100, 100])
+
+    assert result.experience_gain.tolist() == [10, 10]
+    assert result.level_after.tolist() == [16, 16]
+    assert result.stage_after.tolist() == [2, 2]
+    assert (result.moves_to_level_up[0], result.moves_to_evolve[0]) == (1, 1)
+    assert (result.final_level[0], result.final_experience[0], result.final_stage[0]) == (16, 10, 2)
+
+def test_evolves_at_level_36():
+    result = project_one(35, 95, 2, [50])
+
+    assert (result.final_level[0], result.final_stage[0], result.moves_to_evolve[0]) == (36, 3, 1)
+
+def test_both_evolutions_in_one_projection():
+    # 1段階目から21レベル上げる（100経験値 = 1レベル、威力100で10経験値）
+    result = project_one(15, 0, 1, [100] * 210)
+
+    assert result.moves_to_evolve[0] == 10
+    assert (result.final_level[0], result.final_stage[0]) == (36, 3)
+    assert result.stage_after[[8, 9, 208, 209]].tolist() == [1, 2, 2, 3]
+
+def test_unreachable_targets_are_minus_one():
+    result = project_one(1, 0, 1, [10, 20])
+
+    assert result.total_experience[0] == 10  # 最低5経験値
+    assert result.moves_to_level_up[0] == -1
+    assert result.moves_to_evolve[0] == -1
+
+def test_no_enemy_is_never_defeated():
+    result = project_one(1, 0, 1, [100, 100])
+
+    assert result.moves_to_defeat[0] == -1
+    assert np.isnan(result.enemy_remaining_hp[0])
+    assert result.total_damage[0] == 200
+
+def test_enemy_defeated_and_remaining_hp():
+    result = project_one(1, 0, 1, [60, 50], enemy_hp=100)
+    assert (result.moves_to_defeat[0], result.enemy_remaining_hp[0]) == (2, 0)
+
+    result = project_one(1, 0, 1, [60, 30], enemy_hp=100)
+    assert (result.moves_to_defeat[0], result.enemy_remaining_hp[0]) == (-1, 10)
+
+@pytest.mark.parametrize("ordering, expected, moves_to_defeat", [
+    ("listed", [10, 90, 40, 40], 2),
+    ("strongest_first", [90, 40, 40, 10], 2),
+    ("weakest_first", [10, 40, 40, 90], 4),
+])
+def test_orderings(ordering, expected, moves_to_defeat):
+    powers = np.array([10, 90, 40, 40])
+    result = project_one(1, 0, 1, powers, enemy_hp=100, ordering=ordering)
+
+    assert powers[result.order].tolist() == expected
+    assert result.moves_to_defeat[0] == moves_to_defeat
+    if ordering != "listed":
+        # 同じ威力の技は一覧の順序のまま
+        assert [i for i in result.order.tolist() if powers[i] == 40] == [2, 3]
+
+def test_unknown_ordering_is_rejected():
+    with pytest.raises(ValueError):
+        project_one(1, 0, 1, [10], ordering="random")
+
+def test_pokemon_share_one_batch():
+    # 技の持ち主は入力の中で混在していてよい。Pokemon 1 には技がない
+    result = project(
+        levels=[15, 5, 35],
+        experience=[90, 0, 95],
+        stages=[1, 1, 2],
+        enemy_hp=[NAN, NAN, 30],
+        owner=[2, 0, 2, 0],
+        powers=[20, 100, 10, 100],
+        orderings=["listed", "listed", "strongest_first"],
+    )
+
+    assert result.counts.tolist() == [2, 0, 2]
+    assert result.order.tolist() == [1, 3, 0, 2]
+    assert result.final_level.tolist() == [16, 5, 36]
+    assert result.final_stage.tolist() == [2, 1, 3]
+    assert result.total_experience.tolist() == [20, 0, 10]
+    assert result.total_damage.tolist() == [200, 0, 30]
+    assert result.moves_to_level_up.tolist() == [1, -1, 1]
+    assert result.moves_to_evolve.tolist() == [1, -1, 1]
+    assert result.moves_to_defeat.tolist() == [-1, -1, 2]
+    assert result.enemy_remaining_hp[2] == 0
+    assert np.isnan(result.enemy_remaining_hp[:2]).all()
+
+def test_cleared_power_is_projected_with_the_default(client, create_pokemon, create_move):
+    pokemon = create_pokemon()
+    move = create_move(pokemon["id"], power=90)
+    # MoveUpdate.power は Optional なので PUT {"power": null} で NULL が保存される
+    with SessionLocal() as db:
+        db.execute(update(Move).where(Move.id == UUID(move["id"])).values(power=None))
+        db.commit()
+
+    projection = client.get(f"/api/v1/pokemon/{pokemon['id']}/projection")
+    assert projection.status_code == 200
+    assert projection.json()["scenarios"][0]["steps"][0]["power"] == 50
+
+    dashboard = client.get("/api/v1/dashboard/projections")
+    assert dashboard.status_code == 200
+    assert dashboard.json()[0]["total_damage"] == 50
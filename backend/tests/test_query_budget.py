@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.query_counter import QueryBudgetExceeded
+from app.models.pokemon import Pokemon
+
+
+def test_n_plus_one_fails_and_lists_the_sql(create_pokemon, create_move, query_budget):
+    for name in ("Bulbasaur", "Charmander", "Squirtle"):
+        create_move(create_pokemon(name)["id"])
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(10), SessionLocal() as db:
+            # 1件ごとに moves を遅延読み込みする典型的なN+1
+            for pokemon in db.scalars(select(Pokemon)):
+                len(pokemon.moves)
+
+    message = str(excinfo.value)
+    assert "Possible N+1" in message
+    assert "3x SELECT moves.id" in message
+    assert "FROM moves WHERE" in message
+
+def test_over_budget_lists_every_statement(client, create_pokemon, query_budget):
+    pokemon = create_pokemon()
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(1):
+            client.get(f"/api/v1/pokemon/{pokemon['id']}")
+
+    message = str(excinfo.value)
+    assert "Expected at most 1 queries, got 2" in message
+    assert "1. SELECT pokemon.id" in message
+    assert "2. SELECT moves.id" in message
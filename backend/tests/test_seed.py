@@ -0,0 +1,45 @@
+"""合成データ投入（app.seed）のIDとトップアップ"""
+import numpy as np
+
+from app.models.move import Move
+from app.models.pokemon import Pokemon
+from app.seed import (
+    EPOCH,
+    count_seeded,
+    generate_moves,
+    generate_pokemon,
+    id_seed_tag,
+    load_rows,
+    make_ids,
+    seed_tag,
+)
+
+
+def test_ids_are_uuid7_in_creation_order_with_the_seed_tag():
+    rows = [row for chunk in generate_moves(7, 0, 2500, pokemon_total=10, chunk_size=1000) for row in chunk]
+    ids = [row["id"] for row in rows]
+
+    assert {value.version for value in ids} == {7}
+    assert ids == sorted(ids, key=lambda value: value.int)
+    assert len(set(ids)) == len(ids)
+    assert {id_seed_tag(value) for value in ids} == {seed_tag(7)}
+    # タイムスタンプは作成時刻のミリ秒
+    for row in rows[:10]:
+        unix_ms = row["id"].int >> 80
+        assert unix_ms == int((row["created_at"] - EPOCH.replace(year=1970)).total_seconds() * 1000)
+    assert make_ids(7, 1, np.array([1234]))[0] == ids[1234]
+
+def test_count_seeded_resumes_after_existing_rows(db):
+    assert count_seeded(db, Pokemon, 7, 0) == 0
+    for rows in generate_pokemon(7, 0, 3, chunk_size=4):
+        load_rows(db, Pokemon, rows)
+    for rows in generate_moves(7, 0, 37, pokemon_total=3, chunk_size=10):
+        load_rows(db, Move, rows)
+
+    assert count_seeded(db, Pokemon, 7, 0) == 3
+    assert count_seeded(db, Move, 7, 1) == 37
+    assert count_seeded(db, Move, 8, 1) == 0
+
+    for rows in generate_moves(7, 37, 50, pokemon_total=3, chunk_size=10):
+        load_rows(db, Move, rows)
+    assert count_seeded(db, Move, 7, 1) == 50
@@ -0,0 +1,74 @@
+"""スロークエリログのEXPLAIN（行ロックや副作用のあるSELECTをANALYZEで再実行しない）"""
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.core.slow_query import SlowQueryLog, _is_pure_read
+
+
+@pytest.mark.parametrize(
+    "statement, pure",
+    [
+        ("SELECT id FROM moves WHERE completed = false", True),
+        ("SELECT id FROM moves WHERE name = 'FOR UPDATE'", False),
+        ("SELECT id FROM ai_scoring_jobs LIMIT 1 FOR UPDATE SKIP LOCKED", False),
+        ("select id from moves for no key update", False),
+        ("SELECT id FROM moves FOR SHARE OF moves", False),
+        ("SELECT id FROM moves FOR KEY SHARE", False),
+        ("SELECT pg_notify('sync', 'x')", False),
+        ("SELECT nextval('moves_id_seq')", False),
+        ("SELECT pg_try_advisory_xact_lock(1)", False),
+        ("SELECT formatted FROM moves", True),
+    ],
+)
+def test_pure_read_detection(statement, pure):
+    # 文字列リテラル内の一致も安全側（ANALYZEしない）に倒す
+    assert _is_pure_read(statement) is pure
+
+class ExplainRecorder:
+    """全クエリをスロークエリ扱いにし、EXPLAINとして発行されたSQLを集める"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+        self.slow_query_log = SlowQueryLog(threshold_ms=0, explain=True, explain_per_minute=100)
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("EXPLAIN"):
+            self.statements.append(statement)
+
+    def run(self, sql: str) -> List[str]:
+        """SQLを実行し、バックグラウンドのEXPLAINが終わるのを待って返す"""
+        with self.engine.begin() as conn:
+            conn.execute(text(sql))
+        self.slow_query_log.shutdown(wait=True)
+        return self.statements
+
+@pytest.fixture
+def recorder(db: Engine) -> Iterator[ExplainRecorder]:
+    if db.dialect.name != "postgresql":
+        pytest.skip("PostgreSQL only")
+    recorder = ExplainRecorder(db)
+    recorder.slow_query_log.install(db)
+    event.listen(db, "before_cursor_execute", recorder.record)
+    yield recorder
+    event.remove(db, "before_cursor_execute", recorder.record)
+    recorder.slow_query_log.uninstall(db)
+    recorder.slow_query_log.shutdown()
+
+def test_plain_select_is_explained_with_analyze(recorder):
+    assert recorder.run("SELECT count(*) FROM moves") == [
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT count(*) FROM moves"
+    ]
+
+def test_locking_select_is_never_explained_with_analyze(recorder):
+    statement = "SELECT id FROM ai_scoring_jobs ORDER BY available_at LIMIT 1 FOR UPDATE SKIP LOCKED"
+    assert recorder.run(statement) == [f"EXPLAIN {statement}"]
+
+def test_side_effect_function_is_not_reexecuted(recorder):
+    # ANALYZEで再実行されると通知が2回届く
+    assert recorder.run("SELECT pg_notify('slow_query_test', 'payload')") == [
+        "EXPLAIN SELECT pg_notify('slow_query_test', 'payload')"
+    ]
@@ -0,0 +1,92 @@
+"""SQLiteモードの PRAGMA とシングルライターのトランザクション制御"""
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import select, text, update
+
+from app.core import sqlite as sqlite_mode
+from app.core.database import SessionLocal
+from app.models.ai_scoring_job import AIScoringJob
+from app.models.pokemon import Pokemon
+
+
+@pytest.fixture
+def sqlite_db(db):
+    if db.dialect.name != "sqlite":
+        pytest.skip("SQLite only")
+    return db
+
+def _try_begin_immediate(path: str) -> None:
+    """別接続から書き込みトランザクションを開始（他が書き込み中なら待たずに失敗）"""
+    conn = sqlite3.connect(path, timeout=0, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+def test_pragmas(sqlite_db):
+    with sqlite_db.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA mmap_size")).scalar() > 0
+
+def test_reads_do_not_take_the_writer_lock(sqlite_db):
+    with SessionLocal() as db:
+        db.scalars(select(Pokemon)).all()
+        assert not sqlite_mode._write_lock.locked()
+        assert not db.connection().connection.dbapi_connection.in_transaction
+
+def test_write_begins_immediate_transaction_until_commit(sqlite_db):
+    with SessionLocal() as db:
+        db.add(Pokemon(name="Pikachu"))
+        db.flush()
+        assert sqlite_mode._write_lock.locked()
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            _try_begin_immediate(sqlite_db.url.database)
+        db.commit()
+    assert not sqlite_mode._write_lock.locked()
+    _try_begin_immediate(sqlite_db.url.database)
+
+def test_select_for_update_takes_the_writer_lock(sqlite_db):
+    # SQLite は FOR UPDATE を出力しないため、ジョブの取り出し（claim_job）と同じクエリで
+    # 書き込みトランザクションが始まることを確認する（SQLAlchemy の内部属性に依存している）
+    with SessionLocal() as db:
+        db.query(AIScoringJob).filter(AIScoringJob.status == "pending").with_for_update(skip_locked=True).first()
+        assert sqlite_mode._write_lock.locked()
+        assert db.connection().connection.dbapi_connection.in_transaction
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            _try_begin_immediate(sqlite_db.url.database)
+        db.rollback()
+    assert not sqlite_mode._write_lock.locked()
+
+def test_writers_are_serialized(sqlite_db):
+    with SessionLocal() as db:
+        pokemon = Pokemon(name="Pikachu")
+        db.add(pokemon)
+        db.commit()
+
+    events = []
+    first = SessionLocal()
+    first.execute(update(Pokemon).where(Pokemon.id == pokemon.id).values(level=Pokemon.level + 1))
+
+    def second_writer():
+        with SessionLocal() as db:
+            db.execute(update(Pokemon).where(Pokemon.id == pokemon.id).values(level=Pokemon.level + 1))
+            events.append("second wrote")
+            db.commit()
+
+    thread = threading.Thread(target=second_writer)
+    thread.start()
+    time.sleep(0.2)
+    events.append("first committed")
+    first.commit()
+    first.close()
+    thread.join(5)
+
+    assert events == ["first committed", "second wrote"]
+    with SessionLocal() as db:
+        assert db.get(Pokemon, pokemon.id).level == 3
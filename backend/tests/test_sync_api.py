@@ -0,0 +1,132 @@
+"""差分同期（GET /api/v1/sync/）のページング・重なり期間・トゥームストーン"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.config import settings
+from app.core.database import SessionLocal
+from app.models.pokemon import Pokemon
+
+SYNC_URL = "/api/v1/sync/"
+
+def insert_pokemon(*updated_at: datetime) -> List[str]:
+    """updated_at を指定してPokemonを作成（作成順のIDを返す）"""
+    with SessionLocal() as db:
+        pokemon = [Pokemon(name=f"Pokemon {i}", updated_at=at) for i, at in enumerate(updated_at)]
+        db.add_all(pokemon)
+        db.commit()
+        return [str(p.id) for p in pokemon]
+
+def sync(client, since: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"limit": limit}
+    if since is not None:
+        params["since"] = since
+    response = client.get(SYNC_URL, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def sync_all(client, since: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+    """has_more の間は続けて同期し、各ページを返す"""
+    pages = [sync(client, since, limit)]
+    while pages[-1]["has_more"]:
+        pages.append(sync(client, pages[-1]["next_token"], limit))
+    return pages
+
+def pokemon_ids(pages: List[Dict[str, Any]]) -> List[str]:
+    return [p["id"] for page in pages for p in page["pokemon"]]
+
+def test_pages_follow_updated_at_order(client):
+    base = datetime.utcnow() - timedelta(hours=1)
+    ids = insert_pokemon(*(base + timedelta(minutes=m) for m in (4, 0, 3, 1, 2)))
+
+    pages = sync_all(client, limit=2)
+
+    assert [len(page["pokemon"]) for page in pages] == [2, 2, 1]
+    assert [page["has_more"] for page in pages] == [True, True, False]
+    assert pokemon_ids(pages) == [ids[1], ids[3], ids[4], ids[2], ids[0]]
+    # 重なり期間より前の変更は次回の同期では返らない
+    assert sync(client, pages[-1]["next_token"])["pokemon"] == []
+
+def test_page_boundary_on_equal_updated_at(client):
+    at = datetime.utcnow() - timedelta(hours=1)
+    ids = insert_pokemon(*[at] * 5)
+
+    pages = sync_all(client, limit=2)
+
+    # 同じ時刻の行はIDで順序付けされ、ページの境目で重複も欠落もしない
+    assert pokemon_ids(pages) == sorted(ids)
+
+def test_recent_changes_are_resent_during_the_overlap_window(client, monkeypatch):
+    old = insert_pokemon(datetime.utcnow() - timedelta(hours=1))
+    recent = insert_pokemon(*[datetime.utcnow()] * 3)
+
+    recent.sort()
+
+    pages = sync_all(client, limit=2)
+    assert [len(page["pokemon"]) for page in pages] == [2, 2]
+    # 重なり期間内の変更だけで limit を超える分は、期間を過ぎるまで次回以降に回る
+    assert pokemon_ids(pages) == [old[0], recent[0], recent[0], recent[1]]
+
+    # 直近の変更は、より古い時刻で後からコミットされる変更を取りこぼさないよう再送される
+    again = sync_all(client, pages[-1]["next_token"], limit=2)
+    assert pokemon_ids(again) == recent[:2]
+
+    # 重なり期間を過ぎた変更は再送されなくなる
+    monkeypatch.setattr(settings, "SYNC_OVERLAP_SECONDS", 0)
+    settled = sync(client, again[-1]["next_token"])
+    assert sorted(p["id"] for p in settled["pokemon"]) == sorted(recent)
+    assert sync(client, settled["next_token"])["pokemon"] == []
+
+def test_late_commit_before_a_truncated_page_in_the_overlap_window(client):
+    now = datetime.utcnow()
+    insert_pokemon(now - timedelta(hours=1), now - timedelta(seconds=1), now)
+    first = sync(client, limit=2)
+    assert first["has_more"]
+
+    # 1ページ目の最後の行より古い時刻で、後からコミットされた変更
+    late = insert_pokemon(now - timedelta(seconds=2))
+    rest = sync_all(client, first["next_token"], limit=2)
+
+    assert late[0] in pokemon_ids(rest)
+
+def test_updates_and_deletions_since_the_token(client, create_pokemon, create_move):
+    pokemon = create_pokemon("Bulbasaur")
+    move = create_move(pokemon["id"])
+    doomed = create_pokemon("Charmander")
+    create_move(doomed["id"])
+    token = sync(client)["next_token"]
+
+    client.put(f"/api/v1/pokemon/{pokemon['id']}", json={"name": "Ivysaur"})
+    client.delete(f"/api/v1/moves/{move['id']}")
+    client.delete(f"/api/v1/pokemon/{doomed['id']}")
+    changes = sync(client, token)
+
+    assert [p["name"] for p in changes["pokemon"]] == ["Ivysaur"]
+    # Pokemonの削除ではそのMoveのトゥームストーンは記録しない
+    assert [(d["entity"], d["entity_id"]) for d in changes["deleted"]] == [
+        ("move", move["id"]),
+        ("pokemon", doomed["id"]),
+    ]
+
+def _token(payload: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+@pytest.mark.parametrize("token", [
+    "not-a-token",
+    "!!!",
+    _token({"v": 2, "pokemon": None, "moves": None, "deleted": None}),
+    _token({"v": 1, "pokemon": ["2024-01-01T00:00:00", None]}),
+    _token({"v": 1, "pokemon": ["yesterday", None], "moves": ["yesterday", None], "deleted": ["yesterday", None]}),
+    _token([1, 2, 3]),
+])
+def test_malformed_token_is_rejected(client, token):
+    response = client.get(SYNC_URL, params={"since": token})
+    assert response.status_code == 400
+
+def test_token_older_than_tombstone_retention_is_expired(client):
+    old = (datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)).isoformat()
+    token = _token({"v": 1, "pokemon": [old, None], "moves": [old, None], "deleted": [old, None]})
+    assert client.get(SYNC_URL, params={"since": token}).status_code == 410
@@ -17,6 +17,9 @@ interface AIHealthResponse {
   status: string;
   available_models?: string[];
   preferred_model_available?: boolean;
+  selected_model?: string;
+  latency_ms?: number;
+  checked_at?: string;
   error?: string;
 }
 
@@ -47,6 +50,46 @@ export const aiApi = {
     return response.json();
   },
 
+  // AI威力計算（ストリーミング）: 威力値が確定した時点で onPower を呼び出す
+  calculatePowerStream: async (
+    data: PowerCalculationRequest,
+    onPower: (power: number) => void,
+    onToken?: (content: string) => void,
+  ): Promise<PowerCalculationResponse> => {
+    const response = await fetch('http://localhost:8000/api/v1/ai/calculate-power/stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(data),
+    });
+    if (!response.ok || !response.body) throw new Error('Failed to calculate power');
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        const event = rawEvent.match(/^event: (.*)$/m)?.[1];
+        const payload = rawEvent.match(/^data: (.*)$/m)?.[1];
+        if (!event || !payload) continue;
+
+        const parsed = JSON.parse(payload);
+        if (event === 'token') onToken?.(parsed.content);
+        else if (event === 'power') onPower(parsed.power);
+        else if (event === 'result') return parsed as PowerCalculationResponse;
+      }
+    }
+    throw new Error('Stream ended without result');
+  },
+
   // AI健康状態チェック
   checkHealth: async (): Promise<AIHealthResponse> => {
     const response = await fetch('http://localhost:8000/api/v1/ai/health');